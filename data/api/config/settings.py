@@ -106,6 +106,20 @@ DATABASES = {
 }
 
 
+# --------------------------------------------------
+# CACHE
+# --------------------------------------------------
+# what-if 세션 / 시간표 응답 캐시는 gunicorn 워커끼리 공유해야 하므로 DB 캐시 사용
+# (테이블은 python manage.py createcachetable 로 생성)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    }
+}
+
+
 # --------------------------------------------------
 # PASSWORD VALIDATION
 # --------------------------------------------------
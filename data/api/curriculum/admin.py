@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Course, Track, TrackCourse, GraduationRequirement, AreaRequirement, TakenCourse
+from .models import (
+    Course, Track, TrackCourse, GraduationRequirement, AreaRequirement, TakenCourse, CacheGeneration,
+    CoursePrerequisite,
+)
 
 admin.site.register(Course)
 admin.site.register(Track)
@@ -7,3 +10,5 @@ admin.site.register(TrackCourse)
 admin.site.register(GraduationRequirement)
 admin.site.register(AreaRequirement)
 admin.site.register(TakenCourse)
+admin.site.register(CacheGeneration)
+admin.site.register(CoursePrerequisite)
@@ -0,0 +1,275 @@
+"""
+학번(코호트) 단위 졸업요건 일괄 점검
+
+  - DB 조회는 부모 프로세스에서 chunk 단위로 한 번에 (유저 N명 → 쿼리 1번),
+    이수 과목은 유저별 비트마스크(bitsets.CourseIndex)로 만들어 넘긴다
+  - 규칙 세트는 유저마다 학번 + 학과로 고른다 (rulesets.cohort_key)
+    → 여러 학번을 한 번에 점검해도 각자 자기 학번 규칙으로 평가된다.
+  - 규칙 평가(CompiledRules.evaluate)는 workers > 1 이면 ProcessPoolExecutor 로 chunk 를 나눠 처리
+    → 자식 프로세스는 DB 에 접근하지 않는다. 관리 명령에서만 쓴다 (웹 요청은 항상 workers=1).
+  - 결과는 생성기로 흘려보내므로 NDJSON / CSV 스트리밍에 그대로 쓸 수 있다.
+
+사용처: manage.py audit_graduation (--workers), GET /api/curriculum/audit/ (현재 프로세스에서만)
+"""
+import csv
+import io
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.models import User
+
+from .bitsets import get_course_index, load_user_masks
+from .models import TrackCourse
+from .rulesets import cohort_key, get_rule_sets
+from .tracks import TRACK_MAP
+
+AUDIT_CSV_FIELDS = (
+    "user_id",
+    "username",
+    "student_id",
+    "total_credits",
+    "can_graduate",
+    "unmet_conditions",
+    "remaining_required",
+)
+
+ALL_FLAGS = {
+    "second_major_done": True,
+    "language_cert": True,
+    "it_cert": True,
+    "industry_cert": True,
+}
+
+NO_FLAGS = dict.fromkeys(ALL_FLAGS, False)
+
+
+def audit_queryset(entry_year=None, department=None, user_ids=None):
+    """ 점검 대상 유저 (학번 앞 4자리 = 입학년도, UserProfile.major_department) """
+    qs = User.objects.filter(is_active=True)
+    if entry_year:
+        qs = qs.filter(userprofile__student_id__startswith=str(entry_year))
+    if department:
+        qs = qs.filter(userprofile__major_department=department)
+    if user_ids:
+        qs = qs.filter(id__in=user_ids)
+    return qs.order_by("id").values_list(
+        "id", "username", "userprofile__student_id", "userprofile__major_department"
+    )
+
+
+def track_mapped_codes(track_key):
+    """ TrackCourse 로 트랙에 매핑된 과목 코드 """
+    if track_key not in TRACK_MAP:
+        return frozenset()
+    return frozenset(
+        TrackCourse.objects.filter(track__name=TRACK_MAP[track_key])
+        .values_list("course__code", flat=True)
+    )
+
+
+def track_course_codes(track_key, compiled, mapped_codes=None):
+    """
+    트랙 학점으로 셀 과목: TrackCourse 매핑 + 규칙의 트랙 전필
+    mapped_codes 를 미리 주면 DB 를 보지 않는다 (audit 자식 프로세스용)
+    """
+    track = compiled.tracks.get(track_key)
+    if track is None:
+        return frozenset()
+    if mapped_codes is None:
+        mapped_codes = track_mapped_codes(track_key)
+    return track.required_codes | mapped_codes
+
+
+# 자식 프로세스에서 쓸 과목 인덱스 / 규칙 세트들 (ProcessPoolExecutor initializer 로 1번만 전달)
+_worker_index = None
+_worker_rule_sets = None
+
+
+def _init_worker(index, rule_sets):
+    global _worker_index, _worker_rule_sets
+    _worker_index = index
+    _worker_rule_sets = rule_sets
+
+
+def _rules_not_found(user_id, username, student_id, total):
+    return {
+        "user_id": user_id,
+        "username": username,
+        "student_id": student_id,
+        "total_credits": total,
+        "can_graduate": None,
+        "unmet_conditions": ["rules_not_found"],
+        "remaining_required": [],
+    }
+
+
+def evaluate_chunk(chunk, track_key, mapped_codes, flags, index=None, rule_sets=None):
+    """
+    (자식 프로세스에서 실행) chunk: [(user_id, username, student_id, rules_key, mask), ...]
+    rule_sets: {rules_key: CompiledRules 또는 None(등록 안 된 학번)}
+    학점/영역 집계는 비트셋(CourseIndex.tally), 전공필수/트랙전필 확인용 코드만 decode.
+    """
+    index = index or _worker_index
+    rule_sets = rule_sets if rule_sets is not None else _worker_rule_sets
+
+    # rules_key → (compiled, 전필/트랙전필 마스크, 트랙 과목 마스크) — chunk 안의 같은 학번끼리 공유
+    plans = {}
+    results = []
+
+    for user_id, username, student_id, rules_key, mask in chunk:
+        plan = plans.get(rules_key)
+        if plan is None:
+            compiled = rule_sets.get(rules_key)
+            if compiled is None:
+                plan = (None, 0, index.mask_of(mapped_codes))
+            else:
+                track = compiled.tracks.get(track_key)
+                relevant_codes = compiled.major_required_codes | (
+                    track.required_codes if track else frozenset()
+                )
+                plan = (
+                    compiled,
+                    index.mask_of(relevant_codes),
+                    index.mask_of(track_course_codes(track_key, compiled, mapped_codes)),
+                )
+            plans[rules_key] = plan
+        compiled, relevant_mask, track_mask = plan
+
+        total, credits, ge_area_count = index.tally(mask, track_mask)
+        if compiled is None:
+            results.append(_rules_not_found(user_id, username, student_id, total))
+            continue
+
+        result = compiled.evaluate(
+            completed_codes=index.decode(mask & relevant_mask),
+            credits=credits,
+            flags=flags,
+            total_credits=total,
+            ge_area_count=ge_area_count,
+            track_key=track_key,
+        )
+        results.append({
+            "user_id": user_id,
+            "username": username,
+            "student_id": student_id,
+            "total_credits": total,
+            "can_graduate": result["summary"]["can_graduate"],
+            "unmet_conditions": [k for k, ok in result["conditions"].items() if not ok],
+            "remaining_required": [c["code"] for c in result["major_required"]["remaining"]],
+        })
+
+    return results
+
+
+def _iter_chunks(users, chunk_size, index):
+    users = list(users)
+    for start in range(0, len(users), chunk_size):
+        part = users[start:start + chunk_size]
+        masks = load_user_masks([user_id for user_id, _, _, _ in part], index)
+        yield [
+            (user_id, username, student_id, rules_key, masks[user_id])
+            for user_id, username, student_id, rules_key in part
+        ]
+
+
+def iter_audit_results(users, track_key=None, flags=None, workers=1, chunk_size=200):
+    """
+    users: audit_queryset() 결과 — 규칙 세트는 유저마다 학번 + 학과로 고른다
+    (등록되지 않은 학번이면 can_graduate=None, unmet_conditions=["rules_not_found"])
+    결과 dict 를 유저 id 순서대로 하나씩 yield.
+    workers <= 1 이면 현재 프로세스에서 바로 평가한다.
+    """
+    flags = flags or NO_FLAGS
+    users = [
+        (user_id, username, student_id, cohort_key(student_id, department))
+        for user_id, username, student_id, department in users
+    ]
+    # 자식 프로세스에는 이번 점검에 나오는 학번의 규칙 세트만 넘긴다
+    all_rule_sets = get_rule_sets()
+    rule_sets = {rules_key: all_rule_sets.get(rules_key) for _, _, _, rules_key in users}
+    mapped_codes = track_mapped_codes(track_key)
+    index = get_course_index()
+    chunks = _iter_chunks(users, chunk_size, index)
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from evaluate_chunk(chunk, track_key, mapped_codes, flags, index, rule_sets)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(index, rule_sets)
+    ) as pool:
+        # 진행 중인 chunk 를 workers * 2 개로 제한 → 메모리 일정, 순서 유지
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(evaluate_chunk, chunk, track_key, mapped_codes, flags))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class Throughput:
+    """ 처리 건수 / 경과 시간 """
+
+    def __init__(self):
+        self.count = 0
+        self.started = time.perf_counter()
+
+    def add(self):
+        self.count += 1
+
+    def as_dict(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            "count": self.count,
+            "elapsed_sec": round(elapsed, 3),
+            "per_sec": round(self.count / elapsed, 1) if elapsed > 0 else None,
+        }
+
+
+def render_ndjson(results, throughput):
+    for record in results:
+        throughput.add()
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+    yield json.dumps({"summary": throughput.as_dict()}) + "\n"
+
+
+def render_csv(results, throughput):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def flush():
+        value = buf.getvalue()
+        buf.seek(0)
+        buf.truncate(0)
+        return value
+
+    writer.writerow(AUDIT_CSV_FIELDS)
+    yield flush()
+
+    for record in results:
+        throughput.add()
+        writer.writerow([
+            record["user_id"],
+            record["username"],
+            record["student_id"] or "",
+            record["total_credits"],
+            record["can_graduate"],
+            ";".join(record["unmet_conditions"]),
+            ";".join(record["remaining_required"]),
+        ])
+        yield flush()
+
+    # NDJSON 의 마지막 summary 줄과 같은 내용 (스트리밍이라 헤더로는 못 보냄)
+    # 표 데이터와 섞이지 않도록 "#" 주석 줄 — pandas.read_csv(comment="#") 등으로 건너뛸 수 있다
+    stats = throughput.as_dict()
+    yield "# summary: " + " ".join(f"{key}={value}" for key, value in stats.items()) + "\r\n"
+
+
+RENDERERS = {
+    "ndjson": render_ndjson,
+    "csv": render_csv,
+}
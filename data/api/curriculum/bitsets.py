@@ -0,0 +1,254 @@
+"""
+과목 코드 → 정수 id 인터닝 + 비트셋 연산
+
+카탈로그를 읽을 때 Course.code 마다 0.. 의 촘촘한 id 를 붙이고,
+과목 집합(이수 과목, 전공필수, 트랙, 교양 영역 등)을 파이썬 int 비트마스크로 표현한다.
+
+  - "필수 과목 전부 이수"   → required & ~completed == 0
+  - "집합 안에서 딴 학점"   → 학점 값별 마스크와 AND 후 popcount × 학점 (내적)
+  - "이수한 교양 영역 수"   → 영역 마스크와 AND 가 0 이 아닌 개수
+  - 선수과목 DAG           → 과목별 직접 선수 / 전체 선수(전이 폐포) / 전체 후속 과목 마스크를
+                             만들 때 한 번 계산 → "지금 수강 가능" / "열리는 과목" 이 과목당 AND 1번
+
+인덱스는 카탈로그 generation 이 바뀔 때만 다시 만든다 (catalog.py 와 같은 방식).
+"""
+from .credits import CATEGORY_CREDIT_KEYS
+from .generations import CATALOG, GENERATION_MAX_AGE, get_generation
+from .models import Course, CoursePrerequisite, TakenCourse
+
+
+class CourseIndex:
+    __slots__ = (
+        "generation",
+        "codes",
+        "ids",
+        "credit_masks",
+        "category_masks",
+        "level300_mask",
+        "level_masks",
+        "active_mask",
+        "area_masks",
+        "prereq_masks",
+        "ancestor_masks",
+        "descendant_masks",
+        "gated_ids",
+    )
+
+    def __init__(self, generation, rows, prereq_edges=(), inactive_codes=()):
+        """
+        rows: (code, credits, category, level, ge_area) — id 순서대로
+        prereq_edges: (과목 코드, 선수과목 코드) — 카탈로그에 없는 코드는 무시
+        inactive_codes: 은퇴한 과목 (이수 기록 집계에는 쓰지만 수강 가능 목록에서는 제외)
+        """
+        self.generation = generation
+        self.codes = tuple(row[0] for row in rows)
+        self.ids = {code: i for i, code in enumerate(self.codes)}
+
+        credit_masks = {}
+        category_masks = {}
+        area_masks = {}
+        level_masks = {}
+        level300_mask = 0
+
+        for i, (_, credits, category, level, ge_area) in enumerate(rows):
+            bit = 1 << i
+            credit_masks[credits] = credit_masks.get(credits, 0) | bit
+            category_masks[category] = category_masks.get(category, 0) | bit
+            level_masks[level] = level_masks.get(level, 0) | bit
+            if level >= 3000:
+                level300_mask |= bit
+            if ge_area:
+                area_masks[ge_area] = area_masks.get(ge_area, 0) | bit
+
+        # 학점 0 과목은 내적에 기여하지 않으므로 제외
+        credit_masks.pop(0, None)
+        self.credit_masks = tuple(credit_masks.items())
+        self.category_masks = category_masks
+        self.level300_mask = level300_mask
+        self.level_masks = level_masks
+        self.active_mask = ((1 << len(self.codes)) - 1) & ~self.mask_of(inactive_codes)
+        self.area_masks = tuple(area_masks.items())
+
+        self._build_prerequisites(prereq_edges)
+
+    def _build_prerequisites(self, prereq_edges):
+        n = len(self.codes)
+        ids = self.ids
+        prereq = [0] * n
+        dependents = [[] for _ in range(n)]
+
+        for code, prereq_code in prereq_edges:
+            i, p = ids.get(code), ids.get(prereq_code)
+            if i is None or p is None or i == p:
+                continue
+            if not prereq[i] >> p & 1:
+                prereq[i] |= 1 << p
+                dependents[p].append(i)
+
+        # 위상 순서 (Kahn) 로 전체 선수과목 = 직접 선수 ∪ 직접 선수들의 전체 선수
+        indegree = [mask.bit_count() for mask in prereq]
+        order = [i for i in range(n) if indegree[i] == 0]
+        for i in order:
+            for j in dependents[i]:
+                indegree[j] -= 1
+                if indegree[j] == 0:
+                    order.append(j)
+
+        ancestors = [0] * n
+        for i in order:
+            mask = prereq[i]
+            m = mask
+            while m:
+                low = m & -m
+                mask |= ancestors[low.bit_length() - 1]
+                m ^= low
+            ancestors[i] = mask
+
+        if len(order) < n:
+            # 순환이 남아 있으면 (load_courses 가 막지만 admin 으로 넣은 경우) 고정점까지 반복
+            rest = [i for i in range(n) if indegree[i] > 0]
+            changed = True
+            while changed:
+                changed = False
+                for i in rest:
+                    mask = prereq[i]
+                    for p in self._ids_of(prereq[i]):
+                        mask |= ancestors[p]
+                    if mask != ancestors[i]:
+                        ancestors[i] = mask
+                        changed = True
+
+        descendants = [0] * n
+        for i in range(n):
+            bit = 1 << i
+            for p in self._ids_of(ancestors[i]):
+                descendants[p] |= bit
+
+        self.prereq_masks = tuple(prereq)
+        self.ancestor_masks = tuple(ancestors)
+        self.descendant_masks = tuple(descendants)
+        # 선수과목이 있는 과목만 (eligible_mask 에서 나머지는 통째로 처리)
+        self.gated_ids = tuple(i for i in range(n) if prereq[i])
+
+    @staticmethod
+    def _ids_of(mask):
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    # ---------------------------------------
+    #   코드 ↔ 마스크
+    # ---------------------------------------
+    def mask_of(self, codes):
+        """ 카탈로그에 없는 코드는 무시 """
+        ids = self.ids
+        mask = 0
+        for code in codes:
+            i = ids.get(code)
+            if i is not None:
+                mask |= 1 << i
+        return mask
+
+    def decode(self, mask):
+        codes = self.codes
+        return [codes[i] for i in self._ids_of(mask)]
+
+    # ---------------------------------------
+    #   집합 연산
+    # ---------------------------------------
+    @staticmethod
+    def covers(mask, required_mask):
+        return required_mask & ~mask == 0
+
+    def credits_in(self, mask):
+        return sum(credits * (mask & m).bit_count() for credits, m in self.credit_masks)
+
+    def areas_in(self, mask):
+        return [area for area, m in self.area_masks if mask & m]
+
+    def tally(self, mask, track_mask=0):
+        """
+        credits.tally_credits() 의 비트셋 버전 → (총학점, credits dict, 교양 영역 수)
+        """
+        credits = {
+            "liberal_basic": 0,
+            "univ_required": 0,
+            "exploration": 0,
+            "major_basic": 0,
+            "level300": self.credits_in(mask & self.level300_mask),
+            "deep_major": 0,
+            "track": self.credits_in(mask & track_mask) if track_mask else 0,
+        }
+        for category, key in CATEGORY_CREDIT_KEYS.items():
+            category_mask = self.category_masks.get(category)
+            if category_mask:
+                credits[key] += self.credits_in(mask & category_mask)
+
+        ge_area_count = sum(1 for _, m in self.area_masks if mask & m)
+        return self.credits_in(mask), credits, ge_area_count
+
+    # ---------------------------------------
+    #   선수과목 (과목 id 기준, 모두 AND 1번)
+    # ---------------------------------------
+    def is_eligible(self, i, mask):
+        """ 직접 선수과목을 모두 이수했는지 """
+        return self.prereq_masks[i] & ~mask == 0
+
+    def missing_prerequisites(self, i, mask):
+        """ 아직 안 들은 전체 선수과목 (선수의 선수 포함) 마스크 """
+        return self.ancestor_masks[i] & ~mask
+
+    def unlocks(self, i):
+        """ i 를 (직간접) 선수로 요구하는 과목 마스크 """
+        return self.descendant_masks[i]
+
+    def level_mask(self, min_level):
+        mask = 0
+        for level, m in self.level_masks.items():
+            if level >= min_level:
+                mask |= m
+        return mask
+
+    def eligible_mask(self, mask):
+        """ 안 들은 (은퇴하지 않은) 과목 중 지금 바로 수강 가능한 과목 마스크 """
+        eligible = self.active_mask & ~mask
+        for i in self.gated_ids:
+            if self.prereq_masks[i] & ~mask:
+                eligible &= ~(1 << i)
+        return eligible
+
+
+_index = None
+
+
+def get_course_index():
+    global _index
+
+    generation = get_generation(CATALOG, max_age=GENERATION_MAX_AGE)
+    index = _index
+    if index is None or index.generation != generation:
+        rows = list(
+            Course.objects.order_by("id").values_list("code", "credits", "category", "level", "ge_area")
+        )
+        edges = CoursePrerequisite.objects.values_list("course__code", "prerequisite__code")
+        inactive = Course.objects.filter(is_active=False).values_list("code", flat=True)
+        index = CourseIndex(generation, rows, edges, inactive)
+        _index = index
+    return index
+
+
+def load_user_masks(user_ids, index):
+    """ 여러 유저의 이수 과목을 한 번에 비트마스크로 → {user_id: mask} """
+    masks = dict.fromkeys(user_ids, 0)
+    ids = index.ids
+    qs = (
+        TakenCourse.objects.filter(user_id__in=list(masks))
+        .values_list("user_id", "course__code")
+        .order_by()
+    )
+    for user_id, code in qs:
+        i = ids.get(code)
+        if i is not None:
+            masks[user_id] |= 1 << i
+    return masks
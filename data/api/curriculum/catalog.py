@@ -0,0 +1,89 @@
+"""
+과목 카탈로그 스냅샷
+
+GET /api/curriculum/courses/ 응답은 load_courses 를 돌릴 때만 바뀌므로,
+카탈로그가 바뀔 때마다 한 번만 JSON 직렬화 + gzip(/brotli) 압축해 두고
+요청마다 그 바이트를 그대로 내려준다.
+
+  - ETag 는 JSON 본문의 sha256 (인코딩별로 접미사만 다름)
+  - 무효화: Course 저장/삭제 시그널, load_courses 종료 시 bump_generation(CATALOG)
+    → 다른 워커는 generation 이 바뀐 것을 보고 다시 만든다 (GENERATION_MAX_AGE 안에서는 DB 를 다시 읽지 않음).
+"""
+import gzip
+import hashlib
+import json
+
+try:
+    import brotli
+except ImportError:  # brotli 는 선택 의존성
+    brotli = None
+
+from .generations import CATALOG, GENERATION_MAX_AGE, get_generation
+from .models import Course
+
+CATALOG_FIELDS = (
+    "code",
+    "name",
+    "credits",
+    "category",
+    "major_type",
+    "is_required",
+    "level",
+    "ge_area",
+)
+
+
+class CatalogSnapshot:
+    __slots__ = ("generation", "body", "gzip_body", "br_body", "content_hash")
+
+    def __init__(self, generation, courses):
+        self.generation = generation
+        self.body = json.dumps(courses, ensure_ascii=False).encode("utf-8")
+        self.gzip_body = gzip.compress(self.body, mtime=0)
+        self.br_body = brotli.compress(self.body) if brotli is not None else None
+        self.content_hash = hashlib.sha256(self.body).hexdigest()[:32]
+
+    def etag(self, encoding=None):
+        if encoding is None:
+            return f'"{self.content_hash}"'
+        return f'"{self.content_hash}-{encoding}"'
+
+    def matches(self, if_none_match):
+        """ If-None-Match 값이 이 스냅샷(어떤 인코딩이든)을 가리키는지 """
+        if not if_none_match:
+            return False
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        if "*" in tags:
+            return True
+        return any(
+            tag.removeprefix("W/").strip('"').split("-")[0] == self.content_hash
+            for tag in tags
+        )
+
+    def pick(self, accept_encoding):
+        """ Accept-Encoding 에 맞는 (encoding, body) 선택 """
+        accept_encoding = accept_encoding or ""
+        if self.br_body is not None and "br" in accept_encoding:
+            return "br", self.br_body
+        if "gzip" in accept_encoding:
+            return "gzip", self.gzip_body
+        return None, self.body
+
+
+_snapshot = None
+
+
+def build_catalog_snapshot(generation):
+    courses = list(Course.objects.filter(is_active=True).order_by("id").values(*CATALOG_FIELDS))
+    return CatalogSnapshot(generation, courses)
+
+
+def get_catalog_snapshot():
+    global _snapshot
+
+    generation = get_generation(CATALOG, max_age=GENERATION_MAX_AGE)
+    snapshot = _snapshot
+    if snapshot is None or snapshot.generation != generation:
+        snapshot = build_catalog_snapshot(generation)
+        _snapshot = snapshot
+    return snapshot
@@ -0,0 +1,131 @@
+"""
+TakenCourse 기반 학점 집계
+
+모델 인스턴스를 만들지 않고 DB 의 조건부 집계(SUM ... FILTER) 한 번으로
+총학점 / 전공기본 / 심화전공 / 3000단위 학점을 바로 계산한다.
+"""
+from django.db.models import Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import TakenCourse
+
+
+def _credit_sum(condition=None):
+    return Coalesce(Sum("course__credits", filter=condition), Value(0))
+
+
+# 응답 키 → 집계식 (get_credit_summary 응답 형식 그대로)
+CREDIT_SUMMARY_AGGREGATES = {
+    "total_credits": _credit_sum(),
+    "MAJOR_BASIC": _credit_sum(Q(course__category="MAJOR_BASIC")),
+    "MAJOR_DEEP": _credit_sum(Q(course__category="MAJOR_DEEP")),
+    "LEVEL300": _credit_sum(Q(course__level__gte=3000)),
+}
+
+
+def get_credit_summary_for_user(user):
+    """ 유저 1명의 학점 요약 (쿼리 1번) """
+    return TakenCourse.objects.filter(user=user).aggregate(**CREDIT_SUMMARY_AGGREGATES)
+
+
+def get_credit_summaries(user_ids):
+    """
+    여러 유저의 학점 요약을 한 번의 GROUP BY 쿼리로 계산.
+    반환: {user_id: {"total_credits": .., "MAJOR_BASIC": .., ...}}
+    수강 기록이 없는 유저도 0 으로 채워서 돌려준다.
+    """
+    user_ids = list(user_ids)
+    empty = {key: 0 for key in CREDIT_SUMMARY_AGGREGATES}
+    summaries = {user_id: dict(empty) for user_id in user_ids}
+
+    rows = (
+        TakenCourse.objects.filter(user_id__in=user_ids)
+        .values("user_id")
+        .annotate(**CREDIT_SUMMARY_AGGREGATES)
+        .order_by()
+    )
+    for row in rows:
+        user_id = row.pop("user_id")
+        summaries[user_id] = row
+
+    return summaries
+
+
+# =======================================
+#   학점 버킷 계산 (졸업요건 계산기 credits 형식)
+# =======================================
+# Course.category → calculate_graduation 의 credits 키
+CATEGORY_CREDIT_KEYS = {
+    "GE_BASIC": "liberal_basic",
+    "GE_UNIV_REQUIRED": "univ_required",
+    "EXPLORATION": "exploration",
+    "MAJOR_BASIC": "major_basic",
+    "MAJOR_DEEP": "deep_major",
+}
+
+# (code, credits, category, level, ge_area)
+COURSE_ROW_FIELDS = (
+    "course__code",
+    "course__credits",
+    "course__category",
+    "course__level",
+    "course__ge_area",
+)
+
+
+def load_course_rows(user_ids):
+    """
+    여러 유저의 이수 과목을 모델 인스턴스 없이 튜플로 한 번에 조회.
+    반환: {user_id: [(code, credits, category, level, ge_area), ...]}
+    """
+    rows = {user_id: [] for user_id in user_ids}
+    qs = (
+        TakenCourse.objects.filter(user_id__in=list(rows))
+        .values_list("user_id", *COURSE_ROW_FIELDS)
+        .order_by()
+    )
+    for user_id, *row in qs:
+        rows[user_id].append(tuple(row))
+    return rows
+
+
+def tally_credits(rows, track_codes=frozenset()):
+    """
+    load_course_rows() 의 한 유저분 → (이수 코드 set, 총학점, credits dict, 교양 영역 수)
+    credits dict 는 CompiledRules.CREDIT_KEYS 형식 그대로.
+    같은 과목을 여러 번 들은 기록은 한 번만 센다.
+    """
+    credits = {
+        "liberal_basic": 0,
+        "univ_required": 0,
+        "exploration": 0,
+        "major_basic": 0,
+        "level300": 0,
+        "deep_major": 0,
+        "track": 0,
+    }
+    codes = set()
+    ge_areas = set()
+    total = 0
+
+    for code, course_credits, category, level, ge_area in rows:
+        if code in codes:
+            continue
+        codes.add(code)
+
+        total += course_credits
+
+        key = CATEGORY_CREDIT_KEYS.get(category)
+        if key is not None:
+            credits[key] += course_credits
+
+        if level >= 3000:
+            credits["level300"] += course_credits
+
+        if code in track_codes:
+            credits["track"] += course_credits
+
+        if ge_area:
+            ge_areas.add(ge_area)
+
+    return codes, total, credits, len(ge_areas)
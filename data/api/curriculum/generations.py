@@ -0,0 +1,56 @@
+"""
+캐시 세대(generation) 카운터 헬퍼
+
+각 워커는 자기 메모리 캐시에 "만들 때의 generation" 을 같이 기억해 두고,
+요청마다 get_generation() 으로 DB 값과 비교한다.
+값이 다르면 다른 프로세스(load_courses, 다른 gunicorn 워커 등)가
+데이터를 바꾼 것이므로 캐시를 다시 만든다.
+"""
+import time
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import CacheGeneration
+
+CATALOG = "catalog"
+RULES = "rules"
+
+# 요청마다 불리는 캐시는 이 시간(초) 동안 마지막으로 읽은 generation 을 믿는다
+# (다른 워커의 변경은 최대 이만큼 늦게 반영, 같은 워커의 bump_generation 은 바로 반영)
+GENERATION_MAX_AGE = 1.0
+
+
+# key → (읽은 시각, generation) — max_age 를 준 호출에서만 사용
+_recent = {}
+
+
+def get_generation(key, max_age=0):
+    """
+    max_age(초) 를 주면 그 시간 안에 읽은 값은 DB 를 다시 보지 않는다
+    (검색처럼 키 입력마다 불리는 곳용, 대신 최대 max_age 만큼 늦게 반영됨)
+    """
+    if max_age:
+        recent = _recent.get(key)
+        if recent is not None and time.monotonic() - recent[0] < max_age:
+            return recent[1]
+
+    value = (
+        CacheGeneration.objects.filter(key=key)
+        .values_list("generation", flat=True)
+        .first()
+    ) or 0
+    _recent[key] = (time.monotonic(), value)
+    return value
+
+
+def bump_generation(key):
+    _recent.pop(key, None)
+    qs = CacheGeneration.objects.filter(key=key)
+    if qs.update(generation=F("generation") + 1, updated_at=timezone.now()):
+        return
+
+    _, created = CacheGeneration.objects.get_or_create(key=key, defaults={"generation": 1})
+    if not created:
+        # 다른 프로세스가 먼저 row 를 만든 경우
+        qs.update(generation=F("generation") + 1, updated_at=timezone.now())
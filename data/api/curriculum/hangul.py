@@ -0,0 +1,74 @@
+"""
+한글 검색 키 (자모 분해 / 초성)
+
+  - decompose("데이터 구조")  → "ㄷㅔㅇㅣㅌㅓㄱㅜㅈㅗ"
+      겹모음·겹받침도 낱자로 풀어서, 입력 중인 글자("데잍", "뎅")도 앞부분 일치로 찾을 수 있다.
+  - choseong("데이터 구조")   → "ㄷㅇㅌㄱㅈ"
+  - is_choseong_query("ㄷㅇㅌ") → True  (자음만 입력 → 초성 검색)
+
+한글이 아닌 글자는 소문자로 그대로 두고 공백은 지운다 (search.normalize 와 같은 규칙).
+검색 키는 저장 시점에 컬럼으로 만들어 둔다 (Course.name_jamo / name_choseong 등).
+"""
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = (
+    "ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ",
+    "ㅗㅣ", "ㅛ", "ㅜ", "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ",
+)
+JONGSEONG = (
+    "", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ",
+    "ㄹㅂ", "ㄹㅅ", "ㄹㅌ", "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ",
+    "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+)
+
+# 호환 자모로 따로 입력된 겹자모 (예: 입력 중 "ㅘ", "ㄳ") → 낱자
+COMPAT_SPLIT = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+
+# 호환 자모 자음 (ㄱ ~ ㅎ, 겹받침 포함)
+COMPAT_CONSONANTS = frozenset(chr(c) for c in range(0x3131, 0x314F))
+
+
+def _clean(text):
+    return "".join((text or "").lower().split())
+
+
+def decompose(text):
+    out = []
+    for ch in _clean(text):
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            index = code - HANGUL_BASE
+            out.append(CHOSEONG[index // 588])
+            out.append(JUNGSEONG[(index % 588) // 28])
+            out.append(JONGSEONG[index % 28])
+        else:
+            out.append(COMPAT_SPLIT.get(ch, ch))
+    return "".join(out)
+
+
+def choseong(text):
+    out = []
+    for ch in _clean(text):
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            out.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def is_choseong_query(text):
+    """ 공백 뺀 질의가 전부 자음이면 초성 검색 """
+    text = _clean(text)
+    return bool(text) and all(ch in COMPAT_CONSONANTS for ch in text)
+
+
+def search_keys(text):
+    """ → (자모 분해, 초성) — 모델 검색 키 컬럼용 """
+    return decompose(text), choseong(text)
@@ -0,0 +1,78 @@
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from curriculum.audit import (
+    ALL_FLAGS,
+    NO_FLAGS,
+    RENDERERS,
+    Throughput,
+    audit_queryset,
+    iter_audit_results,
+)
+from curriculum.rulesets import DEPARTMENT_LABELS, get_compiled_rules
+
+
+class Command(BaseCommand):
+    help = "저장된 수강내역(TakenCourse) 기준 졸업요건 일괄 점검 (NDJSON/CSV 출력)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--entry-year", type=int, help="입학년도 (학번 앞 4자리)")
+        parser.add_argument("--department", type=str, help="UserProfile.major_department (예: SOFTWARE)")
+        parser.add_argument("--user-ids", type=str, help="쉼표로 구분한 유저 id 목록")
+        parser.add_argument("--track", type=str, default="none", help="트랙 키 (예: ai_bigdata)")
+        parser.add_argument(
+            "--assume-flags",
+            action="store_true",
+            help="2전공/외국어/정보 인증은 충족한 것으로 간주",
+        )
+        parser.add_argument("--format", choices=sorted(RENDERERS), default="ndjson")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--chunk-size", type=int, default=200)
+        parser.add_argument("--output", type=str, help="결과 파일 경로 (기본: stdout)")
+
+    def handle(self, *args, **options):
+        user_ids = None
+        if options["user_ids"]:
+            try:
+                user_ids = [int(v) for v in options["user_ids"].split(",") if v.strip()]
+            except ValueError:
+                raise CommandError("--user-ids 형식 오류")
+
+        # 학번 / 학과를 콕 집어 점검할 때만 미리 확인 (그 외에는 유저마다 자기 학번 규칙으로 평가)
+        if options["entry_year"] and options["department"]:
+            entry_year = options["entry_year"]
+            department = DEPARTMENT_LABELS.get(options["department"], options["department"])
+            if get_compiled_rules(entry_year, department) is None:
+                raise CommandError(f"{entry_year}학번 {department} 졸업요건이 등록되어 있지 않습니다.")
+
+        users = audit_queryset(
+            entry_year=options["entry_year"],
+            department=options["department"],
+            user_ids=user_ids,
+        )
+
+        results = iter_audit_results(
+            users,
+            track_key=options["track"],
+            flags=ALL_FLAGS if options["assume_flags"] else NO_FLAGS,
+            workers=options["workers"],
+            chunk_size=options["chunk_size"],
+        )
+
+        throughput = Throughput()
+        render = RENDERERS[options["format"]]
+
+        out = open(options["output"], "w", encoding="utf-8", newline="") if options["output"] else sys.stdout
+        try:
+            for line in render(results, throughput):
+                out.write(line)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        stats = throughput.as_dict()
+        self.stderr.write(self.style.SUCCESS(
+            f"총 {stats['count']}명 점검 완료 ({stats['elapsed_sec']}초, {stats['per_sec']}명/초)"
+        ))
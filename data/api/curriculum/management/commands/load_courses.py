@@ -1,7 +1,13 @@
+import hashlib
 import json
+import time
 from decimal import Decimal
-from django.core.management.base import BaseCommand
-from curriculum.models import Course, Track, TrackCourse
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from curriculum.generations import CATALOG, bump_generation
+from curriculum.hangul import choseong, decompose
+from curriculum.models import Course, CoursePrerequisite, Track, TrackCourse
+from curriculum.tracks import TRACK_MAP
 
 CATEGORY_MAP = {
     "전공필수": "MAJOR_BASIC",
@@ -25,15 +31,6 @@ REQUIRED_MAP = {
     "교양필수": True,
 }
 
-TRACK_MAP = {
-    "ai_bigdata": "AI_BIGDATA",
-    "ai_media": "AI_MEDIA",
-    "ai_science": "AI_SCIENCE",
-    "smart_iot": "SMART_IOT",
-    "security": "SECURITY",
-}
-
-
 def extract_ge_area(category_name: str):
     """ '교양-3영역' → '3영역' """
     if category_name.startswith("교양-") and category_name.endswith("영역"):
@@ -41,82 +38,374 @@ def extract_ge_area(category_name: str):
     return None
 
 
+COURSE_FIELDS = (
+    "name",
+    "credits",
+    "category",
+    "ge_area",
+    "level",
+    "is_required",
+    "is_major_required",
+    "major_type",
+    "name_jamo",
+    "name_choseong",
+)
+
+
+def content_hash(fields):
+    """ 필드 dict → 안정적인 sha256 (키 순서와 무관) """
+    raw = json.dumps(fields, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def find_prerequisite_cycle(edges):
+    """
+    edges: {(과목 코드, 선수과목 코드), ...}
+    순환이 있으면 순환을 이루는 코드 리스트, 없으면 None
+    """
+    graph = {}
+    for code, prereq in edges:
+        graph.setdefault(code, []).append(prereq)
+
+    WHITE, GRAY, BLACK = 0, 1, 2
+    color = {}
+
+    for start in graph:
+        if color.get(start, WHITE) != WHITE:
+            continue
+        path = [start]
+        stack = [iter(graph.get(start, ()))]
+        color[start] = GRAY
+        while stack:
+            nxt = next(stack[-1], None)
+            if nxt is None:
+                color[path.pop()] = BLACK
+                stack.pop()
+                continue
+            state = color.get(nxt, WHITE)
+            if state == GRAY:
+                return path[path.index(nxt):] + [nxt]
+            if state == WHITE:
+                color[nxt] = GRAY
+                path.append(nxt)
+                stack.append(iter(graph.get(nxt, ())))
+    return None
+
+
+def build_course_fields(category_name, c):
+    """ JSON 과목 1개 → Course 필드 dict (code 제외) """
+    category_code = CATEGORY_MAP[category_name]
+    code = c.get("code")
+
+    # 자동 레벨 추출
+    level = 1000
+    if code[0] in ["S", "Y"] and code[3].isdigit():
+        level = int(code[3]) * 1000
+
+    name = c.get("name")
+
+    return {
+        "name": name,
+        "credits": int(Decimal(str(c.get("credits", 0)))),
+        "category": category_code,
+        "ge_area": extract_ge_area(category_name),
+        "level": level,
+        "is_required": REQUIRED_MAP.get(category_name, False),
+        "is_major_required": (category_name == "전공필수"),
+        "major_type": (
+            "SW_DEEP" if category_code == "MAJOR_DEEP"
+            else "SW_BASIC" if category_code == "MAJOR_BASIC"
+            else "NONE"
+        ),
+        # 초성 / 자모 검색 키 (이전 임포트 행은 hash 가 달라져 한 번 갱신되며 채워짐)
+        "name_jamo": decompose(name),
+        "name_choseong": choseong(name),
+    }
+
+
 class Command(BaseCommand):
     help = "한국어 JSON 기반 과목 + 트랙 데이터 로드"
 
     def add_arguments(self, parser):
         parser.add_argument("json_path", type=str)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="DB 에 쓰지 않고 변경 예정 내역만 출력",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="저장된 content_hash 대신 현재 DB 값으로 다시 비교 (admin 에서 직접 고친 과목 복구용)",
+        )
 
     def handle(self, *args, **options):
         path = options["json_path"]
+        dry_run = options["dry_run"]
+        full = options["full"]
+        started = time.perf_counter()
 
         try:
             with open(path, "r", encoding="utf-8") as f:
                 data = json.load(f)
         except FileNotFoundError:
-            self.stdout.write(self.style.ERROR("JSON 파일 없음"))
-            return
+            raise CommandError("JSON 파일 없음")
 
+        # ------------------------------
+        # 1) JSON → 원하는 상태 (같은 코드가 여러 번 나오면 뒤의 것이 이김)
+        # ------------------------------
         total = 0
+        desired = {}
 
         for category_name, course_list in data.items():
 
-            if category_name == "트랙전필":
+            if category_name in ("트랙전필", "선수과목"):
                 continue
 
             if category_name not in CATEGORY_MAP:
                 continue
 
-            category_code = CATEGORY_MAP[category_name]
-            ge_area = extract_ge_area(category_name)
-
             for c in course_list:
-                code = c.get("code")
-                name = c.get("name")
-                credits = Decimal(str(c.get("credits", 0)))
-
-                # 자동 레벨 추출
-                level = 1000
-                if code[0] in ["S", "Y"] and code[3].isdigit():
-                    level = int(code[3]) * 1000
-
-                Course.objects.update_or_create(
-                    code=code,
-                    defaults={
-                        "name": name,
-                        "credits": credits,
-                        "category": category_code,
-                        "ge_area": ge_area,
-                        "level": level,
-                        "is_required": REQUIRED_MAP.get(category_name, False),
-                        "is_major_required": (category_name == "전공필수"),
-                        "major_type": (
-                            "SW_DEEP" if category_code == "MAJOR_DEEP"
-                            else "SW_BASIC" if category_code == "MAJOR_BASIC"
-                            else "NONE"
-                        )
-                    }
-                )
+                desired[c.get("code")] = build_course_fields(category_name, c)
                 total += 1
 
-        # 트랙 처리
-        track_data = data.get("트랙전필", {})
-        for track_key, items in track_data.items():
+        desired_tracks = {}
+        for track_key, items in data.get("트랙전필", {}).items():
             if track_key not in TRACK_MAP:
                 continue
+            desired_tracks[TRACK_MAP[track_key]] = [item["code"] for item in items]
+
+        # "선수과목": {"SWE3016": ["SWE2001", ...]} — 섹션이 없으면 기존 선수과목은 건드리지 않음
+        sync_prereqs = "선수과목" in data
+        desired_prereqs = {
+            (code, prereq)
+            for code, prereqs in data.get("선수과목", {}).items()
+            for prereq in prereqs
+            if prereq != code
+        }
+
+        parsed_at = time.perf_counter()
+
+        # ------------------------------
+        # 2) 현재 DB 상태 한 번에 읽기
+        # ------------------------------
+        existing = {
+            row["code"]: row
+            for row in Course.objects.values("id", "code", "content_hash", "is_active", *COURSE_FIELDS)
+        }
+        existing_tracks = dict(Track.objects.values_list("name", "id"))
+        existing_links = {
+            (track_name, code): (link_id, link_hash)
+            for link_id, track_name, code, link_hash in TrackCourse.objects.values_list(
+                "id", "track__name", "course__code", "content_hash"
+            )
+        }
+        existing_prereqs = {
+            (code, prereq): link_id
+            for link_id, code, prereq in CoursePrerequisite.objects.values_list(
+                "id", "course__code", "prerequisite__code"
+            )
+        }
+
+        read_at = time.perf_counter()
+
+        # ------------------------------
+        # 3) content hash 로 diff (같은 hash 면 건너뜀)
+        # ------------------------------
+        hashes = {code: content_hash(fields) for code, fields in desired.items()}
+
+        if full:
+            for row in existing.values():
+                row["content_hash"] = content_hash({f: row[f] for f in COURSE_FIELDS})
+
+        to_create = []
+        to_update = []
+        for code in desired:
+            row = existing.get(code)
+            if row is None:
+                to_create.append(code)
+            elif row["content_hash"] != hashes[code] or not row["is_active"]:
+                to_update.append(code)
 
-            track_obj, _ = Track.objects.get_or_create(name=TRACK_MAP[track_key])
+        # 파일에서 빠진 과목은 지우지 않고 은퇴 처리 (TakenCourse 가 참조 중일 수 있음)
+        to_retire = sorted(
+            code for code, row in existing.items() if row["is_active"] and code not in desired
+        )
 
-            for item in items:
-                try:
-                    course = Course.objects.get(code=item["code"])
-                except Course.DoesNotExist:
+        known_codes = existing.keys() | desired.keys()
+        new_tracks = sorted(name for name in desired_tracks if name not in existing_tracks)
+
+        desired_links = {}
+        skipped_links = 0
+        for track_name, codes in desired_tracks.items():
+            for code in codes:
+                if code not in known_codes:
+                    skipped_links += 1
                     continue
+                desired_links[(track_name, code)] = content_hash(
+                    {"track": track_name, "course": code, "is_track_required": True}
+                )
+
+        links_to_upsert = [
+            key for key, link_hash in desired_links.items()
+            if existing_links.get(key, (None, None))[1] != link_hash
+        ]
+        stale_links = sorted(key for key in existing_links if key not in desired_links)
+
+        skipped_prereqs = {
+            (code, prereq) for code, prereq in desired_prereqs
+            if code not in known_codes or prereq not in known_codes
+        }
+        desired_prereqs -= skipped_prereqs
+        if sync_prereqs:
+            prereqs_to_add = sorted(desired_prereqs - existing_prereqs.keys())
+            stale_prereqs = sorted(existing_prereqs.keys() - desired_prereqs)
+        else:
+            prereqs_to_add, stale_prereqs = [], []
+
+        changed = bool(
+            to_create or to_update or to_retire or new_tracks or links_to_upsert or stale_links
+            or prereqs_to_add or stale_prereqs
+        )
+
+        diffed_at = time.perf_counter()
+
+        self.stdout.write(
+            f"과목: 추가 {len(to_create)} / 변경 {len(to_update)} / 은퇴 {len(to_retire)} / "
+            f"동일 {len(desired) - len(to_create) - len(to_update)}"
+        )
+        self.stdout.write(
+            f"트랙: 추가 {len(new_tracks)} / 트랙-과목 매핑 추가·변경 {len(links_to_upsert)} / "
+            f"매핑 삭제 {len(stale_links)} / 과목 없음 {skipped_links}"
+        )
+        if sync_prereqs:
+            self.stdout.write(
+                f"선수과목: 추가 {len(prereqs_to_add)} / 삭제 {len(stale_prereqs)} / "
+                f"과목 없음 {len(skipped_prereqs)}"
+            )
+
+        # 선수과목 그래프는 DAG 여야 함 (순환이면 아무것도 반영하지 않고 실패 종료 → CI / cron 이 알 수 있게)
+        cycle = find_prerequisite_cycle(desired_prereqs) if sync_prereqs else None
+        if cycle:
+            raise CommandError("선수과목 순환: " + " → ".join(cycle))
+
+        if dry_run:
+            for code in to_create:
+                self.stdout.write(f"  + {code} {desired[code]['name']}")
+            for code in to_update:
+                fields = [f for f in COURSE_FIELDS if existing[code][f] != desired[code][f]]
+                if not existing[code]["is_active"]:
+                    fields.append("is_active")
+                self.stdout.write(f"  ~ {code} ({', '.join(fields) or 'content_hash'})")
+            for code in to_retire:
+                self.stdout.write(f"  - {code} {existing[code]['name']}")
+            for track_name, code in links_to_upsert:
+                self.stdout.write(f"  + {track_name} ↔ {code}")
+            for track_name, code in stale_links:
+                self.stdout.write(f"  - {track_name} ↔ {code}")
+            for code, prereq in prereqs_to_add:
+                self.stdout.write(f"  + {prereq} → {code}")
+            for code, prereq in stale_prereqs:
+                self.stdout.write(f"  - {prereq} → {code}")
+            self.stdout.write(self.style.WARNING("--dry-run: DB 에 반영하지 않았습니다."))
+            self._report_timing(started, parsed_at, read_at, diffed_at, None)
+            return
+
+        if not changed:
+            # 아무것도 안 바뀌었으면 카탈로그 버전도 그대로 → 캐시 유지
+            self._report_timing(started, parsed_at, read_at, diffed_at, time.perf_counter())
+            self.stdout.write(self.style.SUCCESS("변경 사항 없음 (카탈로그 버전 유지)"))
+            return
+
+        # ------------------------------
+        # 4) 하나의 트랜잭션으로 반영 (중간 상태가 계산기에 보이지 않음)
+        # ------------------------------
+        with transaction.atomic():
+            upserts = [
+                Course(code=code, content_hash=hashes[code], is_active=True, **desired[code])
+                for code in to_create + to_update
+            ]
+            if upserts:
+                Course.objects.bulk_create(
+                    upserts,
+                    update_conflicts=True,
+                    unique_fields=["code"],
+                    update_fields=list(COURSE_FIELDS) + ["content_hash", "is_active"],
+                )
 
-                TrackCourse.objects.update_or_create(
-                    track=track_obj,
-                    course=course,
-                    defaults={"is_track_required": True}
+            if to_retire:
+                Course.objects.filter(code__in=to_retire).update(is_active=False)
+
+            if new_tracks:
+                Track.objects.bulk_create(
+                    [Track(name=name) for name in new_tracks],
+                    ignore_conflicts=True,
+                )
+
+            if stale_links:
+                TrackCourse.objects.filter(
+                    id__in=[existing_links[key][0] for key in stale_links]
+                ).delete()
+
+            if links_to_upsert:
+                track_ids = dict(Track.objects.values_list("name", "id"))
+                course_ids = dict(
+                    Course.objects.filter(
+                        code__in={code for _, code in links_to_upsert}
+                    ).values_list("code", "id")
+                )
+                TrackCourse.objects.bulk_create(
+                    [
+                        TrackCourse(
+                            track_id=track_ids[track_name],
+                            course_id=course_ids[code],
+                            is_track_required=True,
+                            content_hash=desired_links[(track_name, code)],
+                        )
+                        for track_name, code in links_to_upsert
+                    ],
+                    update_conflicts=True,
+                    unique_fields=["track", "course"],
+                    update_fields=["is_track_required", "content_hash"],
+                )
+
+            if stale_prereqs:
+                CoursePrerequisite.objects.filter(
+                    id__in=[existing_prereqs[key] for key in stale_prereqs]
+                ).delete()
+
+            if prereqs_to_add:
+                course_ids = dict(
+                    Course.objects.filter(
+                        code__in={code for edge in prereqs_to_add for code in edge}
+                    ).values_list("code", "id")
+                )
+                CoursePrerequisite.objects.bulk_create(
+                    [
+                        CoursePrerequisite(
+                            course_id=course_ids[code],
+                            prerequisite_id=course_ids[prereq],
+                        )
+                        for code, prereq in prereqs_to_add
+                    ],
+                    ignore_conflicts=True,
                 )
 
-        self.stdout.write(self.style.SUCCESS(f"총 {total}개 과목 등록 완료"))
\ No newline at end of file
+            # 실제로 바뀐 게 있을 때만 카탈로그 버전 올림 (커밋된 뒤에)
+            transaction.on_commit(lambda: bump_generation(CATALOG))
+
+        self._report_timing(started, parsed_at, read_at, diffed_at, time.perf_counter())
+        self.stdout.write(self.style.SUCCESS(f"총 {total}개 과목 등록 완료"))
+
+    def _report_timing(self, started, parsed_at, read_at, diffed_at, written_at):
+        def ms(a, b):
+            return f"{(b - a) * 1000:.1f}ms"
+
+        parts = [
+            f"파싱 {ms(started, parsed_at)}",
+            f"조회 {ms(parsed_at, read_at)}",
+            f"비교 {ms(read_at, diffed_at)}",
+        ]
+        if written_at is not None:
+            parts.append(f"반영 {ms(diffed_at, written_at)}")
+        self.stdout.write("소요 시간: " + ", ".join(parts))
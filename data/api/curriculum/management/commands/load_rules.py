@@ -0,0 +1,111 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from curriculum.models import AreaRequirement, GraduationRequirement
+from curriculum.rules import BUILTIN_RULES, compile_rules, derive_rules
+from curriculum.rulesets import AREA_RULE_KEYS, load_rule_sets
+
+# AreaRequirement 로 저장할 영역 (area_min_credits 키 → area_code, 이름)
+AREA_ROWS = {
+    key: (code, AreaRequirement.AreaCode(code).label)
+    for code, key in AREA_RULE_KEYS.items()
+}
+
+
+class Command(BaseCommand):
+    help = "졸업요건 규칙 JSON → GraduationRequirement / AreaRequirement (입학년도, 학과별)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "json_path",
+            nargs="?",
+            help=(
+                "규칙 JSON 파일 (meta.entry_year / meta.major 필수). 생략하면 내장 규칙을 등록. "
+                '"parent": {"entry_year": 2022, "major": "소프트웨어학부"} 가 있으면 '
+                "나머지는 부모와 달라진 부분만 적으면 된다"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        path = options["json_path"]
+
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    rule_docs = [json.load(f)]
+            except FileNotFoundError:
+                raise CommandError("JSON 파일 없음")
+        else:
+            rule_docs = list(BUILTIN_RULES.values())
+
+        with transaction.atomic():
+            for rules in rule_docs:
+                self._save(dict(rules))
+
+    def _save(self, rules):
+        parent_key = rules.pop("parent", None)
+        meta = rules.get("meta") or {}
+        if not meta.get("entry_year") or not meta.get("major"):
+            raise CommandError("meta.entry_year / meta.major 가 필요합니다.")
+
+        parent = None
+        if parent_key:
+            key = (parent_key.get("entry_year"), parent_key.get("major"))
+            parent = GraduationRequirement.objects.filter(entry_year=key[0], department=key[1]).first()
+            parent_compiled = load_rule_sets().get(key)
+            if parent is None or parent_compiled is None:
+                raise CommandError(f"부모 규칙 세트 {key[0]}학번 {key[1]} 가 DB 에 없습니다.")
+
+        # 먼저 컴파일해 보고 필수 키가 빠졌으면 저장하지 않음
+        try:
+            compiled = derive_rules(parent_compiled, rules) if parent else compile_rules(rules)
+        except (KeyError, TypeError) as e:
+            raise CommandError(f"규칙 형식 오류: {e}")
+
+        # 파생 세트는 JSON 에 적은 기준만 컬럼에 저장 → 나머지는 비워 두고 부모 값을 따라감
+        area_rules = rules.get("area_min_credits") or {}
+        level300_overridden = "level300_min_credits" in rules or "level300" in area_rules
+        requirement, created = GraduationRequirement.objects.update_or_create(
+            entry_year=compiled.entry_year,
+            department=compiled.major,
+            defaults={
+                "parent": parent,
+                "total_credits": (
+                    compiled.total_credits if not parent or "total_credits" in rules else None
+                ),
+                "min_major_credits": (
+                    compiled.area_min.get("major_basic", 0)
+                    if not parent or "major_basic" in area_rules else None
+                ),
+                "min_3000_level_credits": (
+                    compiled.level300_min_credits if not parent or level300_overridden else None
+                ),
+                "rules": rules,
+            },
+        )
+
+        # 파생 세트는 JSON 에 적은 영역만 저장 → 나머지는 부모 값을 따라감
+        area_keys = area_rules.keys() if parent else compiled.area_min.keys()
+
+        AreaRequirement.objects.filter(
+            requirement=requirement,
+            area_code__in=[code for code, _ in AREA_ROWS.values()],
+        ).delete()
+        AreaRequirement.objects.bulk_create([
+            AreaRequirement(
+                requirement=requirement,
+                area_code=code,
+                name=name,
+                min_credits=compiled.area_min[key],
+            )
+            for key, (code, name) in AREA_ROWS.items()
+            if key in area_keys
+        ])
+
+        action = "등록" if created else "갱신"
+        inherits = f", 부모 {parent}" if parent else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{compiled.entry_year}학번 {compiled.major} 졸업요건 {action} (version {compiled.version}{inherits})"
+        ))
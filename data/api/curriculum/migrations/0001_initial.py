@@ -0,0 +1,122 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheGeneration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=50, unique=True)),
+                ('generation', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Course',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=20, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('credits', models.PositiveSmallIntegerField(default=0)),
+                ('category', models.CharField(choices=[('GE_BASIC', '교양기초'), ('GE_UNIV_REQUIRED', '대학교양(필수)'), ('GE_UNIV_ELECTIVE', '대학교양(선택)'), ('EXPLORATION', '전공탐색'), ('MAJOR_BASIC', '전공(기본)'), ('MAJOR_DEEP', '전공(심화)')], max_length=30)),
+                ('major_type', models.CharField(choices=[('NONE', '해당없음'), ('SW_BASIC', '소프트웨어 기본전공'), ('SW_DEEP', '소프트웨어 심화전공')], default='NONE', max_length=20)),
+                ('is_required', models.BooleanField(default=False)),
+                ('is_major_required', models.BooleanField(default=False)),
+                ('level', models.PositiveSmallIntegerField(default=1000)),
+                ('ge_area', models.CharField(blank=True, max_length=50, null=True)),
+                ('note', models.TextField(blank=True)),
+                ('is_counted_in_basic_major', models.BooleanField(default=True)),
+                ('content_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('is_active', models.BooleanField(default=True)),
+                ('name_jamo', models.CharField(blank=True, default='', max_length=500)),
+                ('name_choseong', models.CharField(blank=True, db_index=True, default='', max_length=100)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Track',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(choices=[('AI_BIGDATA', 'AI빅데이터'), ('AI_MEDIA', 'AI미디어'), ('AI_SCIENCE', 'AI계산과학'), ('SMART_IOT', '스마트IoT'), ('SECURITY', '정보보안')], max_length=30, unique=True)),
+                ('description', models.TextField(blank=True)),
+                ('min_credits', models.PositiveSmallIntegerField(default=15)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GraduationRequirement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('major_type', models.CharField(choices=[('NONE', '해당없음'), ('SW_BASIC', '소프트웨어 기본전공'), ('SW_DEEP', '소프트웨어 심화전공')], default='SW_BASIC', max_length=20)),
+                ('entry_year', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('department', models.CharField(blank=True, max_length=50)),
+                ('total_credits', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('min_major_credits', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('min_3000_level_credits', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('rules', models.JSONField(blank=True, default=dict)),
+                ('note', models.TextField(blank=True)),
+                ('parent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='children', to='curriculum.graduationrequirement')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AreaRequirement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('area_code', models.CharField(choices=[('GE_BASIC', '교양기초'), ('GE_UNIV_REQUIRED', '대학교양(필수)'), ('GE_UNIV_ELECTIVE', '대학교양(선택)'), ('EXPLORATION', '전공탐색'), ('MAJOR', '전공 전체')], max_length=30)),
+                ('name', models.CharField(max_length=50)),
+                ('min_credits', models.PositiveSmallIntegerField()),
+                ('note', models.TextField(blank=True)),
+                ('requirement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='areas', to='curriculum.graduationrequirement')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TakenCourse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('semester', models.CharField(max_length=10)),
+                ('grade', models.CharField(blank=True, max_length=2)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='curriculum.course')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TrackCourse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_track_required', models.BooleanField(default=False)),
+                ('content_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='track_courses', to='curriculum.course')),
+                ('track', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='track_courses', to='curriculum.track')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CoursePrerequisite',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prerequisite_links', to='curriculum.course')),
+                ('prerequisite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='unlock_links', to='curriculum.course')),
+            ],
+            options={
+                'unique_together': {('course', 'prerequisite')},
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='graduationrequirement',
+            constraint=models.UniqueConstraint(fields=('entry_year', 'department'), name='unique_graduation_requirement_cohort'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='trackcourse',
+            unique_together={('track', 'course')},
+        ),
+    ]
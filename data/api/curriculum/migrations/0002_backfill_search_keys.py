@@ -0,0 +1,46 @@
+"""
+검색 키 컬럼(name_jamo / name_choseong)이 생기기 전에 들어간 과목만 채운다 (bulk_update)
+(content_hash 는 그대로 → 다음 load_courses 때 한 번 "변경" 으로 잡혀 정상화됨)
+되돌릴 때는 아무것도 하지 않는다
+"""
+from django.db import migrations
+from django.db.models import F
+from django.utils import timezone
+
+from curriculum.hangul import search_keys
+
+
+def forwards(apps, schema_editor):
+    using = schema_editor.connection.alias
+    Course = apps.get_model("curriculum", "Course")
+    CacheGeneration = apps.get_model("curriculum", "CacheGeneration")
+
+    courses = list(
+        Course.objects.using(using)
+        .filter(name_jamo="")
+        .exclude(name="")
+        .only("id", "name")
+    )
+    if not courses:
+        return
+
+    for course in courses:
+        course.name_jamo, course.name_choseong = search_keys(course.name)
+    Course.objects.using(using).bulk_update(courses, ["name_jamo", "name_choseong"], batch_size=500)
+
+    # 떠 있는 워커의 카탈로그 / 검색 캐시 무효화 (curriculum.generations.CATALOG)
+    CacheGeneration.objects.using(using).get_or_create(key="catalog")
+    CacheGeneration.objects.using(using).filter(key="catalog").update(
+        generation=F("generation") + 1, updated_at=timezone.now()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("curriculum", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
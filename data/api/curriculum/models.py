@@ -38,6 +38,14 @@ class Course(models.Model):
     note = models.TextField(blank=True)
     is_counted_in_basic_major = models.BooleanField(default=True)
 
+    # load_courses 가 관리: 임포트 필드의 sha256 / 파일에서 빠지면 False (은퇴)
+    content_hash = models.CharField(max_length=64, blank=True, default="")
+    is_active = models.BooleanField(default=True)
+
+    # 검색 키 (curriculum.hangul): 자모 분해 / 초성 — 저장 시 name 에서 채움 (signals, load_courses)
+    name_jamo = models.CharField(max_length=500, blank=True, default="")
+    name_choseong = models.CharField(max_length=100, blank=True, default="", db_index=True)
+
     def __str__(self):
         return f"{self.code} {self.name}"
 
@@ -68,6 +76,7 @@ class TrackCourse(models.Model):
     track = models.ForeignKey(Track, on_delete=models.CASCADE, related_name="track_courses")
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="track_courses")
     is_track_required = models.BooleanField(default=False)
+    content_hash = models.CharField(max_length=64, blank=True, default="")
 
     class Meta:
         unique_together = ("track", "course")
@@ -78,6 +87,9 @@ class TrackCourse(models.Model):
 
 # =====================================
 # 4. 졸업요건 테이블
+#    - (entry_year, department) 별 1 row → 계산기 규칙 세트 (curriculum/rulesets.py)
+#    - 숫자 기준은 컬럼 / AreaRequirement, 과목 목록·트랙·인증 등은 rules(JSON)
+#    - parent 가 있으면 rules 에는 부모와 달라진 경로만 적는다 (rules.merge_rules)
 # =====================================
 class GraduationRequirement(models.Model):
     major_type = models.CharField(
@@ -86,13 +98,36 @@ class GraduationRequirement(models.Model):
         default=Course.MajorType.SW_BASIC,
     )
 
-    total_credits = models.PositiveSmallIntegerField(default=135)
-    min_major_credits = models.PositiveSmallIntegerField(default=36)
-    min_3000_level_credits = models.PositiveSmallIntegerField(default=45)
+    entry_year = models.PositiveSmallIntegerField(null=True, blank=True)  # 입학년도 (학번 앞 4자리)
+    department = models.CharField(max_length=50, blank=True)             # 예: "소프트웨어학부"
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="children",
+    )
+
+    # 비워 두면 rules(JSON) / 부모 세트의 값을 따른다 (파생 세트는 바꾼 기준만 채움)
+    total_credits = models.PositiveSmallIntegerField(null=True, blank=True)
+    min_major_credits = models.PositiveSmallIntegerField(null=True, blank=True)
+    min_3000_level_credits = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    rules = models.JSONField(default=dict, blank=True)
 
     note = models.TextField(blank=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["entry_year", "department"],
+                name="unique_graduation_requirement_cohort",
+            ),
+        ]
+
     def __str__(self):
+        if self.entry_year:
+            return f"{self.entry_year}학번 {self.department} 졸업요건"
         return f"{self.get_major_type_display()} 졸업요건"
 
 
@@ -136,3 +171,33 @@ class TakenCourse(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.course.code} ({self.year} {self.semester})"
+
+
+# =====================================
+# 7. 캐시 세대(generation) 카운터
+#    - 과목 카탈로그 등 워커별 캐시를 모든 워커에서 무효화하기 위한 값
+#    - key 별로 1 row, 데이터가 바뀔 때마다 generation += 1
+# =====================================
+class CacheGeneration(models.Model):
+    key = models.CharField(max_length=50, unique=True)
+    generation = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key} #{self.generation}"
+
+
+# =====================================
+# 8. 선수과목 (course 를 들으려면 prerequisite 를 먼저 이수)
+#    - 그래프는 DAG (load_courses 가 순환을 거부)
+#    - 도달 가능성(전이 폐포)은 bitsets.CourseIndex 가 메모리에 비트셋으로 들고 있음
+# =====================================
+class CoursePrerequisite(models.Model):
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="prerequisite_links")
+    prerequisite = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="unlock_links")
+
+    class Meta:
+        unique_together = ("course", "prerequisite")
+
+    def __str__(self):
+        return f"{self.prerequisite.code} → {self.course.code}"
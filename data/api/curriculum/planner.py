@@ -0,0 +1,317 @@
+"""
+남은 졸업요건 플래너
+
+현재 이수 과목(TakenCourse) + 목표 트랙 기준으로 아직 못 채운 조건
+(영역별 최소학점, 3000단위 학점, 심화전공/트랙 학점, 교양 선택 영역 수,
+전공필수·트랙전필 과목)을 모두 채우는 "학점 합이 가장 작은" 과목 조합을 찾는다.
+
+  1) 남은 전공필수 / 트랙전필 과목은 무조건 포함
+  2) greedy (부족분 기여 / 학점 비율) 로 첫 해 → 상한
+  3) branch-and-bound 로 더 작은 조합 탐색, 시간 예산을 넘기면 best-so-far 반환
+
+졸업 총학점(135)은 자유선택/2전공으로도 채울 수 있으므로 조합 조건에서 제외하고
+남은 학점(total_credits_gap)만 알려준다.
+"""
+import math
+import time
+
+from .audit import track_course_codes
+from .credits import CATEGORY_CREDIT_KEYS, load_course_rows, tally_credits
+from .models import Course
+
+DEFAULT_BUDGET_MS = 300
+MAX_BUDGET_MS = 2000
+
+# 학점 부족분 차원 (CompiledRules.CREDIT_KEYS 중 플래너가 채우는 것)
+AREA_DIMS = ("liberal_basic", "univ_required", "exploration", "major_basic")
+DIMS = AREA_DIMS + ("level300", "deep_major", "track")
+
+# 과목 1개는 category 가 하나뿐이라 이 차원들은 서로 겹치지 않는다 (하한 계산용)
+CATEGORY_DIMS = tuple(DIMS.index(key) for key in AREA_DIMS + ("deep_major",))
+# category 와 겹쳐서 채워지는 차원 (3000단위 / 트랙 과목은 어느 category 든 될 수 있다)
+OVERLAY_DIMS = tuple(DIMS.index(key) for key in ("level300", "track"))
+
+
+class _Timeout(Exception):
+    pass
+
+
+class Candidate:
+    __slots__ = ("code", "name", "credits", "category", "level", "ge_area", "dims", "profile")
+
+    def __init__(self, code, name, credits, category, level, ge_area, track_codes):
+        self.code = code
+        self.name = name
+        self.credits = credits
+        self.category = category
+        self.level = level
+        self.ge_area = ge_area
+
+        dims = []
+        key = CATEGORY_CREDIT_KEYS.get(category)
+        if key is not None:
+            dims.append(DIMS.index(key))
+        if level >= 3000:
+            dims.append(DIMS.index("level300"))
+        if code in track_codes:
+            dims.append(DIMS.index("track"))
+        self.dims = tuple(dims)
+
+        # 같은 profile 의 과목은 서로 바꿔도 결과가 같다 (탐색 대칭 제거용)
+        self.profile = (self.dims, credits, ge_area)
+
+    def as_dict(self):
+        return {
+            "code": self.code,
+            "name": self.name,
+            "credits": self.credits,
+            "category": self.category,
+            "level": self.level,
+            "ge_area": self.ge_area,
+        }
+
+
+class PlanState:
+    """ 부족분 (학점 차원별 + 교양 영역 수) """
+
+    __slots__ = ("deficits", "area_need", "covered_areas")
+
+    def __init__(self, deficits, area_need, covered_areas):
+        self.deficits = deficits
+        self.area_need = area_need
+        self.covered_areas = covered_areas
+
+    def done(self):
+        return self.area_need <= 0 and not any(self.deficits)
+
+    def gain(self, cand):
+        """ cand 를 넣었을 때 줄어드는 부족분 합 (영역 1개는 학점 3 으로 환산) """
+        gain = sum(min(cand.credits, self.deficits[d]) for d in cand.dims)
+        if self.area_need > 0 and cand.ge_area and cand.ge_area not in self.covered_areas:
+            gain += 3
+        return gain
+
+    def take(self, cand):
+        deficits = list(self.deficits)
+        for d in cand.dims:
+            deficits[d] = max(0, deficits[d] - cand.credits)
+
+        area_need = self.area_need
+        covered = self.covered_areas
+        if cand.ge_area and cand.ge_area not in covered:
+            covered = covered | {cand.ge_area}
+            area_need -= 1
+        return PlanState(tuple(deficits), area_need, covered)
+
+    def as_dict(self):
+        remaining = {dim: value for dim, value in zip(DIMS, self.deficits) if value}
+        if self.area_need > 0:
+            remaining["univ_elective_areas"] = self.area_need
+        return remaining
+
+
+class Planner:
+    def __init__(self, state, candidates, budget_ms):
+        # 정적 효용(학점당 기여) 높은 순 → 좋은 해를 빨리 찾도록
+        self.candidates = sorted(
+            candidates,
+            key=lambda c: (-state.gain(c) / max(c.credits, 1), c.credits, c.code),
+        )
+        self.start_state = state
+        self.deadline = time.perf_counter() + budget_ms / 1000
+        self.nodes = 0
+
+        # i 번째와 profile 이 다른 첫 인덱스
+        n = len(self.candidates)
+        self.next_distinct = [n] * n
+        for i in range(n - 2, -1, -1):
+            if self.candidates[i + 1].profile != self.candidates[i].profile:
+                self.next_distinct[i] = i + 1
+            else:
+                self.next_distinct[i] = self.next_distinct[i + 1]
+
+        area_cands = [c for c in self.candidates if c.ge_area]
+        self.min_area_credits = min((c.credits for c in area_cands), default=0)
+        # 교양 영역 과목이 category 차원과 겹치지 않으면 하한을 더할 수 있다
+        self.area_disjoint = not any(set(c.dims) & set(CATEGORY_DIMS) for c in area_cands)
+        # 3000단위 / 트랙 차원과도 안 겹치면 그 하한에도 더할 수 있다
+        self.area_overlay = any(set(c.dims) & set(OVERLAY_DIMS) for c in area_cands)
+
+        # overlay 차원 → 그 차원 과목이 함께 채울 수 있는 category 차원들
+        self.overlay_categories = {
+            o: tuple({d for c in self.candidates if o in c.dims for d in c.dims if d in CATEGORY_DIMS})
+            for o in OVERLAY_DIMS
+        }
+
+        # 모든 후보 학점의 최대공약수 — 들을 학점 합은 항상 이 단위이므로 하한을 올림할 수 있다
+        self.credit_unit = math.gcd(*(c.credits for c in self.candidates)) or 1
+
+        self.best = None
+        self.best_credits = None
+        self.best_state = None
+
+    def lower_bound(self, state):
+        """
+        앞으로 더 들어야 할 학점의 하한
+          - category 차원 부족분은 서로 다른 과목으로만 채울 수 있으므로 합산
+          - 3000단위 / 트랙 부족분 중 그 과목들이 속할 수 있는 category 부족분을 넘는 만큼은
+            category 부족분과 별개로 더 들어야 한다
+          - 교양 영역은 영역 수 × 최소 학점
+          - 전부 credit_unit 의 배수로 올림
+        """
+        deficits = state.deficits
+        category_need = sum(deficits[d] for d in CATEGORY_DIMS)
+        extra = max(
+            deficits[o] - sum(deficits[d] for d in self.overlay_categories[o])
+            for o in OVERLAY_DIMS
+        )
+        extra = max(extra, 0)
+        area_bound = max(state.area_need, 0) * self.min_area_credits
+
+        if not self.area_disjoint:
+            bound = max(category_need + extra, area_bound)
+        elif self.area_overlay:
+            bound = category_need + max(extra, area_bound)
+        else:
+            bound = category_need + extra + area_bound
+
+        unit = self.credit_unit
+        return -(-bound // unit) * unit
+
+    def greedy(self):
+        state = self.start_state
+        chosen = []
+        remaining = list(self.candidates)
+        while not state.done():
+            best = max(remaining, key=lambda c: state.gain(c) / max(c.credits, 1), default=None)
+            if best is None or state.gain(best) <= 0:
+                break
+            remaining.remove(best)
+            chosen.append(best)
+            state = state.take(best)
+        return chosen, state
+
+    def _search(self, i, state, credits, chosen):
+        self.nodes += 1
+        if self.nodes & 0xFF == 0 and time.perf_counter() > self.deadline:
+            raise _Timeout
+
+        if state.done():
+            if self.best_credits is None or credits < self.best_credits:
+                self.best = list(chosen)
+                self.best_credits = credits
+                self.best_state = state
+            return
+
+        if self.best_credits is not None and credits + self.lower_bound(state) >= self.best_credits:
+            return
+
+        if i >= len(self.candidates):
+            return
+
+        cand = self.candidates[i]
+        if state.gain(cand) > 0:
+            chosen.append(cand)
+            self._search(i + 1, state.take(cand), credits + cand.credits, chosen)
+            chosen.pop()
+
+        # cand 를 빼기로 했으면 같은 profile 의 나머지도 뺀다
+        self._search(self.next_distinct[i], state, credits, chosen)
+
+    def solve(self):
+        chosen, state = self.greedy()
+        if not state.done():
+            # 카탈로그 전체로도 못 채움 → greedy 결과 그대로
+            return chosen, state, False
+
+        self.best = chosen
+        self.best_credits = sum(c.credits for c in chosen)
+        self.best_state = state
+
+        try:
+            self._search(0, self.start_state, 0, [])
+            optimal = True
+        except _Timeout:
+            optimal = False
+
+        return self.best, self.best_state, optimal
+
+
+def build_plan(user, compiled, track_key, budget_ms=DEFAULT_BUDGET_MS):
+    started = time.perf_counter()
+    track = compiled.tracks.get(track_key)
+    track_codes = track_course_codes(track_key, compiled)
+
+    rows = load_course_rows([user.id])[user.id]
+    taken_codes, total, credits, _ = tally_credits(rows, track_codes)
+    covered_areas = frozenset(row[4] for row in rows if row[4])
+
+    catalog = {
+        row[0]: row
+        for row in Course.objects.filter(is_active=True).values_list(
+            "code", "name", "credits", "category", "level", "ge_area"
+        )
+    }
+
+    # 1) 반드시 들어야 하는 과목 (전공필수 + 트랙전필)
+    mandatory_codes = set(compiled.major_required_codes)
+    if track is not None:
+        mandatory_codes |= track.required_codes
+    mandatory_codes -= taken_codes
+
+    mandatory = [
+        Candidate(*catalog[code], track_codes) for code in sorted(mandatory_codes) if code in catalog
+    ]
+    missing_codes = sorted(code for code in mandatory_codes if code not in catalog)
+
+    # 2) 학점 부족분
+    required = {key: compiled.area_min[key] for key in AREA_DIMS}
+    required["level300"] = compiled.level300_min_credits
+    if track is not None:
+        required["deep_major"] = compiled.deep_major_min_credits
+        required["track"] = compiled.track_min_credits
+    else:
+        required["deep_major"] = 0
+        required["track"] = 0
+
+    initial_state = PlanState(
+        tuple(max(0, required[dim] - credits[dim]) for dim in DIMS),
+        max(0, compiled.univ_elective_min_areas - len(covered_areas)),
+        covered_areas,
+    )
+    state = initial_state
+    for cand in mandatory:
+        state = state.take(cand)
+
+    # 3) 후보: 안 들은 과목 중 부족분에 기여할 수 있는 것만
+    excluded = taken_codes | mandatory_codes
+    candidates = []
+    for code, row in catalog.items():
+        if code in excluded:
+            continue
+        cand = Candidate(*row, track_codes)
+        if state.gain(cand) > 0:
+            candidates.append(cand)
+
+    remaining_ms = max(0, budget_ms - (time.perf_counter() - started) * 1000)
+    planner = Planner(state, candidates, remaining_ms)
+    chosen, final_state, optimal = planner.solve()
+
+    courses = mandatory + list(chosen)
+    planned_credits = sum(c.credits for c in courses)
+
+    return {
+        "track": track_key if track is not None else None,
+        "optimal": optimal,
+        "satisfiable": final_state.done() and not missing_codes,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "searched_nodes": planner.nodes,
+        "deficits_before": initial_state.as_dict(),
+        "unmet_after": final_state.as_dict(),
+        "missing_required_codes": missing_codes,
+        "planned_credits": planned_credits,
+        "total_credits_gap": max(0, compiled.total_credits - total - planned_credits),
+        "courses": [
+            {**c.as_dict(), "required": c.code in mandatory_codes} for c in courses
+        ],
+    }
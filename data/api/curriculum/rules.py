@@ -0,0 +1,482 @@
+"""
+졸업요건 규칙 엔진
+
+규칙 dict(GRAD_RULES_2022_SWE, DB 의 GraduationRequirement 등)를 요청마다 다시 훑지 않도록,
+한 번만 "컴파일"해서 불변 평가기(CompiledRules)로 만들어 둔다.
+(입학년도, 학과) → CompiledRules 조회와 캐시는 rulesets.py 담당.
+
+  - 전공필수/트랙전필 과목 코드는 intern 된 frozenset 으로 보관
+  - 필수 학점 합계, 영역별 최소학점, 진행률 기준값은 미리 계산
+  - rules_meta 는 JSON 바이트로 한 번만 직렬화 + 버전 해시(rules_version)
+    → 클라이언트가 같은 버전을 이미 갖고 있으면 응답에서 생략 가능
+  - 부모 규칙 세트 + 바뀐 경로(overrides)만으로 파생 세트를 만들 수 있다 (derive_rules).
+    overrides 가 건드리지 않은 과목 목록 / 트랙은 부모의 컴파일 결과를 그대로 공유
+"""
+import hashlib
+import json
+import sys
+from functools import cached_property
+from types import MappingProxyType
+
+
+# =======================================
+#   2022 SWE 졸업요건 규칙 정의
+# =======================================
+GRAD_RULES_2022_SWE = {
+    "meta": {"entry_year": 2022, "major": "소프트웨어학부"},
+
+    "total_credits": 135,
+    "need_second_major": True,
+
+    "certifications": {
+        "language": {"required": True, "label": "외국어인증"},
+        "it_or_industry": {
+            "required": True,
+            "options": ["정보인증", "산업실무역량인증"],
+        },
+    },
+
+    "level300_min_credits": 45,
+
+    "multi_major_required_rule": {
+        "type": "text_rule",
+        "description": (
+            "재학생 복수전공 이수 시: "
+            "(1) 전공필수가 12학점 이상인 전공은 전공필수 12학점 이상 취득, "
+            "(2) 전공필수가 12학점 미만인 전공은 전공필수 전체 이수."
+        ),
+    },
+
+    "overlap_rules": {
+        "basic_vs_explore": {
+            "max_credits": 3,
+            "description": "기본전공을 1전공으로 이수 시, 지정 전공탐색 3학점까지 전공학점으로 중복 인정.",
+        },
+        "basic_vs_deep": {
+            "max_credits": 7,
+            "description": "기본전공과 심화전공 공통 교과목은 최대 7학점까지 심화전공 학점으로 인정.",
+        },
+    },
+
+    "liberal_arts": {
+        "basic_min_credits": 22,
+        "univ_required": {
+            "min_credits": 5,
+            "courses": [
+                {"name": "SW소양영어", "area": "3영역 언어와표현", "credits": 2},
+                {"name": "자바프로그래밍", "area": "10영역 정보기술", "credits": 3},
+            ],
+        },
+        "univ_elective": {
+            "min_areas": 5,
+            "areas": [
+                "1영역 문화예술",
+                "2영역 인간과공동체",
+                "3영역 언어와표현",
+                "4영역 가치와윤리",
+                "5영역 국가와사회",
+                "6영역 지역과세계",
+                "9영역 생명과환경",
+            ],
+        },
+        "exploration": {"min_credits": 21},
+    },
+
+    "major": {
+        "basic_min_credits": 36,
+        "not_count_as_major": [
+            {"code": "SWE2006", "name": "기초데이터구조"},
+            {"code": "SWE2014", "name": "기초알고리즘"},
+            {"code": "SWE2015", "name": "기초프로그래밍"},
+            {"code": "SWE4025", "name": "PBL스타트업"},
+            {"code": "SWE3026", "name": "융합SW-PBL"},
+            {"code": "SWE3017", "name": "인턴십"},
+            {"code": "SWE3027", "name": "융합SW인턴십"},
+            {"code": "SWE4011", "name": "산학공동프로젝트"},
+            {"code": "SWE4024", "name": "프로젝트문제해결"},
+            {"code": "SWE3028", "name": "융합SW프로젝트"},
+        ],
+        "required_courses": [
+            {"code": "SWE2001", "name": "데이터구조론", "credits": 3},
+            {"code": "SWE3016", "name": "인공지능", "credits": 3},
+            {"code": "SWE3017", "name": "데이터베이스", "credits": 3},
+        ],
+    },
+
+    "deep_major": {
+        "min_credits": 36,
+        "track_min_credits": 15,
+        "need_two_track_required": True,
+        "allow_basic_overlap_max": 7,
+    },
+
+    "tracks": {
+        "ai_bigdata": {
+            "name": "AI·빅데이터 트랙",
+            "required_courses": [
+                {"code": "SWE3016", "name": "인공지능", "credits": 3},
+                {"code": "SWE3017", "name": "데이터베이스", "credits": 3},
+            ],
+        },
+        "ai_media": {
+            "name": "AI미디어 트랙",
+            "required_courses": [
+                {"code": "SWE3016", "name": "인공지능", "credits": 3},
+                {"code": "SWE3019", "name": "디지털신호처리", "credits": 3},
+            ],
+        },
+        "ai_science": {
+            "name": "AI계산과학 트랙",
+            "required_courses": [
+                {"code": "SWE3016", "name": "인공지능", "credits": 3},
+                {"code": "SWE3020", "name": "수치해석과최적화", "credits": 3},
+            ],
+        },
+        "smart_iot": {
+            "name": "스마트IoT 트랙",
+            "required_courses": [
+                {"code": "SWE3022", "name": "임베디드시스템", "credits": 3},
+                {"code": "SWE3023", "name": "컴퓨터네트워크", "credits": 3},
+            ],
+        },
+        "security": {
+            "name": "정보보안 트랙",
+            "required_courses": [
+                {"code": "SWE3009", "name": "암호학", "credits": 3},
+                {"code": "SWE3024", "name": "정보보안", "credits": 3},
+            ],
+        },
+    },
+
+    "area_min_credits": {
+        "liberal_basic": 22,
+        "univ_required": 5,
+        "exploration": 21,
+        "major_basic": 36,
+        "level300": 45,
+    },
+}
+
+
+# DB 에 규칙 세트가 없을 때 쓰는 내장 규칙: (입학년도, 학과) → 규칙 dict
+BUILTIN_RULES = {
+    (2022, "소프트웨어학부"): GRAD_RULES_2022_SWE,
+}
+
+
+# 조건 이름 → 판정에 쓰는 입력 (what-if 에서 바뀐 입력에 걸린 조건만 다시 계산할 때 사용)
+#   credits.<key> / flags.<key> : 학점 버킷, 체크 항목
+#   major_required / track      : 이수 과목 코드로 계산되는 전공필수·트랙 결과
+CONDITION_INPUTS = {
+    "total_credits": {"total_credits"},
+    "second_major": {"flags.second_major_done"},
+    "language_cert": {"flags.language_cert"},
+    "it_or_industry_cert": {"flags.it_cert", "flags.industry_cert"},
+    "level300": {"credits.level300"},
+    "liberal_basic": {"credits.liberal_basic"},
+    "univ_required": {"credits.univ_required"},
+    "univ_elective_areas": {"ge_area_count"},
+    "exploration": {"credits.exploration"},
+    "major_basic": {"credits.major_basic"},
+    "major_required_all": {"major_required"},
+    "deep_major_min": {"credits.deep_major", "track"},
+    "track_min_credits": {"credits.track", "track"},
+    "track_required_all": {"track"},
+}
+
+
+def merge_rules(base, overrides):
+    """
+    copy-on-write 병합. overrides 는 base 와 같은 모양의 "바뀐 부분만" 담은 dict
+      - dict 끼리는 재귀 병합, 그 외 값은 통째로 교체, None 은 키 삭제
+    overrides 에 나오지 않은 하위 구조는 복사하지 않고 base 의 객체를 그대로 가리킨다.
+    """
+    if not overrides:
+        return base
+
+    merged = dict(base)
+    for key, value in overrides.items():
+        if value is None:
+            merged.pop(key, None)
+        elif isinstance(value, dict) and isinstance(base.get(key), dict):
+            merged[key] = merge_rules(base[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _touches(overrides, *path):
+    """ overrides 가 path (또는 그 상위 경로) 를 바꾸는지 """
+    node = overrides
+    for key in path:
+        if not isinstance(node, dict):
+            return True
+        if key not in node:
+            return False
+        node = node[key]
+    return True
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def calc_percent(earned, required):
+    if required <= 0:
+        return 100
+    return int((earned / required) * 100)
+
+
+def _freeze_courses(courses):
+    """ 과목 dict 리스트 → (code intern 된) dict 튜플. 반환된 dict 는 읽기 전용으로만 쓴다. """
+    return tuple(
+        {"code": sys.intern(c["code"]), "name": c.get("name", ""), "credits": c.get("credits", 0)}
+        for c in courses
+    )
+
+
+# =======================================
+#   트랙 1개 (컴파일 결과)
+# =======================================
+class CompiledTrack:
+    __slots__ = ("key", "name", "required_courses", "required_codes", "required_credits")
+
+    def __init__(self, key, info):
+        self.key = key
+        self.name = info["name"]
+        self.required_courses = _freeze_courses(info.get("required_courses", []))
+        self.required_codes = frozenset(c["code"] for c in self.required_courses)
+        self.required_credits = sum(c["credits"] for c in self.required_courses)
+
+    def evaluate(self, completed_codes):
+        done = self.required_codes & completed_codes
+        completed = [c for c in self.required_courses if c["code"] in done]
+        earned = sum(c["credits"] for c in completed)
+        return {
+            "track_key": self.key,
+            "track_name": self.name,
+            "required_credits": self.required_credits,
+            "earned_credits": earned,
+            "completed": completed,
+        }
+
+
+# =======================================
+#   규칙 세트 (컴파일 결과)
+# =======================================
+class CompiledRules:
+    """
+    compile_rules() 로만 만든다. 생성 후에는 값이 바뀌지 않으므로
+    같은 워커의 모든 요청이 하나의 인스턴스를 공유해도 안전하다.
+    """
+
+    # 진행률을 내려줄 영역 (area_min_credits 키)
+    AREA_PROGRESS_KEYS = ("liberal_basic", "univ_required", "exploration", "major_basic", "level300")
+
+    # 클라이언트가 보내는 credits 키 (rules 와 무관하게 고정)
+    CREDIT_KEYS = (
+        "liberal_basic",
+        "univ_required",
+        "exploration",
+        "major_basic",
+        "level300",
+        "deep_major",
+        "track",
+    )
+
+    def __init__(self, rules, parent=None, overrides=None):
+        """
+        parent 가 있으면 rules 는 merge_rules(parent.source, overrides) 결과여야 한다.
+        overrides 가 건드리지 않은 전공필수 / 트랙은 parent 의 것을 재사용.
+        """
+        self.source = rules
+        self.parent_version = parent.version if parent is not None else None
+
+        def inherited(*path):
+            return parent is not None and not _touches(overrides, *path)
+
+        meta = rules.get("meta", {})
+        self.entry_year = meta.get("entry_year")
+        self.major = meta.get("major")
+
+        self.total_credits = rules["total_credits"]
+        self.need_second_major = rules["need_second_major"]
+
+        certs = rules["certifications"]
+        self.need_language_cert = certs["language"]["required"]
+        self.need_it_or_industry_cert = certs["it_or_industry"]["required"]
+
+        self.level300_min_credits = rules["level300_min_credits"]
+        self.area_min = MappingProxyType(dict(rules["area_min_credits"]))
+
+        self.univ_elective_min_areas = (
+            rules.get("liberal_arts", {}).get("univ_elective", {}).get("min_areas", 0)
+        )
+
+        # 전공필수
+        if inherited("major", "required_courses"):
+            self.major_required = parent.major_required
+            self.major_required_codes = parent.major_required_codes
+            self.major_required_credits = parent.major_required_credits
+        else:
+            self.major_required = _freeze_courses(rules["major"]["required_courses"])
+            self.major_required_codes = frozenset(c["code"] for c in self.major_required)
+            self.major_required_credits = sum(c["credits"] for c in self.major_required)
+
+        # 심화전공 / 트랙
+        deep = rules.get("deep_major", {})
+        self.deep_major_min_credits = deep.get("min_credits", 0)
+        self.track_min_credits = deep.get("track_min_credits", 0)
+
+        if inherited("tracks"):
+            self.tracks = parent.tracks
+        else:
+            self.tracks = MappingProxyType({
+                sys.intern(key): (
+                    parent.tracks[key]
+                    if inherited("tracks", key) and key in parent.tracks
+                    else CompiledTrack(key, info)
+                )
+                for key, info in rules.get("tracks", {}).items()
+            })
+
+        # 진행률 기준값: credits key → required
+        self.progress_required = MappingProxyType({
+            **{key: self.area_min[key] for key in self.AREA_PROGRESS_KEYS},
+            "deep_major": self.deep_major_min_credits,
+            "track": self.track_min_credits,
+        })
+
+        # 버전: 루트는 전체 JSON 해시, 파생 세트는 부모 버전 + overrides 해시
+        #       (컴파일 비용이 overrides 크기에만 비례하도록 전체 직렬화는 미룸)
+        if parent is None:
+            self.version = hashlib.sha256(self.rules_meta_json).hexdigest()[:16]
+        else:
+            raw = (parent.version + _dumps(overrides)).encode("utf-8")
+            self.version = hashlib.sha256(raw).hexdigest()[:16]
+
+    @cached_property
+    def rules_meta_json(self):
+        """ rules_meta: 처음 쓸 때 한 번만 직렬화 """
+        return _dumps(self.source).encode("utf-8")
+
+    def __reduce__(self):
+        # MappingProxyType 은 pickle 이 안 되므로 원본 dict 로 다시 컴파일 (audit 워커 전달용)
+        return _restore_rules, (self.source, self.version)
+
+    # ---------------------------------------
+    def evaluate_major_required(self, completed_codes):
+        done = self.major_required_codes & completed_codes
+        completed = [c for c in self.major_required if c["code"] in done]
+        remaining = [c for c in self.major_required if c["code"] not in done]
+        earned = sum(c["credits"] for c in completed)
+        return {
+            "percentage": (
+                int(earned / self.major_required_credits * 100)
+                if self.major_required_credits > 0
+                else 0
+            ),
+            "earned_credits": earned,
+            "total_credits": self.major_required_credits,
+            "completed": completed,
+            "remaining": remaining,
+        }
+
+    def check_condition(self, name, inputs):
+        """
+        조건 1개 판정. inputs 는 evaluate() 가 만드는 dict
+        (total_credits / credits / flags / ge_area_count / major_required / track)
+        """
+        credits = inputs["credits"]
+        flags = inputs["flags"]
+        area_min = self.area_min
+        track_result = inputs["track"]
+
+        if name == "total_credits":
+            return inputs["total_credits"] >= self.total_credits
+        if name == "second_major":
+            return (not self.need_second_major) or flags["second_major_done"]
+        if name == "language_cert":
+            return (not self.need_language_cert) or flags["language_cert"]
+        if name == "it_or_industry_cert":
+            return (not self.need_it_or_industry_cert) or (flags["it_cert"] or flags["industry_cert"])
+        if name == "level300":
+            return credits["level300"] >= self.level300_min_credits
+        if name in ("liberal_basic", "univ_required", "exploration", "major_basic"):
+            return credits[name] >= area_min[name]
+        if name == "univ_elective_areas":
+            return inputs["ge_area_count"] >= self.univ_elective_min_areas
+        if name == "major_required_all":
+            return len(inputs["major_required"]["remaining"]) == 0
+
+        # 트랙을 고르지 않았으면 심화전공/트랙 조건은 통과
+        if track_result is None:
+            return True
+        if name == "deep_major_min":
+            return credits["deep_major"] >= self.deep_major_min_credits
+        if name == "track_min_credits":
+            return credits["track"] >= self.track_min_credits
+        if name == "track_required_all":
+            return track_result["earned_credits"] >= track_result["required_credits"]
+
+        raise KeyError(name)
+
+    def progress_entry(self, key, credits):
+        required = self.progress_required[key]
+        return {
+            "earned": credits[key],
+            "required": required,
+            "percent": calc_percent(credits[key], required),
+        }
+
+    def summary(self, total_credits, conditions):
+        return {
+            "total_credits": total_credits,
+            "required_total_credits": self.total_credits,
+            "can_graduate": all(conditions.values()),
+        }
+
+    def evaluate(self, *, completed_codes, credits, flags, total_credits, ge_area_count, track_key):
+        """
+        completed_codes: 이수 과목 코드 set
+        credits: CREDIT_KEYS 를 키로 하는 int dict
+        flags: second_major_done / language_cert / it_cert / industry_cert
+        반환값은 summary / major_required / track / conditions / progress 를 담은 dict
+        """
+        completed_codes = frozenset(completed_codes)
+
+        track = self.tracks.get(track_key)
+
+        inputs = {
+            "total_credits": total_credits,
+            "credits": credits,
+            "flags": flags,
+            "ge_area_count": ge_area_count,
+            "major_required": self.evaluate_major_required(completed_codes),
+            "track": track.evaluate(completed_codes) if track is not None else None,
+        }
+
+        conditions = {name: self.check_condition(name, inputs) for name in CONDITION_INPUTS}
+
+        return {
+            "summary": self.summary(total_credits, conditions),
+            "major_required": inputs["major_required"],
+            "track": inputs["track"],
+            "conditions": conditions,
+            "progress": {key: self.progress_entry(key, credits) for key in self.progress_required},
+        }
+
+
+def compile_rules(rules):
+    return CompiledRules(rules)
+
+
+def derive_rules(parent, overrides):
+    """ 부모 CompiledRules + 바뀐 경로만 → 파생 CompiledRules (공유 가능한 하위 구조는 공유) """
+    return CompiledRules(merge_rules(parent.source, overrides), parent, overrides)
+
+
+def _restore_rules(source, version):
+    compiled = CompiledRules(source)
+    compiled.version = version
+    return compiled
@@ -0,0 +1,152 @@
+"""
+DB 졸업요건 규칙 세트 (GraduationRequirement + AreaRequirement)
+
+(입학년도, 학과) → CompiledRules 를 워커 메모리의 dict 로 들고 있다가,
+"rules" generation 이 바뀌면 (admin 수정, load_rules 등) 전부 다시 읽어서 컴파일한다.
+요청 경로에서는 generation 확인 1번 + dict 조회뿐이다.
+
+parent 가 있는 세트는 부모를 먼저 컴파일한 뒤 달라진 경로만 덮어써서 만든다 (derive_rules).
+학과 × 학번이 늘어도 과목 목록 / 트랙 정의는 부모와 공유되므로 워커 메모리가 거의 늘지 않는다.
+
+DB 에 아직 없는 (입학년도, 학과) 는 rules.py 의 BUILTIN_RULES 로 대신한다.
+"""
+import logging
+from collections import defaultdict
+
+from users.models import UserProfile
+
+from .generations import GENERATION_MAX_AGE, RULES, get_generation
+from .models import AreaRequirement, GraduationRequirement
+from .rules import BUILTIN_RULES, compile_rules, derive_rules, merge_rules
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENTRY_YEAR = 2022
+DEFAULT_DEPARTMENT = "소프트웨어학부"
+
+# UserProfile.major_department 코드 → 규칙 세트의 학과 이름
+DEPARTMENT_LABELS = dict(UserProfile.DEPARTMENT_CHOICES)
+
+# AreaRequirement.area_code → 규칙의 area_min_credits 키
+AREA_RULE_KEYS = {
+    AreaRequirement.AreaCode.GE_BASIC: "liberal_basic",
+    AreaRequirement.AreaCode.GE_UNIV_REQUIRED: "univ_required",
+    AreaRequirement.AreaCode.EXPLORATION: "exploration",
+    AreaRequirement.AreaCode.MAJOR: "major_basic",
+}
+
+
+def requirement_overrides(requirement, areas):
+    """
+    GraduationRequirement 1개 (+ AreaRequirement 들) → 규칙 dict
+    (parent 가 없으면 전체 규칙, 있으면 부모에 덮어쓸 부분)
+    rules(JSON) 위에 숫자 기준을 컬럼 / 영역 테이블 값으로 덮어쓴다.
+    비어 있는 컬럼은 덮어쓰지 않는다 → 파생 세트는 부모 값이 바뀌면 그대로 따라간다.
+    """
+    area_min = {}
+    if requirement.min_major_credits is not None:
+        area_min["major_basic"] = requirement.min_major_credits
+    if requirement.min_3000_level_credits is not None:
+        area_min["level300"] = requirement.min_3000_level_credits
+    for area in areas:
+        key = AREA_RULE_KEYS.get(area.area_code)
+        if key is not None:
+            area_min[key] = area.min_credits
+
+    overrides = {"meta": {"entry_year": requirement.entry_year, "major": requirement.department}}
+    if requirement.total_credits is not None:
+        overrides["total_credits"] = requirement.total_credits
+    if requirement.min_3000_level_credits is not None:
+        overrides["level300_min_credits"] = requirement.min_3000_level_credits
+    if area_min:
+        overrides["area_min_credits"] = area_min
+    return merge_rules(requirement.rules, overrides)
+
+
+def load_rule_sets():
+    """ 내장 규칙 + DB 규칙 세트 전부 컴파일 → {(entry_year, department): CompiledRules} """
+    rule_sets = {key: compile_rules(rules) for key, rules in BUILTIN_RULES.items()}
+
+    areas = defaultdict(list)
+    for area in AreaRequirement.objects.all():
+        areas[area.requirement_id].append(area)
+
+    requirements = {
+        requirement.id: requirement
+        for requirement in GraduationRequirement.objects.filter(
+            entry_year__isnull=False
+        ).exclude(department="")
+    }
+
+    # id → CompiledRules (컴파일 실패 / 부모 누락 / 순환이면 None)
+    compiled_by_id = {}
+
+    def compile_requirement(requirement_id, visiting):
+        if requirement_id in compiled_by_id:
+            return compiled_by_id[requirement_id]
+
+        requirement = requirements.get(requirement_id)
+        if requirement is None or requirement_id in visiting:
+            return None
+
+        compiled = None
+        overrides = requirement_overrides(requirement, areas[requirement_id])
+        try:
+            if requirement.parent_id is None:
+                compiled = compile_rules(overrides)
+            else:
+                parent = compile_requirement(requirement.parent_id, visiting | {requirement_id})
+                if parent is not None:
+                    compiled = derive_rules(parent, overrides)
+        except (KeyError, TypeError, ValueError):
+            # 규칙 JSON 이 불완전하면 그 세트만 건너뛴다 (다른 학번은 계속 동작)
+            logger.exception("졸업요건 규칙 세트 컴파일 실패: %s", requirement)
+
+        if compiled is None:
+            logger.warning("졸업요건 규칙 세트를 건너뜀: %s", requirement)
+        compiled_by_id[requirement_id] = compiled
+        return compiled
+
+    for requirement_id, requirement in requirements.items():
+        compiled = compile_requirement(requirement_id, frozenset())
+        if compiled is not None:
+            rule_sets[(requirement.entry_year, requirement.department)] = compiled
+
+    return rule_sets
+
+
+_rule_sets = None
+_rule_sets_generation = None
+
+
+def get_rule_sets():
+    global _rule_sets, _rule_sets_generation
+
+    generation = get_generation(RULES, max_age=GENERATION_MAX_AGE)
+    if _rule_sets is None or _rule_sets_generation != generation:
+        _rule_sets = load_rule_sets()
+        _rule_sets_generation = generation
+    return _rule_sets
+
+
+def get_compiled_rules(entry_year=DEFAULT_ENTRY_YEAR, department=DEFAULT_DEPARTMENT):
+    """ 등록되지 않은 (입학년도, 학과) 면 None """
+    return get_rule_sets().get((entry_year, department))
+
+
+def cohort_key(student_id, major_department):
+    """ 학번 앞 4자리 + UserProfile.major_department → 규칙 세트 키 (entry_year, 학과 이름) """
+    try:
+        entry_year = int((student_id or "")[:4])
+    except ValueError:
+        entry_year = DEFAULT_ENTRY_YEAR
+    department = DEPARTMENT_LABELS.get(major_department, major_department) or DEFAULT_DEPARTMENT
+    return entry_year, department
+
+
+def rules_for_user(user):
+    """ 학번 앞 4자리 + UserProfile.major_department 로 규칙 세트 선택 (프로필 없으면 기본값) """
+    profile = UserProfile.objects.filter(user=user).values_list("student_id", "major_department").first()
+    if profile is None:
+        return get_compiled_rules()
+    return get_compiled_rules(*cohort_key(*profile))
@@ -0,0 +1,160 @@
+"""
+과목 검색 (타이핑하면서 바로 찾기)
+
+카탈로그를 통째로 내려받지 않고도 코드 / 과목명으로 찾을 수 있도록,
+메모리에 n-gram(1~2글자) 역색인을 만들어 두고 검색한다.
+
+  - 질의의 n-gram 포스팅을 작은 것부터 교집합 → 후보 → 실제 부분 문자열 확인
+  - 순위: 완전 일치 > 앞부분 일치 > 중간 일치, 같은 등급이면 앞쪽 필드 / 앞쪽 위치 / 짧은 것
+  - 인덱스는 카탈로그 generation 이 바뀔 때만 다시 만든다 (catalog.py 와 같은 방식)
+
+NgramIndex 는 필드 튜플만 받으므로 다른 검색(시간표 과목 등)에서도 그대로 쓴다.
+
+한글은 HangulIndex 로: 저장 시 만들어 둔 자모 분해 / 초성 키(hangul.py)를 색인해서
+  - "ㄷㅇㅌ"      → 초성 색인에서 찾음 (데이터구조론)
+  - "데잍", "뎅"  → 질의도 자모로 풀어서 찾음 (입력 중인 마지막 글자도 일치)
+"""
+import heapq
+from collections import defaultdict
+
+from .generations import CATALOG, GENERATION_MAX_AGE, get_generation
+from .hangul import decompose, is_choseong_query
+from .models import Course
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+
+def normalize(text):
+    """ 소문자 + 공백 제거 """
+    return "".join((text or "").lower().split())
+
+
+def ngrams(text):
+    """ 1글자 + 2글자 n-gram """
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+def query_grams(q):
+    """ 질의에서 후보를 거를 n-gram (2글자 이상이면 bigram 만) """
+    if len(q) < 2:
+        return {q}
+    return {q[i:i + 2] for i in range(len(q) - 1)}
+
+
+class NgramIndex:
+    __slots__ = ("texts", "postings")
+
+    def __init__(self, docs):
+        """ docs: 문서마다 검색할 문자열 필드 튜플 (순서 = 순위 우선순위) """
+        self.texts = tuple(tuple(normalize(text) for text in fields) for fields in docs)
+
+        postings = defaultdict(set)
+        for i, fields in enumerate(self.texts):
+            for text in fields:
+                for gram in ngrams(text):
+                    postings[gram].add(i)
+        self.postings = {gram: frozenset(ids) for gram, ids in postings.items()}
+
+    def candidates(self, q):
+        lists = []
+        for gram in query_grams(q):
+            ids = self.postings.get(gram)
+            if not ids:
+                return frozenset()
+            lists.append(ids)
+        lists.sort(key=len)
+
+        result = lists[0]
+        for ids in lists[1:]:
+            result = result & ids
+            if not result:
+                break
+        return result
+
+    def score(self, i, q):
+        """ 작을수록 좋은 순위 키, 어느 필드에도 없으면 None """
+        best = None
+        for field_no, text in enumerate(self.texts[i]):
+            pos = text.find(q)
+            if pos < 0:
+                continue
+            grade = 0 if text == q else 1 if pos == 0 else 2
+            key = (grade, field_no, pos, len(text))
+            if best is None or key < best:
+                best = key
+        return best
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """ 문서 번호 리스트 (순위순, 최대 limit 개) """
+        q = normalize(query)
+        if not q:
+            return []
+
+        scored = []
+        for i in self.candidates(q):
+            key = self.score(i, q)
+            if key is not None:
+                scored.append((key, i))
+        return [i for _, i in heapq.nsmallest(limit, scored)]
+
+
+class HangulIndex:
+    """ 자모 분해 필드용 NgramIndex + 초성 필드용 NgramIndex (같은 문서 번호) """
+    __slots__ = ("jamo", "choseong")
+
+    def __init__(self, jamo_docs, choseong_docs):
+        self.jamo = NgramIndex(jamo_docs)
+        self.choseong = NgramIndex(choseong_docs)
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        q = normalize(query)
+        if is_choseong_query(q):
+            return self.choseong.search(q, limit)
+        return self.jamo.search(decompose(q), limit)
+
+
+# =======================================
+#   카탈로그 검색 인덱스
+# =======================================
+SEARCH_FIELDS = ("code", "name", "credits", "category", "level", "ge_area")
+KEY_FIELDS = ("name_jamo", "name_choseong")
+
+
+class CatalogSearchIndex:
+    __slots__ = ("generation", "courses", "index")
+
+    def __init__(self, generation, rows):
+        """ rows: SEARCH_FIELDS + KEY_FIELDS dict (검색 키는 색인에만 쓰고 응답에서는 뺀다) """
+        rows = tuple(rows)
+        self.generation = generation
+        self.courses = tuple({f: row[f] for f in SEARCH_FIELDS} for row in rows)
+        self.index = HangulIndex(
+            [(row["code"], row["name_jamo"]) for row in rows],
+            [(row["name_choseong"],) for row in rows],
+        )
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        return [self.courses[i] for i in self.index.search(query, limit)]
+
+
+_search_index = None
+
+
+def get_catalog_search_index():
+    global _search_index
+
+    generation = get_generation(CATALOG, max_age=GENERATION_MAX_AGE)
+    index = _search_index
+    if index is None or index.generation != generation:
+        rows = (
+            Course.objects.filter(is_active=True)
+            .order_by("code")
+            .values(*SEARCH_FIELDS, *KEY_FIELDS)
+        )
+        index = CatalogSearchIndex(generation, rows)
+        _search_index = index
+    return index
+
@@ -0,0 +1,34 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .generations import CATALOG, RULES, bump_generation
+from .hangul import search_keys
+from .models import AreaRequirement, Course, CoursePrerequisite, GraduationRequirement, TrackCourse
+
+
+# admin 등에서 과목명을 고쳐도 초성 / 자모 검색 키가 따라가도록
+@receiver(pre_save, sender=Course)
+def fill_course_search_keys(sender, instance, **kwargs):
+    instance.name_jamo, instance.name_choseong = search_keys(instance.name)
+
+
+# 과목 / 트랙-과목 매핑 / 선수과목이 바뀌면 모든 워커의 카탈로그 스냅샷·비트셋·트랙 마스크 무효화
+# (트랜잭션 안이면 커밋된 뒤에 올린다 — 커밋 전에 올리면 다른 워커가 옛 데이터로 캐시를 다시 만듦)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=TrackCourse)
+@receiver(post_delete, sender=TrackCourse)
+@receiver(post_save, sender=CoursePrerequisite)
+@receiver(post_delete, sender=CoursePrerequisite)
+def invalidate_catalog(sender, using=None, **kwargs):
+    transaction.on_commit(lambda: bump_generation(CATALOG), using=using)
+
+
+# 졸업요건이 바뀌면 모든 워커의 규칙 세트 캐시 무효화
+@receiver(post_save, sender=GraduationRequirement)
+@receiver(post_delete, sender=GraduationRequirement)
+@receiver(post_save, sender=AreaRequirement)
+@receiver(post_delete, sender=AreaRequirement)
+def invalidate_rule_sets(sender, using=None, **kwargs):
+    transaction.on_commit(lambda: bump_generation(RULES), using=using)
@@ -0,0 +1,900 @@
+import csv
+import gzip
+import json
+import os
+import random
+import tempfile
+from io import StringIO
+from itertools import combinations
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from users.models import UserProfile
+
+from . import catalog, generations, rulesets
+from .audit import AUDIT_CSV_FIELDS
+from .bitsets import CourseIndex
+from .credits import tally_credits
+from .hangul import choseong, decompose, is_choseong_query
+from .models import (
+    AreaRequirement,
+    CacheGeneration,
+    Course,
+    CoursePrerequisite,
+    GraduationRequirement,
+    TakenCourse,
+    TrackCourse,
+)
+from .planner import DIMS, Candidate, PlanState, Planner
+from .rulesets import get_compiled_rules
+from .search import HangulIndex, NgramIndex, normalize
+
+SWE = "소프트웨어학부"
+CATEGORIES = ("GE_BASIC", "GE_UNIV_REQUIRED", "EXPLORATION", "MAJOR_BASIC", "MAJOR_DEEP", "OTHER")
+
+
+def write_json(test, data):
+    """ 임시 JSON 파일 경로 (테스트가 끝나면 지움) """
+    fd, path = tempfile.mkstemp(suffix=".json")
+    test.addCleanup(os.remove, path)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    return path
+
+
+# =========================================
+#  학번별 규칙 세트 상속 (load_rules + rulesets)
+# =========================================
+class RuleSetInheritanceTests(TestCase):
+    def setUp(self):
+        # 워커 메모리 캐시는 테스트 트랜잭션 롤백을 모르므로 매번 비운다
+        rulesets._rule_sets = None
+        generations._recent.clear()
+        call_command("load_rules", stdout=StringIO())
+
+    def load(self, rules):
+        call_command("load_rules", write_json(self, rules), stdout=StringIO())
+
+    def load_child(self, entry_year, parent_year=2022, **rules):
+        self.load({
+            "parent": {"entry_year": parent_year, "major": SWE},
+            "meta": {"entry_year": entry_year, "major": SWE},
+            **rules,
+        })
+
+    def test_child_overrides_only_listed_values(self):
+        self.load_child(2023, total_credits=130, area_min_credits={"liberal_basic": 20})
+        parent, child = get_compiled_rules(2022, SWE), get_compiled_rules(2023, SWE)
+
+        self.assertEqual(child.total_credits, 130)
+        self.assertEqual(child.area_min["liberal_basic"], 20)
+        self.assertEqual(child.area_min["exploration"], parent.area_min["exploration"])
+        self.assertEqual(child.level300_min_credits, parent.level300_min_credits)
+        # 바꾸지 않은 하위 구조는 부모 것을 그대로 공유
+        self.assertIs(child.tracks, parent.tracks)
+
+        # 덮어쓰지 않은 숫자 기준 / 영역은 저장하지 않는다
+        requirement = GraduationRequirement.objects.get(entry_year=2023, department=SWE)
+        self.assertEqual(requirement.total_credits, 130)
+        self.assertIsNone(requirement.min_major_credits)
+        self.assertIsNone(requirement.min_3000_level_credits)
+        self.assertEqual(
+            list(AreaRequirement.objects.filter(requirement=requirement).values_list("area_code", flat=True)),
+            [AreaRequirement.AreaCode.GE_BASIC],
+        )
+
+    def test_parent_change_propagates(self):
+        self.load_child(2023, total_credits=130)
+        self.load_child(2024, parent_year=2023, need_second_major=False)
+
+        parent = GraduationRequirement.objects.get(entry_year=2022, department=SWE)
+        parent.min_3000_level_credits = 50
+        parent.total_credits = 140
+        parent.save()
+
+        child, grandchild = get_compiled_rules(2023, SWE), get_compiled_rules(2024, SWE)
+        self.assertEqual(child.level300_min_credits, 50)
+        self.assertEqual(grandchild.level300_min_credits, 50)
+        # 자식이 덮어쓴 값은 그대로, 손자는 자식 값을 따른다
+        self.assertEqual(child.total_credits, 130)
+        self.assertEqual(grandchild.total_credits, 130)
+        self.assertFalse(grandchild.need_second_major)
+
+    def test_missing_parent_is_rejected(self):
+        with self.assertRaises(CommandError):
+            self.load_child(2025, parent_year=2019)
+        self.assertIsNone(get_compiled_rules(2025, SWE))
+
+
+# =========================================
+#  load_courses (content hash diff / 은퇴 / 선수과목)
+# =========================================
+class LoadCoursesTests(TestCase):
+    catalog = {
+        "전공필수": [
+            {"code": "SWE2001", "name": "데이터구조론", "credits": 3},
+            {"code": "SWE3016", "name": "운영체제", "credits": 3},
+        ],
+        "전공선택": [{"code": "SWE3009", "name": "암호학", "credits": 3}],
+        "트랙전필": {"security": [{"code": "SWE3009", "name": "암호학", "credits": 3}]},
+        "선수과목": {"SWE3016": ["SWE2001"]},
+    }
+
+    def setUp(self):
+        generations._recent.clear()
+
+    def load(self, data, *args):
+        out = StringIO()
+        call_command("load_courses", write_json(self, data), *args, stdout=out)
+        return out.getvalue()
+
+    def generation(self):
+        return CacheGeneration.objects.filter(key=generations.CATALOG).values_list("generation", flat=True).first() or 0
+
+    def test_prerequisite_cycle_is_rejected(self):
+        self.load(self.catalog)
+        data = {**self.catalog, "선수과목": {"SWE3016": ["SWE2001"], "SWE2001": ["SWE3016"]}}
+
+        with self.assertRaisesMessage(CommandError, "선수과목 순환"):
+            self.load(data)
+        self.assertEqual(
+            list(CoursePrerequisite.objects.values_list("course__code", "prerequisite__code")),
+            [("SWE3016", "SWE2001")],
+        )
+
+    def test_missing_file(self):
+        with self.assertRaises(CommandError):
+            call_command("load_courses", "/nonexistent/courses.json", stdout=StringIO())
+
+    def test_generation_bumps_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.load(self.catalog)
+        before = self.generation()
+
+        # 트랙 매핑 / 선수과목 삭제도 커밋 전에는 generation 을 건드리지 않는다
+        data = {**self.catalog, "트랙전필": {}, "선수과목": {}}
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.load(data)
+            self.assertEqual(self.generation(), before)
+        self.assertFalse(TrackCourse.objects.exists())
+        self.assertFalse(CoursePrerequisite.objects.exists())
+
+        for callback in callbacks:
+            callback()
+        self.assertGreater(self.generation(), before)
+
+
+    def test_dry_run_leaves_db_unchanged(self):
+        self.load(self.catalog)
+        snapshot = list(Course.objects.order_by("code").values())
+
+        data = {
+            **self.catalog,
+            "전공필수": [{"code": "SWE2001", "name": "자료구조", "credits": 3}],
+            "전공선택": [{"code": "SWE4001", "name": "컴파일러", "credits": 3}],
+        }
+        output = self.load(data, "--dry-run")
+        self.assertIn("+ SWE4001 컴파일러", output)
+        self.assertIn("~ SWE2001 (name, name_jamo, name_choseong)", output)
+        self.assertIn("- SWE3009 암호학", output)
+        self.assertEqual(list(Course.objects.order_by("code").values()), snapshot)
+        self.assertTrue(TrackCourse.objects.exists())
+
+
+    def test_unchanged_file_writes_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.load(self.catalog)
+        before = self.generation()
+
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            output = self.load(self.catalog)
+        writes = [q["sql"] for q in queries if not q["sql"].lstrip().upper().startswith("SELECT")]
+        self.assertEqual(writes, [])
+        self.assertIn("변경 사항 없음", output)
+        self.assertEqual(self.generation(), before)
+
+    def test_changed_row_is_updated(self):
+        self.load(self.catalog)
+        untouched = Course.objects.get(code="SWE3016").content_hash
+
+        data = {**self.catalog, "전공필수": [
+            {"code": "SWE2001", "name": "자료구조", "credits": 4},
+            {"code": "SWE3016", "name": "운영체제", "credits": 3},
+        ]}
+        output = self.load(data)
+        self.assertIn("추가 0 / 변경 1 / 은퇴 0 / 동일 2", output)
+
+        course = Course.objects.get(code="SWE2001")
+        self.assertEqual((course.name, course.credits, course.name_choseong), ("자료구조", 4, "ㅈㄹㄱㅈ"))
+        self.assertEqual(Course.objects.get(code="SWE3016").content_hash, untouched)
+
+    def test_removed_row_is_retired(self):
+        self.load(self.catalog)
+        data = {**self.catalog, "전공선택": [], "트랙전필": {}}
+
+        self.assertIn("은퇴 1", self.load(data))
+        course = Course.objects.get(code="SWE3009")
+        self.assertFalse(course.is_active)
+        self.assertFalse(TrackCourse.objects.exists())
+
+        # 다시 파일에 들어오면 되살린다
+        self.load(self.catalog)
+        self.assertTrue(Course.objects.get(code="SWE3009").is_active)
+
+    def test_full_repairs_hand_edited_rows(self):
+        self.load(self.catalog)
+        Course.objects.filter(code="SWE2001").update(credits=9)
+
+        # 저장된 hash 는 파일과 같으므로 보통 실행은 손댄 값을 못 본다
+        self.assertIn("변경 0", self.load(self.catalog))
+        self.assertEqual(Course.objects.get(code="SWE2001").credits, 9)
+
+        self.assertIn("변경 1", self.load(self.catalog, "--full"))
+        self.assertEqual(Course.objects.get(code="SWE2001").credits, 3)
+
+
+# =========================================
+#  카탈로그 스냅샷 (ETag / 304 / 압축 선택)
+# =========================================
+class CatalogSnapshotTests(TestCase):
+    url = "/api/curriculum/courses/"
+
+    def setUp(self):
+        catalog._snapshot = None
+        generations._recent.clear()
+        Course.objects.create(code="SWE2001", name="데이터구조론", credits=3, category="MAJOR_BASIC")
+
+    def get(self, **headers):
+        return self.client.get(self.url, **{f"HTTP_{k.upper()}": v for k, v in headers.items()})
+
+    def test_if_none_match_is_304(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c["code"] for c in json.loads(response.content)], ["SWE2001"])
+        etag = response["ETag"]
+
+        response = self.get(if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+        # 다른 인코딩으로 받은 ETag 도 같은 스냅샷이면 304
+        gzip_etag = self.get(accept_encoding="gzip")["ETag"]
+        self.assertEqual(self.get(if_none_match=gzip_etag).status_code, 304)
+
+    def test_catalog_change_changes_etag(self):
+        etag = self.get()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.create(code="SWE3016", name="운영체제", credits=3, category="MAJOR_BASIC")
+
+        response = self.get(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(json.loads(response.content)), 2)
+
+    def test_snapshot_reuses_generation_read(self):
+        self.get()
+        with self.assertNumQueries(0):
+            self.get()
+
+    def test_gzip(self):
+        response = self.get(accept_encoding="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertTrue(response["ETag"].endswith('-gzip"'))
+        self.assertEqual(json.loads(gzip.decompress(response.content))[0]["code"], "SWE2001")
+
+    def test_brotli_missing_falls_back_to_gzip(self):
+        with mock.patch.object(catalog, "brotli", None):
+            catalog._snapshot = None
+            response = self.get(accept_encoding="br, gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    @skipUnless(catalog.brotli, "brotli 미설치")
+    def test_brotli(self):
+        response = self.get(accept_encoding="br, gzip")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(json.loads(catalog.brotli.decompress(response.content))[0]["code"], "SWE2001")
+
+    def test_identity(self):
+        response = self.get()
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertTrue(response["ETag"].endswith('"') and "-" not in response["ETag"])
+
+
+# =========================================
+#  what-if 세션 (변경분 / 주인 확인 / 규칙 변경 시 reset)
+# =========================================
+class WhatIfTests(TestCase):
+    def setUp(self):
+        rulesets._rule_sets = None
+        generations._recent.clear()
+        call_command("load_rules", stdout=StringIO())
+        for code, name, category, level in (
+            ("SWE2001", "데이터구조론", "MAJOR_BASIC", 2000),
+            ("SWE3016", "운영체제", "MAJOR_BASIC", 3000),
+            ("GEN1001", "글쓰기", "GE_BASIC", 1000),
+        ):
+            Course.objects.create(code=code, name=name, credits=3, category=category, level=level)
+        self.user = User.objects.create_user("student", password="pw")
+        self.client.force_login(self.user)
+
+    def start(self, client=None, completed=()):
+        response = (client or self.client).post("/api/curriculum/whatif/", {
+            "entry_year": 2022, "major": SWE, "completed_courses": list(completed),
+        }, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def apply(self, token, delta, client=None):
+        return (client or self.client).post(
+            f"/api/curriculum/whatif/{token}/", delta, content_type="application/json"
+        )
+
+    @staticmethod
+    def full_result(data):
+        return {key: data[key] for key in ("summary", "major_required", "track", "conditions", "progress")}
+
+    def test_changes_match_a_fresh_evaluation(self):
+        session = self.start(completed=["GEN1001"])
+        result = self.full_result(session)
+
+        data = self.apply(session["token"], {"add": ["SWE2001", "SWE3016", "NOPE"]}).json()
+        self.assertFalse(data["reset"])
+        self.assertEqual(data["unknown_codes"], ["NOPE"])
+        self.assertTrue(data["changed"])
+
+        # 바뀐 필드만 덮어쓰면 처음부터 계산한 결과와 같아야 한다
+        for key, value in data["changed"].items():
+            if key in ("conditions", "progress"):
+                result[key].update(value)
+            else:
+                result[key] = value
+        fresh = self.start(completed=["GEN1001", "SWE2001", "SWE3016"])
+        self.assertEqual(result, self.full_result(fresh))
+
+        # 아무것도 안 바뀌는 delta
+        data = self.apply(session["token"], {"add": ["SWE2001"]}).json()
+        self.assertEqual(data["changed"], {})
+
+    def test_other_user_cannot_use_session(self):
+        token = self.start()["token"]
+
+        other = Client()
+        other.force_login(User.objects.create_user("other", password="pw"))
+        self.assertEqual(self.apply(token, {"add": ["SWE2001"]}, client=other).status_code, 404)
+        self.assertEqual(self.apply(token, {"add": ["SWE2001"]}, client=Client()).status_code, 404)
+        self.assertEqual(self.apply(token, {"add": ["SWE2001"]}).status_code, 200)
+
+    def test_anonymous_session_is_tied_to_browser_session(self):
+        browser = Client()
+        token = self.start(client=browser)["token"]
+
+        self.assertEqual(self.apply(token, {"add": ["SWE2001"]}, client=browser).status_code, 200)
+        self.assertEqual(self.apply(token, {"add": ["SWE3016"]}, client=Client()).status_code, 404)
+        self.assertEqual(self.apply(token, {"add": ["SWE3016"]}).status_code, 404)
+
+    def test_rules_change_resets_session(self):
+        session = self.start(completed=["SWE2001"])
+
+        GraduationRequirement.objects.filter(entry_year=2022, department=SWE).update(total_credits=140)
+        generations.bump_generation(generations.RULES)
+
+        data = self.apply(session["token"], {"add": ["SWE3016"]}).json()
+        self.assertTrue(data["reset"])
+        self.assertNotIn("changed", data)
+        self.assertNotEqual(data["rules_version"], session["rules_version"])
+        self.assertEqual(self.full_result(data), self.full_result(self.start(completed=["SWE2001", "SWE3016"])))
+
+    def test_malformed_delta(self):
+        token = self.start()["token"]
+        for delta in ([], {"add": "SWE2001"}, {"flags": []}, {"track": 3}):
+            self.assertEqual(self.apply(token, delta).status_code, 400, delta)
+
+
+# =========================================
+#  계산기 → 이수 과목 저장 (변경분만 쓰기)
+# =========================================
+class SaveTakenCoursesTests(TestCase):
+    url = "/api/curriculum/taken-courses/save/"
+
+    def setUp(self):
+        self.user = User.objects.create_user("student", password="pw")
+        self.client.force_login(self.user)
+        for code in ("SWE2001", "SWE2002", "SWE3001", "GED1001"):
+            Course.objects.create(code=code, name=code, credits=3, category="MAJOR_BASIC")
+
+    def save(self, codes):
+        return self.client.post(self.url, json.dumps({"completed_courses": codes}), content_type="application/json")
+
+    def saved_codes(self):
+        return set(TakenCourse.objects.filter(user=self.user).values_list("course__code", flat=True))
+
+    def test_saved_set_equals_payload(self):
+        body = self.save(["SWE2001", "SWE2002", "SWE2001"]).json()
+        self.assertEqual(self.saved_codes(), {"SWE2001", "SWE2002"})
+        self.assertEqual((body["saved"], body["added"], body["removed"]), (2, 2, 0))
+
+        body = self.save(["SWE2002", "SWE3001", "GED1001"]).json()
+        self.assertEqual(self.saved_codes(), {"SWE2002", "SWE3001", "GED1001"})
+        self.assertEqual((body["saved"], body["added"], body["removed"]), (3, 2, 1))
+
+        self.save([])
+        self.assertEqual(self.saved_codes(), set())
+
+    def test_unchanged_rows_are_kept(self):
+        self.save(["SWE2001", "SWE2002"])
+        before = dict(TakenCourse.objects.filter(user=self.user).values_list("course__code", "id"))
+
+        self.save(["SWE2001", "SWE2002", "SWE3001"])
+        after = dict(TakenCourse.objects.filter(user=self.user).values_list("course__code", "id"))
+        self.assertEqual({code: after[code] for code in before}, before)
+
+    def test_unknown_codes_are_not_saved(self):
+        body = self.save(["SWE2001", "NOPE999", "ABC0000"]).json()
+
+        self.assertEqual(body["unknown_codes"], ["ABC0000", "NOPE999"])
+        self.assertEqual(body["saved"], 1)
+        self.assertEqual(self.saved_codes(), {"SWE2001"})
+
+    def test_invalid_payload(self):
+        for codes in (["SWE2001", 3], "SWE2001", [{"code": "SWE2001"}]):
+            with self.subTest(codes=codes):
+                self.assertEqual(self.save(codes).status_code, 400)
+        self.assertEqual(self.client.post(self.url, "{", content_type="application/json").status_code, 400)
+        self.assertEqual(self.saved_codes(), set())
+
+    def test_noop_save_writes_nothing(self):
+        self.save(["SWE2001", "SWE2002"])
+
+        with CaptureQueriesContext(connection) as ctx:
+            body = self.save(["SWE2002", "SWE2001"]).json()
+
+        self.assertEqual((body["added"], body["removed"]), (0, 0))
+        writes = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+        ]
+        self.assertEqual(writes, [])
+
+
+# =========================================
+#  졸업요건 일괄 점검 (NDJSON / CSV, 웹은 한 프로세스)
+# =========================================
+class AuditTests(TestCase):
+    url = "/api/curriculum/audit/"
+
+    def setUp(self):
+        rulesets._rule_sets = None
+        generations._recent.clear()
+        call_command("load_rules", stdout=StringIO())
+        course = Course.objects.create(code="SWE2001", name="데이터구조론", credits=3, category="MAJOR_BASIC")
+
+        self.students = []
+        for username, student_id in (("kim", "2022123001"), ("lee", "2022123002"), ("park", "2019123003")):
+            user = User.objects.create_user(username, password="pw")
+            UserProfile.objects.create(
+                user=user, student_id=student_id, real_name=username, current_semester="3-1",
+                major_department="SOFTWARE", interest="OTHER",
+            )
+            self.students.append(user)
+        TakenCourse.objects.create(user=self.students[0], course=course, year=2022, semester="1-1")
+
+        # 관리자는 프로필이 없으므로 department 로 걸러 학생만 본다
+        self.staff = User.objects.create_user("admin", password="pw", is_staff=True)
+        self.client.force_login(self.staff)
+
+    def fetch(self, **params):
+        response = self.client.get(self.url, {"department": "SOFTWARE", **params})
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        lines = [json.loads(line) for line in self.fetch().splitlines()]
+        records, summary = lines[:-1], lines[-1]["summary"]
+
+        self.assertEqual([r["username"] for r in records], ["kim", "lee", "park"])
+        self.assertEqual([r["total_credits"] for r in records], [3, 0, 0])
+        self.assertFalse(records[0]["can_graduate"])
+        self.assertNotIn("SWE2001", records[0]["remaining_required"])
+        # 2019학번 규칙은 등록되어 있지 않다
+        self.assertIsNone(records[2]["can_graduate"])
+        self.assertEqual(records[2]["unmet_conditions"], ["rules_not_found"])
+        self.assertEqual(summary["count"], 3)
+        self.assertEqual(set(summary), {"count", "elapsed_sec", "per_sec"})
+
+    def test_csv_ends_with_summary_comment(self):
+        text = self.fetch(format="csv", entry_year=2022)
+        *rows, last = text.splitlines()
+
+        self.assertRegex(last, r"^# summary: count=2 elapsed_sec=\S+ per_sec=\S+$")
+        table = list(csv.reader(rows))
+        self.assertEqual(tuple(table[0]), AUDIT_CSV_FIELDS)
+        self.assertEqual([row[1] for row in table[1:]], ["kim", "lee"])
+        self.assertEqual(table[1][3], "3")
+
+    def test_web_request_never_forks(self):
+        with mock.patch("curriculum.audit.ProcessPoolExecutor", side_effect=AssertionError("forked")):
+            lines = self.fetch(workers=4).splitlines()
+        self.assertEqual(json.loads(lines[-1])["summary"]["count"], 3)
+
+    def test_staff_only(self):
+        self.client.force_login(self.students[0])
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_command_workers_match_single_process(self):
+        def run(workers):
+            fd, path = tempfile.mkstemp(suffix=".ndjson")
+            os.close(fd)
+            self.addCleanup(os.remove, path)
+            call_command(
+                "audit_graduation", "--workers", str(workers), "--chunk-size", "1",
+                "--department", "SOFTWARE", "--output", path,
+                stderr=StringIO(),
+            )
+            with open(path, encoding="utf-8") as f:
+                return [json.loads(line) for line in f][:-1]
+
+        self.assertEqual(run(2), run(1))
+
+
+# =========================================
+#  과목 비트셋 인덱스 (선수과목 폐포 / 수강 가능 / 학점 집계)
+# =========================================
+def prereq_index(codes, edges, inactive_codes=()):
+    rows = [(code, 3, "MAJOR_DEEP", 3000, "") for code in codes]
+    return CourseIndex(1, rows, edges, inactive_codes)
+
+
+def reachable(code, edges):
+    """ 간선을 따라 도달 가능한 전체 선수과목 (느린 기준 구현) """
+    found, stack = set(), [code]
+    while stack:
+        current = stack.pop()
+        for course, prereq in edges:
+            if course == current and prereq not in found:
+                found.add(prereq)
+                stack.append(prereq)
+    return found
+
+
+class CourseIndexTests(SimpleTestCase):
+    def ancestors(self, index, code):
+        return set(index.decode(index.ancestor_masks[index.ids[code]]))
+
+    def test_chain(self):
+        # A → B → C → D (오른쪽이 왼쪽을 선수로 요구)
+        index = prereq_index("ABCD", [("B", "A"), ("C", "B"), ("D", "C")])
+
+        self.assertEqual(self.ancestors(index, "D"), {"A", "B", "C"})
+        self.assertEqual(set(index.decode(index.unlocks(index.ids["A"]))), {"B", "C", "D"})
+        self.assertEqual(index.decode(index.missing_prerequisites(index.ids["D"], index.mask_of("A"))), ["B", "C"])
+        self.assertFalse(index.is_eligible(index.ids["D"], index.mask_of("AB")))
+        self.assertTrue(index.is_eligible(index.ids["D"], index.mask_of("C")))
+
+    def test_diamond(self):
+        index = prereq_index("ABCD", [("B", "A"), ("C", "A"), ("D", "B"), ("D", "C")])
+
+        self.assertEqual(self.ancestors(index, "D"), {"A", "B", "C"})
+        self.assertEqual(set(index.decode(index.unlocks(index.ids["A"]))), {"B", "C", "D"})
+        self.assertEqual(index.decode(index.eligible_mask(index.mask_of("AB"))), ["C"])
+        self.assertEqual(index.decode(index.eligible_mask(index.mask_of("ABC"))), ["D"])
+
+    def test_cycle_reaches_fixed_point(self):
+        # A → B → C → A 순환 + 순환 뒤에 D, 선수 없는 E
+        index = prereq_index("ABCDE", [("B", "A"), ("C", "B"), ("A", "C"), ("D", "C")])
+
+        for code in "ABCD":
+            self.assertEqual(self.ancestors(index, code), {"A", "B", "C"})
+        self.assertEqual(set(index.decode(index.unlocks(index.ids["C"]))), {"A", "B", "C", "D"})
+        self.assertEqual(index.decode(index.eligible_mask(0)), ["E"])
+
+    def test_closure_matches_graph_search(self):
+        rng = random.Random(7)
+        codes = [f"C{i:02d}" for i in range(24)]
+        for trial in range(30):
+            edges = [(rng.choice(codes), rng.choice(codes)) for _ in range(rng.randint(0, 40))]
+            edges = [(course, prereq) for course, prereq in edges if course != prereq]
+            index = prereq_index(codes, edges)
+            with self.subTest(trial=trial):
+                for code in codes:
+                    self.assertEqual(self.ancestors(index, code), reachable(code, edges))
+
+    def test_eligible_mask(self):
+        index = prereq_index("ABCDE", [("B", "A"), ("D", "B"), ("D", "C")], inactive_codes=["E"])
+
+        # 선수 없는 과목만, 은퇴한 E 제외
+        self.assertEqual(index.decode(index.eligible_mask(0)), ["A", "C"])
+        # 이수한 과목은 빠지고 직접 선수를 다 채운 과목이 열린다
+        self.assertEqual(index.decode(index.eligible_mask(index.mask_of("AC"))), ["B"])
+        self.assertEqual(index.decode(index.eligible_mask(index.mask_of("ABC"))), ["D"])
+
+    def test_tally_matches_per_course_sum(self):
+        rng = random.Random(11)
+        rows = [
+            (
+                f"C{i:02d}", rng.choice((0, 1, 2, 3, 3, 4)), rng.choice(CATEGORIES),
+                rng.choice((1000, 2000, 3000, 4000)), rng.choice(("", "", "A", "B", "C")),
+            )
+            for i in range(40)
+        ]
+        index = CourseIndex(1, rows)
+        for trial in range(50):
+            taken = [row for row in rows if rng.random() < 0.4]
+            track_codes = {row[0] for row in rows if rng.random() < 0.3}
+
+            _, total, credits, ge_area_count = tally_credits(taken, track_codes)
+            expected = (total, credits, ge_area_count)
+            mask = index.mask_of(row[0] for row in taken)
+            with self.subTest(trial=trial):
+                self.assertEqual(index.tally(mask, index.mask_of(track_codes)), expected)
+
+
+# =========================================
+#  과목 검색 (n-gram 역색인 순위 / limit)
+# =========================================
+class NgramIndexTests(SimpleTestCase):
+    def test_rank_exact_then_prefix_then_middle(self):
+        index = NgramIndex([("자료구조실습",), ("고급자료구조",), ("자료구조",), ("자료",)])
+
+        self.assertEqual(index.search("자료구조"), [2, 0, 1])
+
+    def test_earlier_field_then_position_then_shorter(self):
+        index = NgramIndex([
+            ("SWE3001", "운영체제"),
+            ("SWE3002", "임베디드운영체제"),
+            ("OPS1001", "운영체제"),
+            ("SWE3003", "고급운영체제론"),
+            ("SWE3004", "실시간운영체제"),
+        ])
+
+        # 같은 필드의 중간 일치끼리는 앞쪽 위치 → 짧은 것
+        self.assertEqual(index.search("운영체제"), [0, 2, 3, 4, 1])
+        # 코드 필드(0번)가 과목명 필드보다 앞선다
+        self.assertEqual(index.search("swe300"), [0, 1, 3, 4])
+
+    def test_limit_keeps_best(self):
+        index = NgramIndex([(f"과목{i:02d}",) for i in range(30)] + [("과목",)])
+
+        self.assertEqual(index.search("과목", limit=3), [30, 0, 1])
+        self.assertEqual(len(index.search("과목")), 20)
+        self.assertEqual(index.search("과목", limit=0), [])
+
+    def test_candidates_match_substring_scan(self):
+        rng = random.Random(5)
+        alphabet = "abcde "
+        docs = [
+            tuple("".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8))) for _ in range(2))
+            for _ in range(200)
+        ]
+        index = NgramIndex(docs)
+        for q in ("a", "ab", "abc", "b d", "eee", "cab", "z", " "):
+            expected = sorted(
+                (i for i, fields in enumerate(docs) if normalize(q) and any(normalize(q) in normalize(f) for f in fields)),
+                key=lambda i: (index.score(i, normalize(q)), i),
+            )
+            with self.subTest(q=q):
+                self.assertEqual(index.search(q, limit=len(docs)), expected)
+
+
+class CourseSearchAPITests(TestCase):
+    url = "/api/curriculum/courses/search/"
+
+    def setUp(self):
+        generations._recent.clear()
+        for code, name in (
+            ("SWE2001", "데이터구조론"),
+            ("SWE3002", "데이터베이스"),
+            ("SWE2015", "자료구조실습"),
+            ("DAT1001", "데이터과학입문"),
+        ):
+            Course.objects.create(code=code, name=name, credits=3, category="MAJOR_BASIC")
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [course["code"] for course in response.json()["results"]]
+
+    def test_code_and_name(self):
+        self.assertEqual(self.search(q="swe20"), ["SWE2001", "SWE2015"])
+        # 모두 앞부분 일치 → 짧은 과목명 먼저 (자모 기준)
+        self.assertEqual(self.search(q="데이터"), ["SWE3002", "SWE2001", "DAT1001"])
+        self.assertEqual(self.search(q="데이터", limit=1), ["SWE3002"])
+
+    def test_bad_limit(self):
+        self.assertEqual(self.client.get(self.url, {"q": "a", "limit": "x"}).status_code, 400)
+
+    def test_new_course_is_searchable(self):
+        self.assertEqual(self.search(q="운영체제"), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.create(code="SWE3004", name="운영체제", credits=3, category="MAJOR_DEEP")
+        generations._recent.clear()
+        self.assertEqual(self.search(q="운영체제"), ["SWE3004"])
+
+
+# =========================================
+#  한글 검색 키 (자모 분해 / 초성) + HangulIndex
+# =========================================
+class HangulKeyTests(SimpleTestCase):
+    def test_decompose(self):
+        self.assertEqual(decompose("데이터 구조"), "ㄷㅔㅇㅣㅌㅓㄱㅜㅈㅗ")
+        # 겹모음 / 겹받침은 낱자로
+        self.assertEqual(decompose("과"), "ㄱㅗㅏ")
+        self.assertEqual(decompose("닭"), "ㄷㅏㄹㄱ")
+        # 호환 자모로 따로 친 겹자모도 같은 낱자로
+        self.assertEqual(decompose("ㅘㄳ"), "ㅗㅏㄱㅅ")
+        # 한글이 아닌 글자는 소문자로 그대로
+        self.assertEqual(decompose("C언어 Lab"), "cㅇㅓㄴㅇㅓlab")
+
+    def test_choseong(self):
+        self.assertEqual(choseong("데이터 구조론"), "ㄷㅇㅌㄱㅈㄹ")
+        self.assertEqual(choseong("AI 개론"), "aiㄱㄹ")
+
+    def test_is_choseong_query(self):
+        self.assertTrue(is_choseong_query("ㄷㅇㅌ"))
+        self.assertTrue(is_choseong_query(" ㄷ ㅇ "))
+        self.assertFalse(is_choseong_query("ㄷㅇ터"))
+        self.assertFalse(is_choseong_query("aㄷ"))
+        self.assertFalse(is_choseong_query(""))
+
+
+class HangulIndexTests(SimpleTestCase):
+    NAMES = ("데이터구조론", "데이터베이스", "자료구조", "C언어프로그래밍", "AI개론", "딥러닝", "고급데이터분석")
+
+    def setUp(self):
+        self.index = HangulIndex(
+            [(decompose(name),) for name in self.NAMES],
+            [(choseong(name),) for name in self.NAMES],
+        )
+
+    def search(self, q, limit=20):
+        return [self.NAMES[i] for i in self.index.search(q, limit)]
+
+    def test_choseong_only_query(self):
+        # 초성 키 길이가 같으면 문서 순서대로
+        self.assertEqual(self.search("ㄷㅇㅌ"), ["데이터구조론", "데이터베이스", "고급데이터분석"])
+        self.assertEqual(self.search("ㄱㅈ"), ["자료구조", "데이터구조론"])
+
+    def test_partial_final_consonant(self):
+        # 마지막 글자를 입력하는 중: "데잍" = 데이 + ㅌ, "뎅" = 데 + ㅇ
+        self.assertEqual(self.search("데잍"), ["데이터베이스", "데이터구조론", "고급데이터분석"])
+        self.assertEqual(self.search("뎅"), ["데이터베이스", "데이터구조론", "고급데이터분석"])
+        self.assertEqual(self.search("딥럳"), [])
+
+    def test_mixed_latin_and_hangul(self):
+        self.assertEqual(self.search("c언"), ["C언어프로그래밍"])
+        self.assertEqual(self.search("ai개"), ["AI개론"])
+        self.assertEqual(self.search("AIㄱ"), ["AI개론"])
+        # 라틴 글자가 섞이면 초성 검색이 아니다
+        self.assertEqual(self.search("aiㄱㄹ"), [])
+
+    def test_limit_and_order(self):
+        # 완전 일치 > 앞부분 일치 > 중간 일치, 같은 등급이면 짧은 것
+        index = HangulIndex(
+            [(decompose(name),) for name in ("고급데이터", "데이터", "데이터베이스")],
+            [(choseong(name),) for name in ("고급데이터", "데이터", "데이터베이스")],
+        )
+        self.assertEqual(index.search("데이터"), [1, 2, 0])
+        self.assertEqual(index.search("ㄷㅇㅌ"), [1, 2, 0])
+        self.assertEqual(index.search("데이터", limit=2), [1, 2])
+        self.assertEqual(self.search("ㄷ", limit=1), ["딥러닝"])
+
+
+# =========================================
+#  남은 졸업요건 플래너 (branch-and-bound)
+# =========================================
+def random_plan(rng, n):
+    """ 과목 n개짜리 무작위 플래너 입력 (부족분, 후보) """
+    rows = [
+        (
+            f"C{i:02d}", f"과목{i}", rng.choice((1, 2, 3, 3, 4)), rng.choice(CATEGORIES),
+            rng.choice((1000, 2000, 3000, 4000)), rng.choice(("", "", "A", "B", "C")),
+        )
+        for i in range(n)
+    ]
+    track_codes = {row[0] for row in rows if rng.random() < 0.3}
+    state = PlanState(tuple(rng.choice((0, 0, 0, 2, 3)) for _ in DIMS), rng.randint(0, 2), frozenset())
+    return state, [Candidate(*row, track_codes) for row in rows]
+
+
+def brute_force_credits(state, candidates):
+    """ 모든 부분집합 중 부족분을 다 채우는 최소 학점 (없으면 None) """
+    best = None
+    for k in range(len(candidates) + 1):
+        for combo in combinations(candidates, k):
+            credits = sum(c.credits for c in combo)
+            if best is not None and credits >= best:
+                continue
+            after = state
+            for cand in combo:
+                after = after.take(cand)
+            if after.done():
+                best = credits
+    return best
+
+
+class PlannerTests(SimpleTestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(20240301)
+        for trial in range(60):
+            state, candidates = random_plan(rng, rng.randint(6, 12))
+            expected = brute_force_credits(state, candidates)
+
+            chosen, final_state, optimal = Planner(state, candidates, 10_000).solve()
+
+            with self.subTest(trial=trial):
+                if expected is None:
+                    self.assertFalse(final_state.done())
+                    self.assertFalse(optimal)
+                else:
+                    self.assertTrue(optimal)
+                    self.assertTrue(final_state.done())
+                    self.assertEqual(sum(c.credits for c in chosen), expected)
+
+    def test_infeasible_returns_greedy_progress(self):
+        # 전공기초 6학점이 필요한데 후보는 3학점 하나뿐
+        deficits = tuple(6 if dim == "major_basic" else 0 for dim in DIMS)
+        candidates = [Candidate("SWE2001", "데이터구조론", 3, "MAJOR_BASIC", 2000, "", set())]
+
+        chosen, final_state, optimal = Planner(PlanState(deficits, 0, frozenset()), candidates, 300).solve()
+
+        self.assertFalse(optimal)
+        self.assertEqual([c.code for c in chosen], ["SWE2001"])
+        self.assertEqual(final_state.as_dict(), {"major_basic": 3})
+
+    def test_budget_cutoff_keeps_best_so_far(self):
+        # 교양 영역 5개: 1학점 영역 하나 + 3학점 영역 30개 → 하한(5)이 느슨해서 탐색이 길다
+        candidates = [Candidate("GE00", "교양0", 1, "OTHER", 1000, "AREA00", set())] + [
+            Candidate(f"GE{i:02d}", f"교양{i}", 3, "OTHER", 1000, f"AREA{i:02d}", set()) for i in range(1, 31)
+        ]
+        state = PlanState((0,) * len(DIMS), 5, frozenset())
+
+        planner = Planner(state, candidates, 0)
+        chosen, final_state, optimal = planner.solve()
+
+        self.assertFalse(optimal)
+        self.assertEqual(planner.nodes, 0x100)  # 256 노드마다 시간 확인
+        self.assertTrue(final_state.done())
+        self.assertEqual(sum(c.credits for c in chosen), 13)
+
+        full = Planner(state, candidates, 10_000)
+        self.assertTrue(full.solve()[2])
+        self.assertGreater(full.nodes, planner.nodes)
+
+
+# =========================================
+#  migrate: 빈 DB / 검색 키 데이터 migration
+# =========================================
+class MigrationTests(TransactionTestCase):
+    def tearDown(self):
+        # 다른 테스트를 위해 최신 migration 으로 되돌린다
+        call_command("migrate", verbosity=0)
+
+    def test_migrate_fresh_database(self):
+        call_command("migrate", "timetable", "zero", verbosity=0)
+        call_command("migrate", "curriculum", "zero", verbosity=0)
+        self.assertNotIn("curriculum_course", connection.introspection.table_names())
+
+        call_command("migrate", verbosity=0)
+        tables = connection.introspection.table_names()
+        self.assertIn("curriculum_course", tables)
+        self.assertIn("timetable_timetablesemester", tables)
+
+    def test_backfill_search_keys(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate([("curriculum", "0001_initial")])
+        apps = executor.loader.project_state([("curriculum", "0001_initial")]).apps
+        OldCourse = apps.get_model("curriculum", "Course")
+        OldCourse.objects.create(code="CSI2103", name="데이터구조", category="MAJOR_BASIC")
+
+        call_command("migrate", "curriculum", verbosity=0)
+        course = Course.objects.get(code="CSI2103")
+        self.assertEqual(course.name_choseong, "ㄷㅇㅌㄱㅈ")
+        self.assertEqual(course.name_jamo, "ㄷㅔㅇㅣㅌㅓㄱㅜㅈㅗ")
+        self.assertEqual(CacheGeneration.objects.get(key=generations.CATALOG).generation, 1)
@@ -0,0 +1,94 @@
+"""
+전체 트랙 한 번에 평가 + 추천 순위
+
+트랙별로 "트랙 학점으로 인정되는 과목"(TrackCourse + 규칙의 트랙 전필)과
+"트랙 전필" 을 카탈로그 비트마스크(bitsets.CourseIndex)로 미리 만들어 두고,
+이수 과목 마스크 하나로 모든 트랙을 AND / popcount 만으로 평가한다.
+
+  - 딴 트랙 학점  = credits_in(이수 & 트랙 과목)
+  - 남은 트랙 전필 = 트랙 전필 & ~이수
+  - 남은 학점     = max(트랙 최소학점 - 딴 트랙 학점, 남은 트랙 전필 학점)  → 오름차순 순위
+
+마스크는 (규칙 버전, 카탈로그 generation) 이 바뀔 때만 다시 만든다.
+"""
+from collections import defaultdict
+
+from .models import TrackCourse
+
+# 규칙 JSON 의 트랙 키 → Track.name (load_courses 가 TrackCourse 를 만들 때도 같은 표를 쓴다)
+TRACK_MAP = {
+    "ai_bigdata": "AI_BIGDATA",
+    "ai_media": "AI_MEDIA",
+    "ai_science": "AI_SCIENCE",
+    "smart_iot": "SMART_IOT",
+    "security": "SECURITY",
+}
+
+
+class TrackMask:
+    __slots__ = ("track", "course_mask", "required_mask")
+
+    def __init__(self, track, course_mask, required_mask):
+        self.track = track
+        self.course_mask = course_mask
+        self.required_mask = required_mask
+
+
+# (entry_year, major) → ((규칙 버전, 카탈로그 generation), (TrackMask, ...))
+# 학번 / 학과마다 1개만 들고 있으므로 규칙이나 카탈로그가 바뀌면 예전 마스크는 덮어써진다
+_track_masks = {}
+
+
+def get_track_masks(compiled, index):
+    """ 규칙 세트의 트랙 전부 → (TrackMask, ...) """
+    key = (compiled.entry_year, compiled.major)
+    stamp = (compiled.version, index.generation)
+    cached = _track_masks.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    links = defaultdict(set)
+    for track_name, code in TrackCourse.objects.values_list("track__name", "course__code"):
+        links[track_name].add(code)
+
+    masks = tuple(
+        TrackMask(
+            track,
+            index.mask_of(track.required_codes | links.get(TRACK_MAP.get(track_key), set())),
+            index.mask_of(track.required_codes),
+        )
+        for track_key, track in compiled.tracks.items()
+    )
+
+    _track_masks[key] = (stamp, masks)
+    return masks
+
+
+def rank_tracks(mask, compiled, index):
+    """ 이수 과목 마스크 → 트랙별 결과 리스트 (남은 학점이 적은 순, rank 1 부터) """
+    min_credits = compiled.track_min_credits
+    results = []
+
+    for item in get_track_masks(compiled, index):
+        track = item.track
+        earned = index.credits_in(mask & item.course_mask)
+        missing_codes = set(index.decode(item.required_mask & ~mask))
+        # 카탈로그에 없는 전필도 남은 과목으로 표시
+        missing_codes.update(code for code in track.required_codes if code not in index.ids)
+
+        missing = [c for c in track.required_courses if c["code"] in missing_codes]
+        missing_credits = sum(c["credits"] for c in missing)
+
+        results.append({
+            "track_key": track.key,
+            "track_name": track.name,
+            "earned_credits": earned,
+            "required_credits": min_credits,
+            "missing_required": missing,
+            "remaining_credits": max(min_credits - earned, missing_credits, 0),
+        })
+
+    results.sort(key=lambda r: (r["remaining_credits"], len(r["missing_required"]), r["track_key"]))
+    for rank, result in enumerate(results, start=1):
+        result["rank"] = rank
+    return results
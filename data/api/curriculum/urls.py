@@ -5,15 +5,35 @@ urlpatterns = [
     # 1) 졸업요건 계산 API
     path("calculate/", views.calculate_graduation, name="calculate_graduation"),
 
+    # 1-1) 전체 트랙 한 번에 평가 + 순위
+    path("tracks/rank/", views.rank_all_tracks, name="rank_all_tracks"),
+
+    # 1-2) what-if 세션 (변경분만 재계산)
+    path("whatif/", views.whatif_start, name="whatif_start"),
+    path("whatif/<str:token>/", views.whatif_apply, name="whatif_apply"),
+
+    # 1-3) 남은 졸업요건 플래너
+    path("plan/", views.plan_remaining, name="plan_remaining"),
+
     # 2) 전체 과목 목록 조회
     path("courses/", views.get_courses, name="get_courses"),
+    path("courses/search/", views.search_courses, name="search_courses"),
+    path("courses/eligible/", views.get_eligible_courses, name="eligible_courses"),
+    path("courses/<str:code>/prerequisites/", views.get_course_prerequisites, name="course_prerequisites"),
 
     # 3) 로그인한 유저의 수강 과목 조회
     path("taken-courses/", views.get_taken_courses, name="get_taken_courses"),
 
     # 4) 로그인한 유저의 학점 요약
     path("credit-summary/", views.get_credit_summary, name="credit_summary"),
+    path("credit-summary/batch/", views.get_credit_summary_batch, name="credit_summary_batch"),
 
     # ✅ 5) 계산기에서 체크한 과목 저장 (NEW)
     path("taken-courses/save/", views.save_taken_courses, name="save_taken_courses"),
+
+    # 6) 졸업요건 규칙 메타 (rules_version 기반 ETag)
+    path("rules/", views.get_rules, name="graduation_rules"),
+
+    # 7) 졸업요건 일괄 점검 (관리자 전용, NDJSON/CSV 스트리밍)
+    path("audit/", views.audit_graduation, name="audit_graduation"),
 ]
@@ -1,10 +1,35 @@
 import json
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_POST, require_GET
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
-
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .audit import (
+    ALL_FLAGS,
+    NO_FLAGS,
+    RENDERERS,
+    Throughput,
+    audit_queryset,
+    iter_audit_results,
+    track_course_codes,
+)
+from .bitsets import get_course_index, load_user_masks
+from .catalog import get_catalog_snapshot
+from .credits import get_credit_summaries, get_credit_summary_for_user, load_course_rows, tally_credits
 from .models import Course, TakenCourse
+from .planner import DEFAULT_BUDGET_MS, MAX_BUDGET_MS, build_plan
+from .rulesets import (
+    DEFAULT_DEPARTMENT,
+    DEFAULT_ENTRY_YEAR,
+    DEPARTMENT_LABELS,
+    get_compiled_rules,
+    rules_for_user,
+)
+from .search import DEFAULT_LIMIT, MAX_LIMIT, get_catalog_search_index
+from .tracks import rank_tracks
+from .whatif import WhatIfSession, fetch_course_rows, is_code_list, ops_error
 from users.models import UserProfile
 
 
@@ -14,23 +39,89 @@ from users.models import UserProfile
 @csrf_exempt
 @require_GET
 def get_courses(request):
-    courses = Course.objects.all().values(
-        "code",
-        "name",
-        "credits",
-        "category",
-        "major_type",
-        "is_required",
-        "level",
-        "ge_area",
-    )
+    # 카탈로그가 바뀔 때만 다시 직렬화/압축된 스냅샷 (curriculum/catalog.py)
+    snapshot = get_catalog_snapshot()
+    encoding, body = snapshot.pick(request.headers.get("Accept-Encoding"))
+
+    # 304 도 200 과 같은 ETag / Vary 를 보내야 캐시가 인코딩별 응답을 섞지 않는다
+    if snapshot.matches(request.headers.get("If-None-Match")):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type="application/json")
+        if encoding is not None:
+            response["Content-Encoding"] = encoding
+    response["ETag"] = snapshot.etag(encoding)
+    response["Vary"] = "Accept-Encoding"
+    return response
+
+
+# =======================================
+#   1-1) 과목 검색 (코드 / 과목명, 메모리 n-gram 인덱스)
+#   GET /api/curriculum/courses/search/?q=자료&limit=20
+# =======================================
+@require_GET
+def search_courses(request):
+    query = request.GET.get("q", "")
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        return JsonResponse({"detail": "limit 형식 오류"}, status=400)
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    results = get_catalog_search_index().search(query, limit)
+
     return JsonResponse(
-        list(courses),
-        safe=False,
+        {"query": query, "results": results},
         json_dumps_params={"ensure_ascii": False},
     )
 
 
+# =======================================
+#   1-2) 선수과목 (bitsets.CourseIndex 의 전이 폐포 사용)
+#   GET /api/curriculum/courses/<code>/prerequisites/
+#   GET /api/curriculum/courses/eligible/?min_level=3000
+# =======================================
+@require_GET
+def get_course_prerequisites(request, code):
+    index = get_course_index()
+    i = index.ids.get(code)
+    if i is None:
+        return JsonResponse({"detail": "존재하지 않는 과목입니다."}, status=404)
+
+    data = {
+        "code": code,
+        "prerequisites": index.decode(index.prereq_masks[i]),
+        "all_prerequisites": index.decode(index.ancestor_masks[i]),
+        "unlocks": index.decode(index.unlocks(i)),
+    }
+
+    # 로그인했으면 내 이수 기록 기준으로 수강 가능 여부도 같이
+    if request.user.is_authenticated:
+        mask = load_user_masks([request.user.id], index)[request.user.id]
+        data["eligible"] = index.is_eligible(i, mask)
+        data["missing_prerequisites"] = index.decode(index.missing_prerequisites(i, mask))
+
+    return JsonResponse(data, json_dumps_params={"ensure_ascii": False})
+
+
+@login_required
+@require_GET
+def get_eligible_courses(request):
+    try:
+        min_level = int(request.GET.get("min_level", 0))
+    except ValueError:
+        return JsonResponse({"detail": "min_level 형식 오류"}, status=400)
+
+    index = get_course_index()
+    mask = load_user_masks([request.user.id], index)[request.user.id]
+
+    eligible = index.eligible_mask(mask)
+    if min_level:
+        eligible &= index.level_mask(min_level)
+
+    return JsonResponse({"eligible": index.decode(eligible)})
+
+
 # =======================================
 #   2) 로그인한 유저의 이수 과목 목록 조회 API
 # =======================================
@@ -65,91 +156,79 @@ def get_taken_courses(request):
 @login_required
 @require_GET
 def get_credit_summary(request):
-    user = request.user
-    completed = TakenCourse.objects.filter(user=user).select_related("course")
+    # 조건부 집계 쿼리 1번 (curriculum/credits.py)
+    summary = get_credit_summary_for_user(request.user)
 
-    total = 0
-    major_basic = 0
-    major_deep = 0
-    level300 = 0
+    return JsonResponse(summary, json_dumps_params={"ensure_ascii": False})
 
-    for item in completed:
-        course = item.course
 
-        total += course.credits
+#   GET /api/curriculum/credit-summary/batch/?user_ids=1,2,3
+#   여러 유저의 학점 요약을 한 번에 (관리자 전용)
+@login_required
+@require_GET
+def get_credit_summary_batch(request):
+    if not request.user.is_staff:
+        return JsonResponse({"detail": "관리자만 사용할 수 있습니다."}, status=403)
 
-        if course.category == "MAJOR_BASIC":
-            major_basic += course.credits
+    try:
+        user_ids = [
+            int(v) for v in request.GET.get("user_ids", "").split(",") if v.strip()
+        ]
+    except ValueError:
+        return JsonResponse({"detail": "user_ids 형식 오류"}, status=400)
 
-        if course.category == "MAJOR_DEEP":
-            major_deep += course.credits
+    if not user_ids:
+        return JsonResponse({"detail": "user_ids 쿼리 파라미터가 필요합니다."}, status=400)
 
-        # ⭐ 3000단위 계산 (정확)
-        if course.level >= 3000:
-            level300 += course.credits
+    summaries = get_credit_summaries(user_ids)
 
-    return JsonResponse({
-        "total_credits": total,
-        "MAJOR_BASIC": major_basic,
-        "MAJOR_DEEP": major_deep,
-        "LEVEL300": level300,   # ← 반드시 대문자
-    }, json_dumps_params={"ensure_ascii": False})
+    return JsonResponse(
+        {"results": {str(user_id): s for user_id, s in summaries.items()}},
+        json_dumps_params={"ensure_ascii": False},
+    )
+
+
+def rules_not_found(entry_year, major):
+    return JsonResponse(
+        {"detail": f"{entry_year}학번 {major} 졸업요건이 등록되어 있지 않습니다."},
+        status=400,
+    )
 
 
 # =======================================
-#   4) 졸업요건 규칙 (2022 SWE)
+#   4) 졸업요건 규칙 → curriculum/rules.py, rulesets.py
 # =======================================
-GRAD_RULES_2022_SWE = {
-    "meta": {"entry_year": 2022, "major": "소프트웨어학부"},
-
-    "total_credits": 135,
-    "need_second_major": True,
-
-    "certifications": {
-        "language": {"required": True},
-        "it_or_industry": {"required": True},
-    },
-
-    "level300_min_credits": 45,
-
-    "area_min_credits": {
-        "liberal_basic": 22,
-        "univ_required": 5,
-        "exploration": 21,
-        "major_basic": 36,
-        "level300": 45,
-    },
-
-    "major": {
-        "required_courses": [
-            {"code": "SWE2001", "name": "데이터구조론", "credits": 3},
-            {"code": "SWE3016", "name": "인공지능", "credits": 3},
-            {"code": "SWE3017", "name": "데이터베이스", "credits": 3},
-        ],
-    },
-
-    "tracks": {
-        "ai_bigdata": {
-            "name": "AI·빅데이터",
-            "required_courses": [
-                {"code": "SWE3016", "name": "인공지능", "credits": 3},
-                {"code": "SWE3017", "name": "데이터베이스", "credits": 3},
-            ],
-        },
-        "security": {
-            "name": "정보보안",
-            "required_courses": [
-                {"code": "SWE3009", "name": "암호학", "credits": 3},
-                {"code": "SWE3024", "name": "정보보안", "credits": 3},
-            ],
-        },
-    },
-}
+#   GET /api/curriculum/rules/?entry_year=2022&major=소프트웨어학부
+#   컴파일된 rules_meta 를 그대로 내려줌 (ETag = rules_version)
+@require_GET
+def get_rules(request):
+    try:
+        entry_year = int(request.GET.get("entry_year", DEFAULT_ENTRY_YEAR))
+    except ValueError:
+        return JsonResponse({"detail": "entry_year 형식 오류"}, status=400)
+    major = request.GET.get("major", DEFAULT_DEPARTMENT)
+
+    compiled = get_compiled_rules(entry_year, major)
+    if compiled is None:
+        return rules_not_found(entry_year, major)
+
+    etag = f'"{compiled.version}"'
+
+    if request.headers.get("If-None-Match") == etag:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(compiled.rules_meta_json, content_type="application/json")
+
+    response["ETag"] = etag
+    return response
 
 
 # =======================================
 #   5) 졸업요건 계산 API
 # =======================================
+#   source=stored (body 또는 쿼리스트링) 이면 클라이언트가 보낸
+#   credits / total_credits / completed_courses 는 무시하고
+#   로그인 유저의 TakenCourse 에서 서버가 직접 계산한다 (쿼리 1번).
 @csrf_exempt
 @require_POST
 def calculate_graduation(request):
@@ -168,75 +247,226 @@ def calculate_graduation(request):
     credits = data.get("credits", {}) or {}
     flags = data.get("flags", {}) or {}
 
-    liberal_basic = int(credits.get("liberal_basic", 0))
-    univ_required = int(credits.get("univ_required", 0))
-    exploration = int(credits.get("exploration", 0))
-    major_basic = int(credits.get("major_basic", 0))
-    level300 = int(credits.get("level300", 0))
-
-    second_major_done = bool(flags.get("second_major_done", False))
-    language_cert = bool(flags.get("language_cert", False))
-    it_cert = bool(flags.get("it_cert", False))
-    industry_cert = bool(flags.get("industry_cert", False))
-
-    rules = GRAD_RULES_2022_SWE
-
-    required_courses = rules["major"]["required_courses"]
-    required_total = sum(c["credits"] for c in required_courses)
-
-    completed_required = [c for c in required_courses if c["code"] in completed_codes]
-    remaining_required = [c for c in required_courses if c["code"] not in completed_codes]
-
-    earned_required = sum(c["credits"] for c in completed_required)
-
-    track_result = None
-    if track_key in rules["tracks"]:
-        t = rules["tracks"][track_key]
-        track_required = t["required_courses"]
-        track_total = sum(c["credits"] for c in track_required)
-        track_completed = [c for c in track_required if c["code"] in completed_codes]
-        track_earned = sum(c["credits"] for c in track_completed)
-
-        track_result = {
-            "track_name": t["name"],
-            "required_credits": track_total,
-            "earned_credits": track_earned,
-            "completed": track_completed,
-        }
-
-    area = rules["area_min_credits"]
-
-    conditions = {
-        "total_credits": total_credits >= rules["total_credits"],
-        "second_major": (not rules["need_second_major"]) or second_major_done,
-        "language_cert": (not rules["certifications"]["language"]["required"]) or language_cert,
-        "it_or_industry_cert": (not rules["certifications"]["it_or_industry"]["required"])
-                                or (it_cert or industry_cert),
-        "level300": level300 >= area["level300"],
-        "liberal_basic": liberal_basic >= area["liberal_basic"],
-        "univ_required": univ_required >= area["univ_required"],
-        "exploration": exploration >= area["exploration"],
-        "major_basic": major_basic >= area["major_basic"],
-        "major_required_all": len(remaining_required) == 0,
+    compiled = get_compiled_rules(entry_year, major)
+    if compiled is None:
+        return rules_not_found(entry_year, major)
+
+    flags = {
+        "second_major_done": bool(flags.get("second_major_done", False)),
+        "language_cert": bool(flags.get("language_cert", False)),
+        "it_cert": bool(flags.get("it_cert", False)),
+        "industry_cert": bool(flags.get("industry_cert", False)),
+    }
+
+    source = data.get("source") or request.GET.get("source", "client")
+
+    if source == "stored":
+        if not request.user.is_authenticated:
+            return JsonResponse({"detail": "source=stored 는 로그인이 필요합니다."}, status=401)
+
+        rows = load_course_rows([request.user.id])[request.user.id]
+        completed_codes, total_credits, credits, ge_area_count = tally_credits(
+            rows, track_course_codes(track_key, compiled)
+        )
+    elif source == "client":
+        credits = {key: int(credits.get(key, 0)) for key in compiled.CREDIT_KEYS}
+
+        # 대학교양 선택 영역 개수
+        ge_area_count = (
+            Course.objects.filter(code__in=completed_codes, ge_area__isnull=False)
+            .values("ge_area")
+            .distinct()
+            .count()
+        )
+    else:
+        return JsonResponse({"detail": "source 는 client 또는 stored 입니다."}, status=400)
+
+    result = compiled.evaluate(
+        completed_codes=completed_codes,
+        credits=credits,
+        flags=flags,
+        total_credits=total_credits,
+        ge_area_count=ge_area_count,
+        track_key=track_key,
+    )
+
+    response_data = {
+        "entry_year": entry_year,
+        "major": major,
+        "source": source,
+        **result,
+        "rules_version": compiled.version,
     }
 
+    body = json.dumps(response_data).encode("utf-8")
+
+    # 클라이언트가 같은 버전의 rules_meta 를 이미 갖고 있으면 생략,
+    # 아니면 미리 직렬화된 바이트를 그대로 이어 붙인다.
+    if data.get("rules_version") != compiled.version:
+        body = body[:-1] + b', "rules_meta": ' + compiled.rules_meta_json + b"}"
+
+    return HttpResponse(body, content_type="application/json")
+
+
+# =======================================
+#   5-1) 전체 트랙 한 번에 평가 + 순위
+#   POST /api/curriculum/tracks/rank/
+#   body: {"entry_year", "major", "completed_courses"} 또는 {"entry_year", "major", "source": "stored"}
+# =======================================
+@csrf_exempt
+@require_POST
+def rank_all_tracks(request):
+    try:
+        data = json.loads(request.body.decode("utf-8"))
+    except json.JSONDecodeError:
+        return JsonResponse({"detail": "잘못된 JSON입니다."}, status=400)
+
+    entry_year = int(data.get("entry_year", 0))
+    major = data.get("major")
+
+    compiled = get_compiled_rules(entry_year, major)
+    if compiled is None:
+        return rules_not_found(entry_year, major)
+
+    index = get_course_index()
+    source = data.get("source") or request.GET.get("source", "client")
+
+    if source == "stored":
+        if not request.user.is_authenticated:
+            return JsonResponse({"detail": "source=stored 는 로그인이 필요합니다."}, status=401)
+        mask = load_user_masks([request.user.id], index)[request.user.id]
+        unknown_codes = []
+    elif source == "client":
+        codes = set(data.get("completed_courses", []))
+        mask = index.mask_of(codes)
+        unknown_codes = sorted(code for code in codes if code not in index.ids)
+    else:
+        return JsonResponse({"detail": "source 는 client 또는 stored 입니다."}, status=400)
+
+    return JsonResponse({
+        "rules_version": compiled.version,
+        "source": source,
+        "unknown_codes": unknown_codes,
+        "tracks": rank_tracks(mask, compiled, index),
+    }, json_dumps_params={"ensure_ascii": False})
+
+
+# =======================================
+#   5-2) what-if 세션 (변경분만 다시 계산)
+#   POST /api/curriculum/whatif/          → 세션 시작 (전체 결과 + token)
+#   POST /api/curriculum/whatif/<token>/  → delta 적용 (바뀐 필드만, "reset": false)
+#     그 사이 졸업요건이 바뀌었으면 "reset": true + 전체 결과 (시작할 때와 같은 모양)
+#   세션은 시작한 사람(로그인 유저 / 비로그인이면 Django 세션)만 쓸 수 있다
+# =======================================
+def whatif_owner(request):
+    """ what-if 세션 주인 키: 로그인 유저 id, 비로그인이면 Django 세션 키 """
+    if request.user.is_authenticated:
+        return f"user:{request.user.id}"
+    if request.session.session_key is None:
+        request.session.save()
+        # 세션 쿠키를 내려보내도록
+        request.session.modified = True
+    return f"session:{request.session.session_key}"
+
+
+@csrf_exempt
+@require_POST
+def whatif_start(request):
+    try:
+        data = json.loads(request.body.decode("utf-8"))
+    except json.JSONDecodeError:
+        return JsonResponse({"detail": "잘못된 JSON입니다."}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({"detail": "JSON 객체가 필요합니다."}, status=400)
+
+    error = ops_error({"flags": data.get("flags"), "track": data.get("track", "none")})
+    if error is None and not is_code_list(data.get("completed_courses", [])):
+        error = "completed_courses 는 과목 코드 문자열 배열이어야 합니다."
+    if error is not None:
+        return JsonResponse({"detail": error}, status=400)
+
+    entry_year = int(data.get("entry_year", 0))
+    major = data.get("major")
+
+    compiled = get_compiled_rules(entry_year, major)
+    if compiled is None:
+        return rules_not_found(entry_year, major)
+
+    session = WhatIfSession(compiled, data.get("track", "none"), data.get("flags") or {}, whatif_owner(request))
+
+    codes = set(data.get("completed_courses", []))
+    rows = fetch_course_rows(codes)
+    session.add_courses(rows, compiled, set())
+    result = session.evaluate(compiled)
+    session.save()
+
     return JsonResponse({
-        "summary": {
-            "total_credits": total_credits,
-            "required_total_credits": rules["total_credits"],
-            "can_graduate": all(conditions.values()),
-        },
-        "major_required": {
-            "earned": earned_required,
-            "required": required_total,
-            "completed": completed_required,
-            "remaining": remaining_required,
-        },
-        "track": track_result,
-        "conditions": conditions,
+        "token": session.token,
+        "rules_version": compiled.version,
+        "unknown_codes": sorted(codes - rows.keys()),
+        **result,
     })
 
 
+@csrf_exempt
+@require_POST
+def whatif_apply(request, token):
+    # 다른 사람의 토큰도 만료된 것과 똑같이 404 (세션이 있는지조차 알려주지 않음)
+    session = WhatIfSession.load(token, whatif_owner(request))
+    if session is None:
+        return JsonResponse({"detail": "세션이 만료되었습니다. 다시 시작해 주세요."}, status=404)
+
+    try:
+        ops = json.loads(request.body.decode("utf-8"))
+    except json.JSONDecodeError:
+        return JsonResponse({"detail": "잘못된 JSON입니다."}, status=400)
+
+    error = ops_error(ops)
+    if error is not None:
+        return JsonResponse({"detail": error}, status=400)
+
+    compiled = get_compiled_rules(session.entry_year, session.department)
+    if compiled is None:
+        return rules_not_found(session.entry_year, session.department)
+
+    changed, unknown_codes = session.apply(compiled, ops)
+    session.save()
+
+    response = {
+        "token": session.token,
+        "rules_version": compiled.version,
+        "unknown_codes": unknown_codes,
+    }
+    if changed is None:
+        response.update(reset=True, **session.result)
+    else:
+        response.update(reset=False, changed=changed)
+    return JsonResponse(response)
+
+
+# =======================================
+#   5-3) 남은 졸업요건 플래너
+#   GET /api/curriculum/plan/?track=security&budget_ms=300
+# =======================================
+@login_required
+@require_GET
+def plan_remaining(request):
+    try:
+        budget_ms = int(request.GET.get("budget_ms", DEFAULT_BUDGET_MS))
+    except ValueError:
+        return JsonResponse({"detail": "budget_ms 형식 오류"}, status=400)
+
+    budget_ms = max(1, min(budget_ms, MAX_BUDGET_MS))
+
+    compiled = rules_for_user(request.user)
+    if compiled is None:
+        return JsonResponse({"detail": "내 학번/학과의 졸업요건이 등록되어 있지 않습니다."}, status=400)
+
+    plan = build_plan(request.user, compiled, request.GET.get("track", "none"), budget_ms)
+
+    return JsonResponse(plan, json_dumps_params={"ensure_ascii": False})
+
+
 # =======================================
 #   6) [NEW] 계산기에서 과목 체크 → TakenCourse 저장
 # =======================================
@@ -252,21 +482,89 @@ def save_taken_courses(request):
     except:
         return JsonResponse({"error": "invalid body"}, status=400)
 
-    # 기존 데이터 삭제
-    TakenCourse.objects.filter(user=user).delete()
+    # 숫자 / dict 등이 섞이면 set() 이나 in_bulk 에서 500 이 나므로 미리 거른다
+    if not is_code_list(codes):
+        return JsonResponse({"error": "completed_courses 는 과목 코드 문자열 배열이어야 합니다."}, status=400)
+
+    codes = set(codes)
+
+    # 과목 코드 → Course 한 번에 조회
+    courses = Course.objects.in_bulk(codes, field_name="code")
+    unknown_codes = sorted(codes - courses.keys())
+    wanted_ids = {course.id for course in courses.values()}
+
+    with transaction.atomic():
+        # 같은 유저의 동시 저장은 순서대로 처리 (반쯤 지워진 상태가 보이지 않도록)
+        User.objects.select_for_update().filter(pk=user.pk).exists()
 
-    # 다시 저장
-    for code in codes:
-        try:
-            course = Course.objects.get(code=code)
-            TakenCourse.objects.create(
+        existing_ids = set(
+            TakenCourse.objects.filter(user=user).values_list("course_id", flat=True)
+        )
+
+        removed_ids = existing_ids - wanted_ids
+        added_ids = wanted_ids - existing_ids
+
+        if removed_ids:
+            TakenCourse.objects.filter(user=user, course_id__in=removed_ids).delete()
+
+        TakenCourse.objects.bulk_create([
+            TakenCourse(
                 user=user,
-                course=course,
+                course_id=course_id,
                 year=2024,         # 기본값 (나중에 선택 가능하도록 확장)
                 semester="2-1",    # 기본값
-                grade="A+"
+                grade="A+",
             )
-        except Course.DoesNotExist:
-            pass
+            for course_id in added_ids
+        ])
 
-    return JsonResponse({"status": "success", "saved": len(codes)})
+    return JsonResponse({
+        "status": "success",
+        "saved": len(wanted_ids),
+        "added": len(added_ids),
+        "removed": len(removed_ids),
+        "unknown_codes": unknown_codes,
+    }, json_dumps_params={"ensure_ascii": False})
+
+
+# =======================================
+#   7) 졸업요건 일괄 점검 (관리자 전용)
+#   GET /api/curriculum/audit/?entry_year=2022&department=SOFTWARE&track=ai_bigdata&format=csv
+# =======================================
+@login_required
+@require_GET
+def audit_graduation(request):
+    if not request.user.is_staff:
+        return JsonResponse({"detail": "관리자만 사용할 수 있습니다."}, status=403)
+
+    fmt = request.GET.get("format", "ndjson")
+    if fmt not in RENDERERS:
+        return JsonResponse({"detail": "format 은 ndjson 또는 csv 입니다."}, status=400)
+
+    try:
+        entry_year = int(request.GET["entry_year"]) if request.GET.get("entry_year") else None
+    except ValueError:
+        return JsonResponse({"detail": "entry_year 형식 오류"}, status=400)
+
+    department = request.GET.get("department") or None
+    # 학번 / 학과를 콕 집어 점검할 때만 미리 확인 (그 외에는 유저마다 자기 학번 규칙으로 평가)
+    if entry_year and department:
+        rules_key = (entry_year, DEPARTMENT_LABELS.get(department, department))
+        if get_compiled_rules(*rules_key) is None:
+            return rules_not_found(*rules_key)
+
+    # 웹 요청은 항상 이 프로세스에서 평가 (gunicorn 워커 안에서 fork 하지 않음)
+    # → 여러 프로세스로 나누려면 manage.py audit_graduation --workers N
+    users = audit_queryset(entry_year=entry_year, department=department)
+    results = iter_audit_results(
+        users,
+        track_key=request.GET.get("track", "none"),
+        flags=ALL_FLAGS if request.GET.get("assume_flags") == "1" else NO_FLAGS,
+        workers=1,
+    )
+
+    content_type = "text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson"
+    return StreamingHttpResponse(
+        RENDERERS[fmt](results, Throughput()),
+        content_type=content_type,
+    )
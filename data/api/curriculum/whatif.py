@@ -0,0 +1,254 @@
+"""
+졸업요건 what-if 세션
+
+계산기에서 체크박스 하나를 바꿀 때마다 전체 payload 를 다시 보내는 대신,
+서버가 평가 상태를 토큰으로 들고 있다가 변경분(delta)만 받아서
+영향받는 조건 / 진행률 / 트랙 결과만 다시 계산하고 바뀐 필드만 돌려준다.
+
+  delta 형식: {"add": [코드...], "remove": [코드...], "flags": {...}, "track": "security"}
+
+상태는 Django cache 에 저장한다 (settings.CACHES 의 DB 캐시 → 어느 워커로 와도 같은 세션).
+세션마다 주인(로그인 유저 또는 비로그인 Django 세션)을 같이 저장하고, 주인이 아니면 토큰이 있어도 쓸 수 없다.
+"""
+import secrets
+from collections import Counter
+
+from django.core.cache import cache
+
+from .audit import track_course_codes
+from .credits import CATEGORY_CREDIT_KEYS
+from .models import Course
+from .rules import CONDITION_INPUTS
+
+SESSION_TTL = 60 * 30
+CACHE_PREFIX = "curriculum:whatif:"
+
+FLAG_KEYS = ("second_major_done", "language_cert", "it_cert", "industry_cert")
+
+
+def is_code_list(value):
+    return isinstance(value, list) and all(isinstance(code, str) for code in value)
+
+
+def ops_error(ops):
+    """ delta 형식 확인 → 오류 메시지 (문제없으면 None) """
+    if not isinstance(ops, dict):
+        return "delta 는 JSON 객체여야 합니다."
+    for key in ("add", "remove"):
+        if ops.get(key) is not None and not is_code_list(ops[key]):
+            return f"{key} 는 과목 코드 문자열 배열이어야 합니다."
+    if ops.get("flags") is not None and not isinstance(ops["flags"], dict):
+        return "flags 는 JSON 객체여야 합니다."
+    if "track" in ops and not isinstance(ops["track"], str):
+        return "track 은 문자열이어야 합니다."
+    return None
+
+
+def fetch_course_rows(codes):
+    """ 코드 → (credits, category, level, ge_area) """
+    return {
+        code: (credits, category, level, ge_area)
+        for code, credits, category, level, ge_area in Course.objects.filter(
+            code__in=list(codes)
+        ).values_list("code", "credits", "category", "level", "ge_area")
+    }
+
+
+class WhatIfSession:
+    def __init__(self, compiled, track_key, flags, owner):
+        self.token = secrets.token_urlsafe(16)
+        # views.whatif_owner: "user:<id>" / "session:<세션 키>"
+        self.owner = owner
+        self.rules_version = compiled.version
+        # 세션이 어떤 규칙 세트로 평가되는지 (rulesets.get_compiled_rules 키)
+        self.entry_year = compiled.entry_year
+        self.department = compiled.major
+        self.track_key = track_key
+        self.track_codes = track_course_codes(track_key, compiled)
+        self.flags = {key: bool(flags.get(key, False)) for key in FLAG_KEYS}
+
+        self.rows = {}
+        self.total_credits = 0
+        self.credits = {
+            "liberal_basic": 0,
+            "univ_required": 0,
+            "exploration": 0,
+            "major_basic": 0,
+            "level300": 0,
+            "deep_major": 0,
+            "track": 0,
+        }
+        self.ge_areas = Counter()
+        self.result = None
+
+    # ---------------------------------------
+    #   저장 / 조회
+    # ---------------------------------------
+    @classmethod
+    def load(cls, token, owner):
+        """ 만료됐거나 다른 사람의 세션이면 None """
+        session = cache.get(CACHE_PREFIX + token)
+        if session is None or session.owner != owner:
+            return None
+        return session
+
+    def save(self):
+        cache.set(CACHE_PREFIX + self.token, self, SESSION_TTL)
+
+    # ---------------------------------------
+    #   입력 변경 → 바뀐 입력 이름 set
+    # ---------------------------------------
+    def _apply_row(self, code, row, sign, changed):
+        course_credits, category, level, ge_area = row
+        delta = sign * course_credits
+
+        self.total_credits += delta
+        changed.add("total_credits")
+
+        key = CATEGORY_CREDIT_KEYS.get(category)
+        if key is not None:
+            self.credits[key] += delta
+            changed.add(f"credits.{key}")
+
+        if level >= 3000:
+            self.credits["level300"] += delta
+            changed.add("credits.level300")
+
+        if code in self.track_codes:
+            self.credits["track"] += delta
+            changed.add("credits.track")
+
+        if ge_area:
+            before = len(self.ge_areas)
+            self.ge_areas[ge_area] += sign
+            if self.ge_areas[ge_area] <= 0:
+                del self.ge_areas[ge_area]
+            if len(self.ge_areas) != before:
+                changed.add("ge_area_count")
+
+    def add_courses(self, rows, compiled, changed):
+        for code, row in rows.items():
+            if code in self.rows:
+                continue
+            self.rows[code] = row
+            self._apply_row(code, row, 1, changed)
+            self._mark_code(code, compiled, changed)
+
+    def remove_courses(self, codes, compiled, changed):
+        for code in codes:
+            row = self.rows.pop(code, None)
+            if row is None:
+                continue
+            self._apply_row(code, row, -1, changed)
+            self._mark_code(code, compiled, changed)
+
+    def _mark_code(self, code, compiled, changed):
+        if code in compiled.major_required_codes:
+            changed.add("major_required")
+        track = compiled.tracks.get(self.track_key)
+        if track is not None and code in track.required_codes:
+            changed.add("track")
+
+    def set_flags(self, flags, changed):
+        for key in FLAG_KEYS:
+            if key in flags and bool(flags[key]) != self.flags[key]:
+                self.flags[key] = bool(flags[key])
+                changed.add(f"flags.{key}")
+
+    def set_track(self, track_key, compiled, changed):
+        if track_key == self.track_key:
+            return
+        self.track_key = track_key
+        self.track_codes = track_course_codes(track_key, compiled)
+        self.credits["track"] = sum(
+            row[0] for code, row in self.rows.items() if code in self.track_codes
+        )
+        changed.update({"track", "credits.track"})
+
+    # ---------------------------------------
+    #   평가
+    # ---------------------------------------
+    def evaluate(self, compiled):
+        self.rules_version = compiled.version
+        self.result = compiled.evaluate(
+            completed_codes=self.rows.keys(),
+            credits=self.credits,
+            flags=self.flags,
+            total_credits=self.total_credits,
+            ge_area_count=len(self.ge_areas),
+            track_key=self.track_key,
+        )
+        return self.result
+
+    def reevaluate(self, compiled, changed):
+        """
+        바뀐 입력에 걸린 부분만 다시 계산하고, 값이 실제로 달라진 필드만 반환.
+        그 사이 규칙 세트가 바뀌었으면 전체를 다시 평가하고 None (→ self.result 가 새 전체 결과)
+        """
+        if self.result is None or self.rules_version != compiled.version:
+            self.evaluate(compiled)
+            return None
+
+        result = self.result
+        codes = frozenset(self.rows)
+        diff = {}
+
+        if "major_required" in changed:
+            value = compiled.evaluate_major_required(codes)
+            if value != result["major_required"]:
+                result["major_required"] = diff["major_required"] = value
+
+        if "track" in changed:
+            track = compiled.tracks.get(self.track_key)
+            value = track.evaluate(codes) if track is not None else None
+            if value != result["track"]:
+                result["track"] = diff["track"] = value
+
+        inputs = {
+            "total_credits": self.total_credits,
+            "credits": self.credits,
+            "flags": self.flags,
+            "ge_area_count": len(self.ge_areas),
+            "major_required": result["major_required"],
+            "track": result["track"],
+        }
+
+        for name, deps in CONDITION_INPUTS.items():
+            if deps & changed:
+                value = compiled.check_condition(name, inputs)
+                if value != result["conditions"][name]:
+                    result["conditions"][name] = value
+                    diff.setdefault("conditions", {})[name] = value
+
+        for key in compiled.progress_required:
+            if f"credits.{key}" in changed:
+                value = compiled.progress_entry(key, self.credits)
+                if value != result["progress"][key]:
+                    result["progress"][key] = value
+                    diff.setdefault("progress", {})[key] = value
+
+        if "total_credits" in changed or "conditions" in diff:
+            value = compiled.summary(self.total_credits, result["conditions"])
+            if value != result["summary"]:
+                result["summary"] = diff["summary"] = value
+
+        return diff
+
+    def apply(self, compiled, ops):
+        """
+        delta 적용 → (바뀐 필드 dict 또는 None(규칙 변경으로 전체 재평가), 카탈로그에 없는 코드 목록)
+        """
+        changed = set()
+
+        if "track" in ops:
+            self.set_track(ops["track"], compiled, changed)
+
+        self.set_flags(ops.get("flags") or {}, changed)
+
+        self.remove_courses(ops.get("remove") or [], compiled, changed)
+
+        add = set(ops.get("add") or []) - self.rows.keys()
+        rows = fetch_course_rows(add) if add else {}
+        self.add_courses(rows, compiled, changed)
+
+        return self.reevaluate(compiled, changed), sorted(add - rows.keys())
@@ -1,7 +1,8 @@
+from django.db.models import Exists, OuterRef
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET
 
-from timetable.models import Timetable
+from timetable.models import Timetable, TimetableSemester
 
 
 def _normalize_memo(raw_memo: str) -> str:
@@ -57,10 +58,16 @@ def shared_timetables(request):
     track_param = request.GET.get("track")   # 예: "AI", "AI_ML"
     grade_param = request.GET.get("grade")   # 예: "3"
 
-    # 기본 쿼리셋: 공유 ON
+    # 기본 쿼리셋: 공유 ON (학기 헤더의 is_shared 인덱스로 거름)
+    shared = TimetableSemester.objects.filter(
+        user=OuterRef("user"),
+        year=OuterRef("year"),
+        semester=OuterRef("semester"),
+        is_shared=True,
+    )
     qs = (
         Timetable.objects
-        .filter(is_shared=True)
+        .filter(Exists(shared))
         .select_related("user", "user__userprofile")
         .order_by("user_id", "year", "semester", "day", "period")
     )
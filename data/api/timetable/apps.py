@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import pre_migrate
 
 class TimetableConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'timetable'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .search import ensure_trigram_extension
+
+        # migrate 전: Postgres 면 pg_trgm 확장 (GIN 인덱스 자체는 Course.Meta.indexes)
+        pre_migrate.connect(ensure_trigram_extension, sender=self)
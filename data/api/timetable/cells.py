@@ -0,0 +1,392 @@
+"""
+칸 단위 시간표 수정 + 학기별 버전 (낙관적 동시성 제어) + 점유 비트마스크 충돌 검사
+
+  - TimetableSemester.version: 칸을 바꾸는 쓰기마다 + 1
+  - PATCH 는 클라이언트가 마지막으로 본 version 을 같이 보내고, 같을 때만 반영 → 아니면 VersionConflict (409)
+  - TimetableSemester.occupancy: 찬 칸 비트마스크 (occupancy.py), 쓰기마다 version 과 같은 UPDATE 로 갱신
+    → 새 칸이 이미 찼는지는 AND 한 번, 겹친 칸의 과목명만 따로 읽는다 (CellConflict, 409)
+  - 삭제는 (day, period) 목록을 DELETE 한 번, 추가/수정은
+    bulk_create(update_conflicts=True) 로 unique_together 에 upsert 한 번
+    → 칸 하나 고치는 데 학기 전체를 지우고 다시 쓰지 않는다
+  - 공유된 학기 복제는 INSERT … SELECT … ON CONFLICT 한 문장 (clone_semester)
+  - 학기 헤더(TimetableSemester)가 학기 존재 / 공유 여부 / 칸 수를 가진다
+    → 예전 더미 row(period=0) · 칸별 is_shared 는 migrations/0002_semester_headers 가 옮긴다
+"""
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Timetable, TimetableSemester
+from .occupancy import DAY_INDEX, PERIODS, cell_bit, cells_of, decode, encode, mask_of
+from .payloads import invalidate
+
+CELL_FIELDS = ("subject", "classroom", "memo")
+
+
+class VersionConflict(Exception):
+    def __init__(self, version):
+        super().__init__(version)
+        self.version = version
+
+
+class CellConflict(Exception):
+    def __init__(self, conflicts, version):
+        super().__init__(conflicts)
+        self.conflicts = conflicts
+        self.version = version
+
+
+def parse_cell_key(item):
+    """ {"day": "MON", "period": 3, ...} → ("MON", 3), 형식이 틀리면 ValueError (범위 밖 / 더미 period=0 포함) """
+    if not isinstance(item, dict):
+        raise ValueError(item)
+    day = item.get("day")
+    period = item.get("period")
+    if isinstance(period, bool) or not isinstance(period, (int, str)):
+        raise ValueError(item)
+    period = int(period)
+    if day not in DAY_INDEX or not 1 <= period <= PERIODS:
+        raise ValueError(item)
+    return day, period
+
+
+# =========================================
+#  학기 row 잠금 / 저장 (transaction.atomic 안에서)
+# =========================================
+def lock_semester(user, year, semester):
+    """
+    학기 row 를 잠그고 가져온다 (없으면 version 0 으로 생성).
+    header.mask = 현재 점유 마스크 — 아직 계산된 적 없으면 (예전 학기) 칸을 한 번 읽어서 만든다.
+    """
+    qs = TimetableSemester.objects.select_for_update().filter(user=user, year=year, semester=semester)
+    header = qs.first()
+    if header is None:
+        try:
+            with transaction.atomic():
+                header = TimetableSemester.objects.create(user=user, year=year, semester=semester)
+        except IntegrityError:
+            # 다른 요청이 먼저 만든 경우
+            header = qs.get()
+
+    header.mask = decode(header.occupancy)
+    if header.mask is None:
+        header.mask = mask_of(
+            Timetable.objects.filter(user=user, year=year, semester=semester).values_list("day", "period")
+        )
+    return header
+
+
+def save_semester(header, mask, cell_count=None):
+    """ version + 1, 점유 마스크 / 칸 수 저장 → 새 버전 (칸 수를 안 주면 점유 비트 수) """
+    header.version += 1
+    header.mask = mask
+    header.cell_count = bin(mask).count("1") if cell_count is None else cell_count
+    TimetableSemester.objects.filter(pk=header.pk).update(
+        version=header.version,
+        occupancy=encode(mask),
+        cell_count=header.cell_count,
+        updated_at=timezone.now(),
+    )
+    # GET 응답 캐시 (write-through 무효화)
+    invalidate(header.user_id, header.year, header.semester)
+    return header.version
+
+
+def replace_semester(user, year, semester, entries):
+    """
+    학기 칸을 통째로 다시 쓴다 (POST) → (새로 만든 id 목록, 새 버전)
+    잠금 → 삭제 → bulk_create → 헤더 저장을 한 트랜잭션으로 묶어, 중간에 실패하면 기존 칸이 그대로 남는다.
+    같은 칸이 여러 번 오면 마지막 것만 쓴다.
+    항목 하나라도 형식이 틀리면 (parse_cell_key) 아무것도 쓰기 전에 ValueError
+    """
+    if not isinstance(entries, list):
+        raise ValueError(entries)
+
+    rows = {}
+    for item in entries:
+        day, period = parse_cell_key(item)
+        rows[(day, period)] = Timetable(
+            user=user,
+            year=year,
+            semester=semester,
+            day=day,
+            period=period,
+            **{f: item.get(f) or "" for f in CELL_FIELDS},
+        )
+
+    with transaction.atomic():
+        header = lock_semester(user, year, semester)
+        Timetable.objects.filter(user=user, year=year, semester=semester).delete()
+        created = Timetable.objects.bulk_create(rows.values())
+        version = save_semester(header, mask_of(rows), len(created))
+    return [row.id for row in created], version
+
+
+def cells_at(user, year, semester, mask, *fields):
+    """ 마스크에 해당하는 칸만 읽기 → {(day, period): (fields...)} """
+    cells = cells_of(mask)
+    if not cells:
+        return {}
+    where = Q()
+    for day, period in cells:
+        where |= Q(day=day, period=period)
+    return {
+        (day, period): values
+        for day, period, *values in Timetable.objects.filter(
+            where, user=user, year=year, semester=semester
+        ).values_list("day", "period", *fields)
+    }
+
+
+def describe_conflicts(user, year, semester, mask):
+    """ 겹친 칸 마스크 → [{"day", "period", "subject"}, ...] (겹친 칸만 읽음) """
+    subjects = cells_at(user, year, semester, mask, "subject")
+    return [
+        {"day": day, "period": period, "subject": subjects.get((day, period), [""])[0]}
+        for day, period in cells_of(mask)
+    ]
+
+
+# =========================================
+#  쓰기
+# =========================================
+def apply_cell_patch(user, year, semester, expected_version, upserts, deletes, replace=True):
+    """
+    upserts: {(day, period): {"subject", "classroom", "memo"}}
+    deletes: {(day, period), ...}   — 같은 칸이 양쪽에 있으면 upsert 가 이김
+    replace=False 면 이미 찬 칸에 upsert 하려 할 때 CellConflict
+    → 새 버전 (충돌이면 VersionConflict / CellConflict, 아무것도 반영되지 않음)
+    """
+    with transaction.atomic():
+        header = lock_semester(user, year, semester)
+        if header.version != expected_version:
+            raise VersionConflict(header.version)
+
+        deletes = set(deletes) - upserts.keys()
+        upsert_mask = mask_of(upserts)
+        mask = header.mask & ~mask_of(deletes)
+
+        if not replace and mask & upsert_mask:
+            raise CellConflict(describe_conflicts(user, year, semester, mask & upsert_mask), header.version)
+
+        if deletes:
+            cells = Q()
+            for day, period in deletes:
+                cells |= Q(day=day, period=period)
+            Timetable.objects.filter(cells, user=user, year=year, semester=semester).delete()
+
+        if upserts:
+            Timetable.objects.bulk_create(
+                [
+                    Timetable(user=user, year=year, semester=semester, day=day, period=period, **fields)
+                    for (day, period), fields in upserts.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["user", "year", "semester", "day", "period"],
+                update_fields=list(CELL_FIELDS),
+            )
+
+        return save_semester(header, mask | upsert_mask)
+
+
+def add_course_cell(user, year, semester, course, replace=False):
+    """
+    개설 수업 1개를 시간표 칸에 넣기 → (Timetable, created, 새 버전)
+    이미 찬 칸이면 replace=True 일 때만 덮어쓰고, 아니면 CellConflict
+    """
+    bit = cell_bit(course.day, course.period)
+    with transaction.atomic():
+        header = lock_semester(user, year, semester)
+        if not replace and header.mask & bit:
+            raise CellConflict(describe_conflicts(user, year, semester, header.mask & bit), header.version)
+
+        tt, created = Timetable.objects.update_or_create(
+            user=user,
+            year=year,
+            semester=semester,
+            day=course.day,
+            period=course.period,
+            defaults={
+                "subject": course.subject,
+                "classroom": course.classroom,
+                "memo": course.memo,
+            },
+        )
+        return tt, created, save_semester(header, header.mask | bit)
+
+
+def add_course_cells(user, year, semester, courses, replace=False):
+    """
+    개설 수업 여러 개를 한 번에 시간표에 넣기 → (항목별 결과 리스트, 새 버전)
+      status: "created" / "updated"(replace=True 로 덮어씀) / "already_added" / "conflict"
+      - 그 칸에 같은 수업(과목명 + 강의실)이 이미 있으면 already_added (다시 쓰지 않음)
+      - 다른 수업과 겹치면 conflict + "subject", 요청 안에서 겹치면 먼저 나온 수업이 이기고 "with_course_id"
+      - 겹치지 않는 수업은 bulk_create(update_conflicts=True) 한 번으로, 같은 트랜잭션에서 저장
+    """
+    with transaction.atomic():
+        header = lock_semester(user, year, semester)
+
+        # 이미 찬 칸 중 이번 요청이 건드리는 칸만 읽는다
+        requested_mask = mask_of((course.day, course.period) for course in courses)
+        existing = cells_at(user, year, semester, requested_mask & header.mask, "subject", "classroom")
+
+        results = []
+        rows = []
+        claimed = {}
+        batch_mask = 0
+        for course in courses:
+            cell = (course.day, course.period)
+            bit = cell_bit(*cell)
+            result = {"course_id": course.id, "day": course.day, "period": course.period}
+            subject, classroom = existing.get(cell, ("", ""))
+
+            if cell in claimed:
+                result.update(status="conflict", subject=claimed[cell].subject, with_course_id=claimed[cell].id)
+            elif bit & header.mask and (subject, classroom) == (course.subject, course.classroom):
+                result["status"] = "already_added"
+                claimed[cell] = course
+            elif bit & header.mask and not replace:
+                result.update(status="conflict", subject=subject)
+            else:
+                result["status"] = "updated" if bit & header.mask else "created"
+                claimed[cell] = course
+                batch_mask |= bit
+                rows.append(Timetable(
+                    user=user, year=year, semester=semester, day=course.day, period=course.period,
+                    subject=course.subject, classroom=course.classroom, memo=course.memo,
+                ))
+            results.append(result)
+
+        if not rows:
+            return results, header.version
+
+        Timetable.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["user", "year", "semester", "day", "period"],
+            update_fields=list(CELL_FIELDS),
+        )
+        return results, save_semester(header, header.mask | batch_mask)
+
+
+# =========================================
+#  공유된 시간표 복제 (INSERT … SELECT)
+# =========================================
+CLONE_POLICIES = ("skip", "overwrite", "fail")
+
+
+def semester_mask(header):
+    """ 잠그지 않고 읽은 헤더의 점유 마스크 (아직 계산 안 된 학기면 칸에서 계산) """
+    mask = decode(header.occupancy)
+    if mask is None:
+        mask = mask_of(
+            Timetable.objects.filter(
+                user_id=header.user_id, year=header.year, semester=header.semester
+            ).values_list("day", "period")
+        )
+    return mask
+
+
+def _clone_sql(policy):
+    qn = connection.ops.quote_name
+    table = qn(Timetable._meta.db_table)
+    key = ", ".join(qn(c) for c in ("user_id", "year", "semester", "day", "period"))
+    columns = ", ".join(qn(c) for c in CELL_FIELDS)
+
+    sql = (
+        f"INSERT INTO {table} ({key}, {columns}, {qn('is_shared')}) "
+        f"SELECT %s, %s, %s, {qn('day')}, {qn('period')}, {columns}, %s FROM {table} "
+        f"WHERE {qn('user_id')} = %s AND {qn('year')} = %s AND {qn('semester')} = %s AND {qn('period')} >= 1 "
+    )
+    if policy == "overwrite":
+        updates = ", ".join(f"{qn(c)} = excluded.{qn(c)}" for c in CELL_FIELDS)
+        return sql + f"ON CONFLICT ({key}) DO UPDATE SET {updates}"
+    return sql + f"ON CONFLICT ({key}) DO NOTHING"
+
+
+def _lock_source(source):
+    """ 원본 학기 헤더를 잠그고 다시 읽는다 (복사하는 동안 원본 칸이 바뀌지 않도록) """
+    return TimetableSemester.objects.select_for_update().get(pk=source.pk)
+
+
+def clone_semester(user, year, semester, source, policy="skip"):
+    """
+    source(TimetableSemester) 학기의 칸을 내 (year, semester) 로 복사 → {"copied", "skipped", "overwritten", "version"}
+      policy: skip(겹친 칸은 내 것 유지) / overwrite(선배 것으로 덮어씀) / fail(겹치면 CellConflict, 아무것도 안 씀)
+      copied: 새로 들어간 칸 수 (덮어쓴 칸은 overwritten 에만 센다)
+    칸은 파이썬을 거치지 않고 INSERT … SELECT … ON CONFLICT 한 문장으로 복사한다.
+    원본 / 대상 헤더를 둘 다 잠근 뒤 원본 마스크를 읽으므로 occupancy / cell_count 가 실제 칸과 어긋나지 않는다.
+    (서로의 학기를 동시에 복제해도 교착되지 않도록 (user, year, semester) 순서로 잠금)
+    """
+    with transaction.atomic():
+        if (source.user_id, source.year, source.semester) < (user.id, year, semester):
+            source = _lock_source(source)
+            header = lock_semester(user, year, semester)
+        else:
+            header = lock_semester(user, year, semester)
+            source = _lock_source(source)
+        source_mask = semester_mask(source)
+
+        overlap = header.mask & source_mask
+        if overlap and policy == "fail":
+            raise CellConflict(describe_conflicts(user, year, semester, overlap), header.version)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                _clone_sql(policy),
+                [user.id, year, semester, False, source.user_id, source.year, source.semester],
+            )
+            written = cursor.rowcount
+
+        overlapping = bin(overlap).count("1")
+        # ON CONFLICT DO UPDATE 로 덮어쓴 row 도 rowcount 에 들어가므로 빼서 센다
+        copied = max(0, written - overlapping) if policy == "overwrite" else written
+        version = save_semester(header, header.mask | source_mask)
+
+    return {
+        "copied": copied,
+        "skipped": overlapping if policy == "skip" else 0,
+        "overwritten": overlapping if policy == "overwrite" else 0,
+        "version": version,
+    }
+
+
+# =========================================
+#  일괄 충돌 검사 (/conflicts/)
+# =========================================
+def check_courses(user, year, semester, courses):
+    """
+    개설 수업 리스트 → {"version", "conflicts": [...], "free": [course_id, ...]}
+      conflicts: 시간표의 기존 칸과 겹치면 {"course_id", "day", "period", "subject"},
+                 요청한 수업끼리 같은 칸이면 "with_course_id" 로 먼저 나온 수업을 알려줌
+    """
+    header = TimetableSemester.objects.filter(user=user, year=year, semester=semester).first()
+    mask = decode(header.occupancy) if header else None
+    if mask is None:
+        mask = mask_of(
+            Timetable.objects.filter(user=user, year=year, semester=semester).values_list("day", "period")
+        )
+
+    clashes = describe_conflicts(
+        user, year, semester, mask & mask_of((c.day, c.period) for c in courses)
+    )
+    taken = {(c["day"], c["period"]): c["subject"] for c in clashes}
+
+    conflicts = []
+    free = []
+    claimed = {}
+    for course in courses:
+        cell = (course.day, course.period)
+        if cell in taken:
+            conflicts.append({"course_id": course.id, "day": cell[0], "period": cell[1], "subject": taken[cell]})
+        elif cell in claimed:
+            conflicts.append({
+                "course_id": course.id, "day": cell[0], "period": cell[1],
+                "subject": claimed[cell].subject, "with_course_id": claimed[cell].id,
+            })
+        else:
+            claimed[cell] = course
+            free.append(course.id)
+
+    return {"version": header.version if header else 0, "conflicts": conflicts, "free": free}
+
@@ -0,0 +1,193 @@
+"""
+충돌 없는 시간표 자동 생성
+
+희망 과목(꼭 들을 과목 / 들으면 좋은 과목)과 피하고 싶은 요일·교시를 받아
+해당 학기 개설 수업(timetable.Course) 중 서로 겹치지 않는 분반 조합을 찾는다.
+
+  - 분반: 같은 (과목명, 교수) 의 수업 row 묶음, 분반 마스크 = 칸 비트 OR (occupancy.py)
+  - 과목 순서: 꼭 들을 과목을 분반 수가 적은 것부터, 그 다음 들으면 좋은 과목
+  - 가지치기
+      1) 막힌 칸에 걸리는 분반은 처음부터 제외
+      2) 아직 안 놓은 꼭 들을 과목 중 빈 분반이 하나도 없으면 중단
+      3) 상위 limit 개가 찼으면, 지금까지의 (빠진 과목 수, 등교 일수) 가 꼴찌보다 나쁜 가지는 중단
+         (수업을 더 넣어도 두 값은 줄지 않는다)
+  - 조합 수 상한(MAX_COMBINATIONS) / 시간 예산(budget_ms) 을 넘기면 그때까지 찾은 것으로 순위
+
+순위: 빠진 과목 수 → 등교 일수 → 공강 수 (sort="gaps" 면 공강 수 → 등교 일수)
+"""
+import heapq
+import time
+
+from .models import Course
+from .occupancy import cell_bit, days_of, gaps_of
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+DEFAULT_BUDGET_MS = 300
+MAX_BUDGET_MS = 2000
+MAX_SUBJECTS = 12
+MAX_COMBINATIONS = 20000
+
+SORTS = ("days", "gaps")
+SECTION_FIELDS = ("id", "subject", "professor", "day", "period", "classroom")
+
+
+class _Stop(Exception):
+    pass
+
+
+class Section:
+    __slots__ = ("subject", "professor", "mask", "courses")
+
+    def __init__(self, subject, professor):
+        self.subject = subject
+        self.professor = professor
+        self.mask = 0
+        self.courses = []
+
+
+def load_sections(year, semester, subjects, blocked_mask=0):
+    """ → {과목명: [Section, ...]} (막힌 칸에 걸리는 분반은 제외) """
+    sections = {}
+    rows = (
+        Course.objects.filter(year=year, semester=semester, subject__in=subjects)
+        .order_by("subject", "professor", "id")
+        .values(*SECTION_FIELDS)
+    )
+    for row in rows:
+        key = (row["subject"], row["professor"])
+        section = sections.get(key)
+        if section is None:
+            section = sections[key] = Section(*key)
+        section.mask |= cell_bit(row["day"], row["period"])
+        section.courses.append(row)
+
+    by_subject = {subject: [] for subject in subjects}
+    for section in sections.values():
+        # 한 분반 안에서 칸이 겹치면(데이터 오류) 쓸 수 없는 분반
+        if section.mask & blocked_mask or len(section.courses) != bin(section.mask).count("1"):
+            continue
+        by_subject[section.subject].append(section)
+    return by_subject
+
+
+class Generator:
+    def __init__(self, required, optional, sections, limit, sort, budget_ms):
+        self.sections = sections
+        self.order = (
+            sorted(required, key=lambda s: len(sections[s]))
+            + sorted(optional, key=lambda s: len(sections[s]))
+        )
+        self.n_required = len(required)
+        self.limit = limit
+        self.sort = sort
+        self.deadline = time.perf_counter() + budget_ms / 1000
+
+        self.nodes = 0
+        self.combinations = 0
+        self.heap = []  # (-순위 키, -발견 순서, 분반들) → heap[0] 이 현재 꼴찌
+
+    def key_of(self, mask, skipped):
+        days, gaps = days_of(mask), gaps_of(mask)
+        return (skipped, days, gaps) if self.sort == "days" else (skipped, gaps, days)
+
+    def pruned(self, used, skipped):
+        if len(self.heap) < self.limit:
+            return False
+        worst = tuple(-k for k in self.heap[0][0])
+        if self.sort == "days":
+            return (skipped, days_of(used)) > worst[:2]
+        return skipped > worst[0]
+
+    def record(self, used, skipped, chosen):
+        self.combinations += 1
+        entry = (tuple(-k for k in self.key_of(used, skipped)), -self.combinations, tuple(chosen))
+        if len(self.heap) < self.limit:
+            heapq.heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            heapq.heapreplace(self.heap, entry)
+        if self.combinations >= MAX_COMBINATIONS:
+            raise _Stop
+
+    def _search(self, i, used, skipped, chosen):
+        self.nodes += 1
+        if self.nodes & 0xFF == 0 and time.perf_counter() > self.deadline:
+            raise _Stop
+
+        if self.pruned(used, skipped):
+            return
+
+        if i == len(self.order):
+            self.record(used, skipped, chosen)
+            return
+
+        # 남은 꼭 들을 과목마다 빈 분반이 하나는 있어야 함
+        for subject in self.order[i:self.n_required]:
+            if all(section.mask & used for section in self.sections[subject]):
+                return
+
+        for section in self.sections[self.order[i]]:
+            if section.mask & used:
+                continue
+            chosen.append(section)
+            self._search(i + 1, used | section.mask, skipped, chosen)
+            chosen.pop()
+
+        if i >= self.n_required:
+            # 들으면 좋은 과목은 빼는 경우도
+            self._search(i + 1, used, skipped + 1, chosen)
+
+    def run(self):
+        """ → (순위순 [(키, 분반들), ...], 끝까지 탐색했는지) """
+        try:
+            self._search(0, 0, 0, [])
+            complete = True
+        except _Stop:
+            complete = False
+
+        ranked = sorted(self.heap, reverse=True)
+        return [(tuple(-k for k in key), sections) for key, _, sections in ranked], complete
+
+
+def generate(year, semester, required, optional=(), blocked_mask=0,
+             limit=DEFAULT_LIMIT, sort="days", budget_ms=DEFAULT_BUDGET_MS):
+    """
+    → (후보 dict 이터레이터, 요약 dict)
+    후보: {"rank", "courses": [...], "days", "gaps", "missing": [빠진 과목]}
+    """
+    started = time.perf_counter()
+    required = list(dict.fromkeys(required))
+    optional = [s for s in dict.fromkeys(optional) if s not in required]
+
+    sections = load_sections(year, semester, required + optional, blocked_mask)
+    unavailable = [s for s in required if not sections[s]]
+
+    if unavailable:
+        ranked, complete, generator = [], True, None
+    else:
+        generator = Generator(required, optional, sections, limit, sort, budget_ms)
+        ranked, complete = generator.run()
+
+    summary = {
+        "combinations": generator.combinations if generator else 0,
+        "searched_nodes": generator.nodes if generator else 0,
+        "complete": complete,
+        "unavailable": unavailable,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+    def candidates():
+        for rank, (_, chosen) in enumerate(ranked, start=1):
+            picked = {section.subject for section in chosen}
+            mask = 0
+            for section in chosen:
+                mask |= section.mask
+            yield {
+                "rank": rank,
+                "days": days_of(mask),
+                "gaps": gaps_of(mask),
+                "missing": [s for s in optional if s not in picked],
+                "courses": [row for section in chosen for row in section.courses],
+            }
+
+    return candidates(), summary
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:13
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import django.db.models.functions.comparison
+import timetable.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Course',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(help_text='연도 (예: 2025)')),
+                ('semester', models.PositiveSmallIntegerField(choices=[(1, '1학기'), (2, '2학기')], help_text='학기 (1=1학기, 2=2학기)')),
+                ('subject', models.CharField(help_text='과목명', max_length=100)),
+                ('professor', models.CharField(blank=True, help_text='담당 교수 (선택)', max_length=50)),
+                ('day', models.CharField(choices=[('MON', '월요일'), ('TUE', '화요일'), ('WED', '수요일'), ('THU', '목요일'), ('FRI', '금요일'), ('SAT', '토요일'), ('SUN', '일요일')], help_text='요일 (예: MON, TUE ...)', max_length=3)),
+                ('period', models.PositiveSmallIntegerField(help_text='교시 (1, 2, 3 ...)')),
+                ('classroom', models.CharField(blank=True, help_text='강의실 (선택)', max_length=50)),
+                ('memo', models.CharField(blank=True, help_text='비고 (선택)', max_length=200)),
+                ('subject_jamo', models.CharField(blank=True, default='', max_length=500)),
+                ('subject_choseong', models.CharField(blank=True, db_index=True, default='', max_length=100)),
+                ('professor_jamo', models.CharField(blank=True, default='', max_length=250)),
+                ('professor_choseong', models.CharField(blank=True, db_index=True, default='', max_length=50)),
+            ],
+            options={
+                'ordering': ['year', 'semester', 'day', 'period', 'subject'],
+                'indexes': [timetable.models.TrigramIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.comparison.Cast('subject_jamo', models.TextField()), name='gin_trgm_ops'), name='timetable_subj_jamo_trgm'), timetable.models.TrigramIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.comparison.Cast('professor_jamo', models.TextField()), name='gin_trgm_ops'), name='timetable_prof_jamo_trgm'), timetable.models.TrigramIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.comparison.Cast('subject_choseong', models.TextField()), name='gin_trgm_ops'), name='timetable_subj_cho_trgm'), timetable.models.TrigramIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.comparison.Cast('professor_choseong', models.TextField()), name='gin_trgm_ops'), name='timetable_prof_cho_trgm')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Timetable',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(help_text='연도 (예: 2025)')),
+                ('semester', models.PositiveSmallIntegerField(choices=[(1, '1학기'), (2, '2학기')], help_text='학기 (1=1학기, 2=2학기)')),
+                ('day', models.CharField(choices=[('MON', '월요일'), ('TUE', '화요일'), ('WED', '수요일'), ('THU', '목요일'), ('FRI', '금요일'), ('SAT', '토요일'), ('SUN', '일요일')], help_text='요일 (예: MON, TUE ...)', max_length=3)),
+                ('period', models.PositiveSmallIntegerField(help_text='교시 (1, 2, 3 ...)')),
+                ('subject', models.CharField(help_text='과목명', max_length=100)),
+                ('classroom', models.CharField(blank=True, help_text='강의실 (선택)', max_length=50)),
+                ('memo', models.CharField(blank=True, help_text='비고 (선택)', max_length=200)),
+                ('is_shared', models.BooleanField(default=False)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timetables', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['year', 'semester', 'day', 'period'],
+                'unique_together': {('user', 'year', 'semester', 'day', 'period')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TimetableSemester',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(help_text='연도 (예: 2025)')),
+                ('semester', models.PositiveSmallIntegerField(choices=[(1, '1학기'), (2, '2학기')], help_text='학기 (1=1학기, 2=2학기)')),
+                ('is_shared', models.BooleanField(db_index=True, default=False)),
+                ('cell_count', models.PositiveIntegerField(default=0)),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('occupancy', models.BinaryField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timetable_semesters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['year', 'semester'],
+                'unique_together': {('user', 'year', 'semester')},
+            },
+        ),
+    ]
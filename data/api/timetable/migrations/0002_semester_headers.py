@@ -0,0 +1,74 @@
+"""
+예전 방식 시간표 → 학기 헤더(TimetableSemester)
+
+  - 헤더가 없는 학기 / 더미 row(period=0)가 있는 학기 / 칸에 is_shared=True 가 남은 학기만 대상
+  - 헤더의 is_shared = 기존 헤더 값 or 칸 중 하나라도 공유, cell_count / occupancy 는 칸에서 계산
+  - 옮긴 뒤 더미 row 는 지우고 칸의 is_shared 는 False 로 → 다시 실행해도 바뀌는 것 없음
+되돌릴 때는 아무것도 하지 않는다 (헤더 테이블은 0001 을 되돌릴 때 지워짐)
+"""
+from django.db import migrations
+from django.db.models import Q
+
+from timetable.occupancy import encode, mask_of
+
+
+def forwards(apps, schema_editor):
+    using = schema_editor.connection.alias
+    cells = apps.get_model("timetable", "Timetable").objects.using(using)
+    TimetableSemester = apps.get_model("timetable", "TimetableSemester")
+    headers = TimetableSemester.objects.using(using)
+
+    existing = {
+        (user_id, year, semester): is_shared
+        for user_id, year, semester, is_shared in headers.values_list(
+            "user_id", "year", "semester", "is_shared"
+        )
+    }
+    legacy = set(
+        cells.filter(Q(period=0) | Q(is_shared=True)).values_list("user_id", "year", "semester").distinct()
+    )
+    missing = set(cells.values_list("user_id", "year", "semester").distinct()) - existing.keys()
+    targets = legacy | missing
+    if not targets:
+        return
+
+    state = {key: [existing.get(key, False), []] for key in targets}
+    for user_id, year, semester, day, period, is_shared in cells.filter(
+        user_id__in={key[0] for key in targets}
+    ).values_list("user_id", "year", "semester", "day", "period", "is_shared"):
+        entry = state.get((user_id, year, semester))
+        if entry is None:
+            continue
+        entry[0] = entry[0] or is_shared
+        if period >= 1:
+            entry[1].append((day, period))
+
+    headers.bulk_create(
+        [
+            TimetableSemester(
+                user_id=user_id,
+                year=year,
+                semester=semester,
+                is_shared=shared,
+                cell_count=len(occupied),
+                occupancy=encode(mask_of(occupied)),
+            )
+            for (user_id, year, semester), (shared, occupied) in state.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["user", "year", "semester"],
+        update_fields=["is_shared", "cell_count", "occupancy"],
+    )
+    cells.filter(period=0).delete()
+    cells.filter(is_shared=True).update(is_shared=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("timetable", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
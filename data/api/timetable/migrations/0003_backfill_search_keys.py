@@ -0,0 +1,49 @@
+"""
+검색 키 컬럼(자모 분해 / 초성)이 생기기 전에 들어간 수업만 채운다 (bulk_update)
+되돌릴 때는 아무것도 하지 않는다
+"""
+from django.db import migrations
+from django.db.models import F
+from django.utils import timezone
+
+from curriculum.hangul import search_keys
+
+KEY_FIELDS = ("subject_jamo", "subject_choseong", "professor_jamo", "professor_choseong")
+
+
+def forwards(apps, schema_editor):
+    using = schema_editor.connection.alias
+    Course = apps.get_model("timetable", "Course")
+    CacheGeneration = apps.get_model("curriculum", "CacheGeneration")
+
+    courses = list(
+        Course.objects.using(using)
+        .filter(subject_jamo="")
+        .exclude(subject="")
+        .only("id", "subject", "professor")
+    )
+    if not courses:
+        return
+
+    for course in courses:
+        course.subject_jamo, course.subject_choseong = search_keys(course.subject)
+        course.professor_jamo, course.professor_choseong = search_keys(course.professor)
+    Course.objects.using(using).bulk_update(courses, KEY_FIELDS, batch_size=500)
+
+    # 떠 있는 워커의 수업 검색 색인 무효화 (timetable.search.TIMETABLE_COURSES)
+    CacheGeneration.objects.using(using).get_or_create(key="timetable_courses")
+    CacheGeneration.objects.using(using).filter(key="timetable_courses").update(
+        generation=F("generation") + 1, updated_at=timezone.now()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("curriculum", "0001_initial"),
+        ("timetable", "0002_semester_headers"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
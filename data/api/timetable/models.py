@@ -1,6 +1,30 @@
 # timetable/models.py
 from django.db import models
+from django.db.models.functions import Cast
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex, OpClass
+
+
+class TrigramIndex(GinIndex):
+    """
+    검색 키 컬럼용 pg_trgm GIN 인덱스 (확장은 timetable.search.ensure_trigram_extension 이 migrate 전에 만든다)
+    Postgres 가 아니면 gin / gin_trgm_ops 가 없으므로 같은 이름의 일반 인덱스로 대신 만든다.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+        expressions = [
+            expression.get_source_expressions()[0] if isinstance(expression, OpClass) else expression
+            for expression in self.expressions
+        ]
+        return models.Index(*expressions, name=self.name).create_sql(model, schema_editor, **kwargs)
+
+
+def trigram_index(column, name):
+    # Django 의 contains 는 "col"::text LIKE '%q%' 로 나가므로 같은 식으로 인덱스
+    # (검색 키는 이미 소문자라 UPPER 가 필요 없음)
+    return TrigramIndex(OpClass(Cast(column, models.TextField()), name="gin_trgm_ops"), name=name)
 
 
 class Course(models.Model):
@@ -42,8 +66,21 @@ class Course(models.Model):
     classroom = models.CharField(max_length=50, blank=True, help_text="강의실 (선택)")
     memo = models.CharField(max_length=200, blank=True, help_text="비고 (선택)")
 
+    # 검색 키 (curriculum.hangul): 자모 분해 / 초성 — 저장 시(loaddata 포함) signals 에서 채움
+    subject_jamo = models.CharField(max_length=500, blank=True, default="")
+    subject_choseong = models.CharField(max_length=100, blank=True, default="", db_index=True)
+    professor_jamo = models.CharField(max_length=250, blank=True, default="")
+    professor_choseong = models.CharField(max_length=50, blank=True, default="", db_index=True)
+
     class Meta:
         ordering = ["year", "semester", "day", "period", "subject"]
+        # Postgres: 수업 검색 LIKE '%q%' / similarity 용 (timetable/search.py)
+        indexes = [
+            trigram_index("subject_jamo", "timetable_subj_jamo_trgm"),
+            trigram_index("professor_jamo", "timetable_prof_jamo_trgm"),
+            trigram_index("subject_choseong", "timetable_subj_cho_trgm"),
+            trigram_index("professor_choseong", "timetable_prof_cho_trgm"),
+        ]
 
     def __str__(self):
         return f"[{self.year}-{self.semester}] {self.subject} ({self.day} {self.period}교시)"
@@ -107,6 +144,8 @@ class Timetable(models.Model):
     )
 
     # 🔥 새로 추가된 공유 여부 필드
+    # → 지금은 TimetableSemester.is_shared 가 공유 여부를 가진다.
+    #   이 컬럼은 예전 데이터를 옮길 때(migrations/0002_semester_headers)만 읽는다.
     is_shared = models.BooleanField(default=False)
 
     class Meta:
@@ -116,3 +155,35 @@ class Timetable(models.Model):
 
     def __str__(self):
         return f"[{self.year}-{self.semester}] {self.user.username} / {self.day} {self.period}교시 - {self.subject}"
+
+
+class TimetableSemester(models.Model):
+    """
+    유저의 학기별 시간표 헤더 (예전의 "MON 0교시 더미 row" 대신 학기 존재 표시)
+    → is_shared: 학기 시간표 공유 여부 (토글은 이 row 하나만 UPDATE)
+    → cell_count: 칸 수, updated_at: 마지막으로 바뀐 시각
+    → version: 칸을 바꾸는 모든 쓰기마다 + 1, PATCH 는 클라이언트가 본 version 과 같을 때만 반영
+    → occupancy: 찬 칸 비트마스크 (timetable.occupancy), NULL 이면 다음 쓰기 때 칸에서 계산
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="timetable_semesters",
+    )
+    year = models.PositiveSmallIntegerField(help_text="연도 (예: 2025)")
+    semester = models.PositiveSmallIntegerField(
+        choices=Timetable.SEMESTER_CHOICES,
+        help_text="학기 (1=1학기, 2=2학기)"
+    )
+    is_shared = models.BooleanField(default=False, db_index=True)
+    cell_count = models.PositiveIntegerField(default=0)
+    version = models.PositiveIntegerField(default=0)
+    occupancy = models.BinaryField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('user', 'year', 'semester')
+        ordering = ['year', 'semester']
+
+    def __str__(self):
+        return f"[{self.year}-{self.semester}] {self.user.username} v{self.version}"
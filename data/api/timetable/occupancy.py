@@ -0,0 +1,77 @@
+"""
+학기 시간표 점유 비트마스크 (7요일 × PERIODS교시)
+
+  bit(요일, 교시) = 1 << (요일 번호 * PERIODS + 교시 - 1)
+
+TimetableSemester.occupancy 에 바이트로 저장해 두고 칸을 바꾸는 쓰기마다 같이 갱신한다.
+→ 수업을 넣을 때 "이미 찬 칸인가?" 는 시간표를 읽지 않고 AND 한 번으로 판단
+"""
+from .models import Timetable
+
+PERIODS = 16
+DAYS = tuple(day for day, _ in Timetable.DAY_CHOICES)
+DAY_INDEX = {day: i for i, day in enumerate(DAYS)}
+MASK_BYTES = (len(DAYS) * PERIODS + 7) // 8
+DAY_BITS = (1 << PERIODS) - 1
+
+
+def cell_bit(day, period):
+    """ 범위 밖 칸(더미 period=0 등)은 0 """
+    index = DAY_INDEX.get(day)
+    if index is None or not 1 <= period <= PERIODS:
+        return 0
+    return 1 << (index * PERIODS + period - 1)
+
+
+def day_mask(day):
+    """ 요일 하루 전체 """
+    index = DAY_INDEX.get(day)
+    if index is None:
+        return 0
+    return DAY_BITS << (index * PERIODS)
+
+
+def mask_of(cells):
+    """ [(day, period), ...] → 마스크 """
+    mask = 0
+    for day, period in cells:
+        mask |= cell_bit(day, period)
+    return mask
+
+
+def cells_of(mask):
+    """ 마스크 → [(day, period), ...] (요일, 교시 순) """
+    cells = []
+    while mask:
+        low = mask & -mask
+        index = low.bit_length() - 1
+        cells.append((DAYS[index // PERIODS], index % PERIODS + 1))
+        mask ^= low
+    return cells
+
+
+def days_of(mask):
+    """ 수업이 있는 요일 수 """
+    return sum(1 for i in range(len(DAYS)) if (mask >> (i * PERIODS)) & DAY_BITS)
+
+
+def gaps_of(mask):
+    """ 요일마다 첫 수업 ~ 마지막 수업 사이 빈 교시 수의 합 """
+    gaps = 0
+    for i in range(len(DAYS)):
+        bits = (mask >> (i * PERIODS)) & DAY_BITS
+        if bits:
+            first = (bits & -bits).bit_length()
+            gaps += bits.bit_length() - first + 1 - bin(bits).count("1")
+    return gaps
+
+
+def encode(mask):
+    return mask.to_bytes(MASK_BYTES, "big")
+
+
+def decode(value):
+    """ DB 값 → 마스크 (아직 계산 안 된 학기면 None) """
+    if value is None:
+        return None
+    return int.from_bytes(bytes(value), "big")
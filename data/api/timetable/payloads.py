@@ -0,0 +1,52 @@
+"""
+학기 시간표 GET 응답 캐시
+
+  - 키: (user, year, semester), 값: (ETag, 직렬화된 JSON 바이트)
+  - ETag = 학기 헤더의 (id, version, updated_at) → 칸 쓰기 / 공유 토글마다 바뀐다
+  - GET 은 헤더 row 하나만 읽고: If-None-Match 가 같으면 304, 캐시 ETag 가 같으면 캐시 그대로
+  - 쓰기 경로(cells.save_semester, 공유 토글)에서 바로 지운다.
+    다른 워커 캐시에 남은 값은 ETag 가 달라서 쓰이지 않는다 (whatif 처럼 Django cache 사용)
+"""
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Timetable
+
+CACHE_PREFIX = "timetable:semester:"
+CACHE_TTL = 60 * 60
+
+CELL_FIELDS = ("day", "period", "subject", "classroom", "memo")
+
+
+def cache_key(user_id, year, semester):
+    return f"{CACHE_PREFIX}{user_id}:{year}:{semester}"
+
+
+def semester_etag(header):
+    return f'"{header.pk}-{header.version}-{int(header.updated_at.timestamp() * 1_000_000)}"'
+
+
+def invalidate(user_id, year, semester):
+    cache.delete(cache_key(user_id, year, semester))
+
+
+def semester_payload(header, etag):
+    """ → 직렬화된 GET 응답 본문 (캐시에 없거나 ETag 가 다르면 만들어서 저장) """
+    key = cache_key(header.user_id, header.year, header.semester)
+    cached = cache.get(key)
+    if cached is not None and cached[0] == etag:
+        return cached[1]
+
+    cells = list(
+        Timetable.objects.filter(user_id=header.user_id, year=header.year, semester=header.semester)
+        .order_by("day", "period", "id")
+        .values(*CELL_FIELDS)
+    )
+    body = json.dumps(
+        {"timetable": cells, "version": header.version, "is_shared": header.is_shared},
+        cls=DjangoJSONEncoder,
+    ).encode("utf-8")
+    cache.set(key, (etag, body), CACHE_TTL)
+    return body
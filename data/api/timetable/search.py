@@ -0,0 +1,173 @@
+"""
+시간표 수업 검색 (CourseSearchAPI)
+
+  - Postgres: 검색 키 컬럼(자모 분해 / 초성)에 pg_trgm GIN 인덱스 → LIKE '%q%' 도 인덱스를 타고,
+    similarity 로 순위를 매긴다. 인덱스는 Course.Meta.indexes (migration), 확장은 migrate 전(pre_migrate)에 만든다.
+  - 그 외 (SQLite, 로컬): curriculum.search.HangulIndex 로 (연도, 학기)별 메모리 역색인
+    → 수업 데이터가 바뀌면 generation 으로 무효화
+
+질의가 자음만("ㄷㅇㅌ")이면 초성 컬럼, 아니면 자모로 풀어서("데잍" → ㄷㅔㅇㅣㅌ) 자모 컬럼을 찾는다.
+검색 키는 저장 시 signals 에서 채우고, 그 전에 들어간 행은 migrations/0003_backfill_search_keys 가 채운다.
+
+공통: 순위 = 과목명 완전 일치 > 교수명 완전 일치 > 과목명 앞부분 > 교수명 앞부분 > 중간 일치
+      limit + cursor(다음 오프셋을 감싼 문자열), values() 로 필요한 컬럼만 조회
+      (limit / cursor 를 안 보낸 요청은 예전처럼 전부 → 화면의 검색 모달은 한 번에 다 받는다)
+"""
+import base64
+
+from django.db import connection, connections
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+
+from curriculum.generations import GENERATION_MAX_AGE, get_generation
+from curriculum.hangul import decompose, is_choseong_query
+from curriculum.search import HangulIndex, normalize
+
+from .models import Course
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 100
+
+# curriculum.models.CacheGeneration key (timetable.Course 저장/삭제 시 증가)
+TIMETABLE_COURSES = "timetable_courses"
+
+SEARCH_FIELDS = ("id", "year", "semester", "subject", "professor", "day", "period", "classroom")
+KEY_FIELDS = ("subject_jamo", "subject_choseong", "professor_jamo", "professor_choseong")
+
+
+def query_columns(q):
+    """ 질의 → (과목명 키 컬럼, 교수명 키 컬럼, 비교할 키) """
+    q = normalize(q)
+    if is_choseong_query(q):
+        return "subject_choseong", "professor_choseong", q
+    return "subject_jamo", "professor_jamo", decompose(q)
+
+
+# =========================================
+#  cursor (불투명 문자열 ↔ 오프셋)
+# =========================================
+def encode_cursor(offset):
+    return base64.urlsafe_b64encode(str(offset).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """ 잘못된 cursor 면 ValueError """
+    if not cursor:
+        return 0
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        offset = int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(cursor)
+    if offset < 0:
+        raise ValueError(cursor)
+    return offset
+
+
+# =========================================
+#  Postgres: pg_trgm
+# =========================================
+def use_trigram():
+    return connection.vendor == "postgresql"
+
+
+def ensure_trigram_extension(using="default", **kwargs):
+    """
+    pre_migrate 에서 호출 → Course.Meta.indexes 의 gin_trgm_ops 인덱스를 만들기 전에 pg_trgm 준비.
+    Postgres 가 아니면 아무것도 안 함 (여러 번 실행해도 안전)
+    """
+    conn = connections[using]
+    if conn.vendor != "postgresql":
+        return
+
+    with conn.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+
+def _search_trigram(qs, q, offset, stop):
+    from django.contrib.postgres.search import TrigramSimilarity
+
+    subject_col, professor_col, key = query_columns(q)
+    qs = (
+        qs.filter(Q(**{f"{subject_col}__contains": key}) | Q(**{f"{professor_col}__contains": key}))
+        .annotate(
+            grade=Case(
+                When(**{subject_col: key}, then=Value(0)),
+                When(**{professor_col: key}, then=Value(1)),
+                When(**{f"{subject_col}__startswith": key}, then=Value(2)),
+                When(**{f"{professor_col}__startswith": key}, then=Value(3)),
+                default=Value(4),
+                output_field=IntegerField(),
+            ),
+            similarity=Greatest(
+                TrigramSimilarity(subject_col, key),
+                TrigramSimilarity(professor_col, key),
+            ),
+        )
+        .order_by("grade", "-similarity", "subject", "id")
+    )
+    return list(qs.values(*SEARCH_FIELDS)[offset:stop])
+
+
+# =========================================
+#  그 외: 메모리 n-gram 역색인
+# =========================================
+class SemesterSearchIndex:
+    __slots__ = ("generation", "rows", "index")
+
+    def __init__(self, generation, rows):
+        """ rows: SEARCH_FIELDS + KEY_FIELDS dict (검색 키는 색인에만 쓰고 응답에서는 뺀다) """
+        rows = tuple(rows)
+        self.generation = generation
+        self.rows = tuple({f: row[f] for f in SEARCH_FIELDS} for row in rows)
+        self.index = HangulIndex(
+            [(row["subject_jamo"], row["professor_jamo"]) for row in rows],
+            [(row["subject_choseong"], row["professor_choseong"]) for row in rows],
+        )
+
+
+# (year, semester) → SemesterSearchIndex
+_indexes = {}
+
+
+def get_semester_index(year, semester):
+    generation = get_generation(TIMETABLE_COURSES, max_age=GENERATION_MAX_AGE)
+    index = _indexes.get((year, semester))
+    if index is None or index.generation != generation:
+        rows = (
+            Course.objects.filter(year=year, semester=semester)
+            .order_by("id")
+            .values(*SEARCH_FIELDS, *KEY_FIELDS)
+        )
+        index = SemesterSearchIndex(generation, rows)
+        _indexes[(year, semester)] = index
+    return index
+
+
+def _search_ngram(year, semester, q, offset, stop):
+    index = get_semester_index(year, semester)
+    ids = index.index.search(q, len(index.rows) if stop is None else stop)
+    return [index.rows[i] for i in ids[offset:]]
+
+
+# =========================================
+#  진입점
+# =========================================
+def search_courses(year, semester, q, offset=0, limit=None):
+    """ → (수업 dict 리스트, 다음 cursor 또는 None), limit=None 이면 offset 부터 전부 """
+    q = q.strip()
+    # 다음 페이지가 있는지 보려고 하나 더 읽는다
+    stop = None if limit is None else offset + limit + 1
+
+    if not q:
+        qs = Course.objects.filter(year=year, semester=semester).order_by("day", "period", "subject", "id")
+        rows = list(qs.values(*SEARCH_FIELDS)[offset:stop])
+    elif use_trigram():
+        rows = _search_trigram(Course.objects.filter(year=year, semester=semester), q, offset, stop)
+    else:
+        rows = _search_ngram(year, semester, q, offset, stop)
+
+    if limit is None:
+        return rows, None
+    next_cursor = encode_cursor(offset + limit) if len(rows) > limit else None
+    return rows[:limit], next_cursor
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from curriculum.generations import bump_generation
+from curriculum.hangul import search_keys
+
+from .models import Course
+from .search import TIMETABLE_COURSES
+
+
+# 초성 / 자모 검색 키는 저장 시점에 미리 계산 (loaddata 의 raw 저장도 pre_save 는 탄다)
+@receiver(pre_save, sender=Course)
+def fill_course_search_keys(sender, instance, **kwargs):
+    instance.subject_jamo, instance.subject_choseong = search_keys(instance.subject)
+    instance.professor_jamo, instance.professor_choseong = search_keys(instance.professor)
+
+
+# 개설 수업이 바뀌면 (loaddata 포함) 모든 워커의 검색 인덱스 무효화
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course_search(sender, **kwargs):
+    bump_generation(TIMETABLE_COURSES)
@@ -0,0 +1,619 @@
+import json
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+
+from . import search
+from .models import Course, Timetable, TimetableSemester
+from .occupancy import decode, mask_of
+
+
+class TimetableAPITestCase(TestCase):
+    """ 로그인한 유저 1명 + JSON 요청 헬퍼 """
+
+    year = 2025
+    semester = 1
+
+    def setUp(self):
+        self.user = User.objects.create_user("student", password="pw")
+        self.client.force_login(self.user)
+
+    def send(self, method, url, body):
+        return getattr(self.client, method)(url, json.dumps(body), content_type="application/json")
+
+    def patch_cells(self, **body):
+        return self.send("patch", "/api/timetable/", {"year": self.year, "semester": self.semester, **body})
+
+    def cells(self, user=None, year=None, semester=None):
+        """ 저장된 칸 → [(day, period, subject), ...] """
+        return sorted(
+            Timetable.objects.filter(
+                user=user or self.user,
+                year=year or self.year,
+                semester=semester or self.semester,
+            ).values_list("day", "period", "subject")
+        )
+
+    def course(self, subject, day, period, **fields):
+        return Course.objects.create(
+            year=self.year, semester=self.semester, subject=subject, day=day, period=period, **fields
+        )
+
+    def header(self, user=None, year=None, semester=None):
+        return TimetableSemester.objects.get(
+            user=user or self.user, year=year or self.year, semester=semester or self.semester
+        )
+
+
+# =========================================
+#  PATCH (칸 단위 변경 + 낙관적 잠금) / POST (학기 통째로 다시 쓰기)
+# =========================================
+class CellPatchTests(TimetableAPITestCase):
+    def test_patch_bumps_version(self):
+        response = self.patch_cells(version=0, upsert=[
+            {"day": "MON", "period": 1, "subject": "A"},
+            {"day": "TUE", "period": 2, "subject": "B"},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["version"], 1)
+
+        response = self.patch_cells(version=1, delete=[{"day": "TUE", "period": 2}])
+        self.assertEqual(response.json()["version"], 2)
+        self.assertEqual(self.cells(), [("MON", 1, "A")])
+        self.assertEqual(self.header().cell_count, 1)
+
+    def test_stale_version_is_rejected(self):
+        self.patch_cells(version=0, upsert=[{"day": "MON", "period": 1, "subject": "A"}])
+
+        # 다른 탭이 먼저 고친 뒤 예전 version 으로 보냄
+        response = self.patch_cells(version=0, upsert=[{"day": "MON", "period": 1, "subject": "X"}])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["version"], 1)
+        self.assertEqual(self.cells(), [("MON", 1, "A")])
+
+    def test_version_is_required(self):
+        response = self.patch_cells(upsert=[{"day": "MON", "period": 1, "subject": "A"}])
+        self.assertEqual(response.status_code, 400)
+
+    def test_replace_false_reports_occupied_cells(self):
+        self.patch_cells(version=0, upsert=[{"day": "MON", "period": 1, "subject": "A"}])
+
+        response = self.patch_cells(
+            version=1, replace=False, upsert=[{"day": "MON", "period": 1, "subject": "B"}]
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["conflicts"], [{"day": "MON", "period": 1, "subject": "A"}])
+
+    def test_post_rewrites_semester(self):
+        self.patch_cells(version=0, upsert=[{"day": "MON", "period": 1, "subject": "A"}])
+
+        response = self.send("post", "/api/timetable/", {
+            "year": self.year,
+            "semester": self.semester,
+            "timetable": [
+                {"day": "WED", "period": 3, "subject": "C"},
+                {"day": "FRI", "period": 4, "subject": "D"},
+            ],
+        })
+        data = response.json()
+        self.assertEqual(data["version"], 2)
+        self.assertEqual(len(data["created_ids"]), 2)
+        self.assertEqual(self.cells(), [("FRI", 4, "D"), ("WED", 3, "C")])
+        self.assertEqual(self.header().cell_count, 2)
+
+        # 예전 version 으로 PATCH 하면 409
+        response = self.patch_cells(version=1, upsert=[{"day": "MON", "period": 1, "subject": "late"}])
+        self.assertEqual(response.status_code, 409)
+
+    def test_post_rejects_bad_entries_before_writing(self):
+        self.patch_cells(version=0, upsert=[{"day": "MON", "period": 1, "subject": "A"}])
+
+        for entry in (
+            "MON",
+            {"period": 2, "subject": "no day"},
+            {"day": "MON", "subject": "no period"},
+            {"day": "MON", "period": "two", "subject": "x"},
+            {"day": "MON", "period": 2.5, "subject": "x"},
+            {"day": "XXX", "period": 2, "subject": "x"},
+            {"day": "MON", "period": 17, "subject": "x"},
+            {"day": "MON", "period": 0, "subject": "dummy"},
+        ):
+            response = self.send("post", "/api/timetable/", {
+                "year": self.year,
+                "semester": self.semester,
+                "timetable": [{"day": "TUE", "period": 1, "subject": "ok"}, entry],
+            })
+            self.assertEqual(response.status_code, 400, entry)
+
+        self.assertEqual(self.cells(), [("MON", 1, "A")])
+        self.assertEqual(self.header().version, 1)
+
+    def test_patch_replace_must_be_boolean(self):
+        self.patch_cells(version=0, upsert=[{"day": "MON", "period": 1, "subject": "A"}])
+
+        response = self.patch_cells(
+            version=1, replace="false", upsert=[{"day": "MON", "period": 1, "subject": "B"}]
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.cells(), [("MON", 1, "A")])
+
+
+# =========================================
+#  수업 추가 (충돌 검사 / replace) + 일괄 충돌 검사
+# =========================================
+class AddCourseTests(TimetableAPITestCase):
+    def add(self, course, **body):
+        return self.send("post", "/api/timetable/add-course/", {
+            "course_id": course.id, "year": self.year, "semester": self.semester, **body,
+        })
+
+    def test_add_into_free_cell(self):
+        response = self.add(self.course("데이터구조론", "MON", 2, classroom="101호"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["created"])
+        self.assertEqual(response.json()["version"], 1)
+        self.assertEqual(self.cells(), [("MON", 2, "데이터구조론")])
+
+    def test_occupied_cell_is_conflict(self):
+        self.add(self.course("데이터구조론", "MON", 2))
+
+        response = self.add(self.course("운영체제", "MON", 2))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["conflicts"], [{"day": "MON", "period": 2, "subject": "데이터구조론"}])
+        self.assertEqual(response.json()["version"], 1)
+        self.assertEqual(self.cells(), [("MON", 2, "데이터구조론")])
+
+    def test_replace_overwrites_cell(self):
+        self.add(self.course("데이터구조론", "MON", 2))
+
+        response = self.add(self.course("운영체제", "MON", 2), replace=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["created"])
+        self.assertEqual(response.json()["version"], 2)
+        self.assertEqual(self.cells(), [("MON", 2, "운영체제")])
+        self.assertEqual(self.header().cell_count, 1)
+
+    def test_conflict_check_lists_clashes(self):
+        self.add(self.course("데이터구조론", "MON", 2))
+        clash = self.course("운영체제", "MON", 2)
+        first = self.course("암호학", "TUE", 3)
+        second = self.course("컴파일러", "TUE", 3)
+
+        response = self.client.get("/api/timetable/conflicts/", {
+            "year": self.year,
+            "semester": self.semester,
+            "course_ids": f"{clash.id},{first.id},{second.id},99999",
+        })
+        data = response.json()
+        self.assertEqual(data["free"], [first.id])
+        self.assertEqual(data["unknown"], [99999])
+        self.assertEqual(data["conflicts"], [
+            {"course_id": clash.id, "day": "MON", "period": 2, "subject": "데이터구조론"},
+            {"course_id": second.id, "day": "TUE", "period": 3, "subject": "암호학", "with_course_id": first.id},
+        ])
+
+
+# =========================================
+#  시간표 자동 생성 (순위 / 막은 칸)
+# =========================================
+class GenerateTimetableTests(TimetableAPITestCase):
+    def setUp(self):
+        super().setUp()
+        # 자료구조: 월1 / 화1 분반, 운영체제: 월5 / 수1 분반
+        self.course("자료구조", "MON", 1, professor="A")
+        self.course("자료구조", "TUE", 1, professor="B")
+        self.course("운영체제", "MON", 5, professor="C")
+        self.course("운영체제", "WED", 1, professor="D")
+
+    def generate(self, **body):
+        response = self.send("post", "/api/timetable/generate/", {
+            "year": self.year, "semester": self.semester, "required": ["자료구조", "운영체제"], **body,
+        })
+        self.assertEqual(response.status_code, 200)
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        return lines[:-1], lines[-1]["summary"]
+
+    @staticmethod
+    def slots(candidate):
+        return sorted((row["day"], row["period"]) for row in candidate["courses"])
+
+    def test_fewest_days_first(self):
+        candidates, summary = self.generate()
+        self.assertTrue(summary["complete"])
+        self.assertEqual([c["rank"] for c in candidates], [1, 2, 3, 4])
+        # 월1 + 월5 → 하루, 공강 3
+        self.assertEqual(self.slots(candidates[0]), [("MON", 1), ("MON", 5)])
+        self.assertEqual((candidates[0]["days"], candidates[0]["gaps"]), (1, 3))
+        self.assertTrue(all(c["days"] == 2 for c in candidates[1:]))
+
+    def test_sort_by_gaps(self):
+        candidates, _ = self.generate(sort="gaps")
+        self.assertEqual([c["gaps"] for c in candidates], [0, 0, 0, 3])
+
+    def test_blocked_day_and_cell(self):
+        candidates, _ = self.generate(blocked=[{"day": "MON"}])
+        self.assertEqual([self.slots(c) for c in candidates], [[("TUE", 1), ("WED", 1)]])
+
+        candidates, _ = self.generate(blocked=[{"day": "WED", "period": 1}, {"day": "TUE", "period": 1}])
+        self.assertEqual([self.slots(c) for c in candidates], [[("MON", 1), ("MON", 5)]])
+
+    def test_required_subject_fully_blocked(self):
+        candidates, summary = self.generate(blocked=[{"day": "MON", "period": 5}, {"day": "WED"}])
+        self.assertEqual(candidates, [])
+        self.assertEqual(summary["unavailable"], ["운영체제"])
+
+    def test_missing_optional_ranks_last(self):
+        # 컴파일러(월1)는 자료구조 월1 분반과 겹친다
+        self.course("컴파일러", "MON", 1, professor="E")
+
+        candidates, _ = self.generate(optional=["컴파일러"])
+        self.assertEqual(candidates[0]["missing"], [])
+        self.assertEqual(self.slots(candidates[0]), [("MON", 1), ("MON", 5), ("TUE", 1)])
+        self.assertEqual(candidates[-1]["missing"], ["컴파일러"])
+
+    def test_invalid_blocked(self):
+        response = self.send("post", "/api/timetable/generate/", {
+            "year": self.year, "semester": self.semester, "required": ["자료구조"], "blocked": [{"day": "XX"}],
+        })
+        self.assertEqual(response.status_code, 400)
+
+
+# =========================================
+#  학기 GET: ETag / 304, 쓰기 후 무효화
+# =========================================
+class SemesterETagTests(TimetableAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.patch_cells(version=0, upsert=[{"day": "MON", "period": 1, "subject": "A"}])
+
+    def get(self, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get("/api/timetable/", {"year": self.year, "semester": self.semester}, **headers)
+
+    def test_unchanged_semester_is_304(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["timetable"][0]["subject"], "A")
+        etag = response["ETag"]
+
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_write_changes_etag(self):
+        etag = self.get()["ETag"]
+        self.patch_cells(version=1, upsert=[{"day": "TUE", "period": 2, "subject": "B"}])
+
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()["timetable"]), 2)
+        self.assertEqual(response.json()["version"], 2)
+
+    def test_share_toggle_changes_etag(self):
+        etag = self.get()["ETag"]
+        self.send("post", "/api/timetable/share/", {"year": self.year, "semester": self.semester, "is_shared": True})
+
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["is_shared"])
+
+    def test_missing_semester_is_404(self):
+        response = self.client.get("/api/timetable/", {"year": 2030, "semester": 2})
+        self.assertEqual(response.status_code, 404)
+
+
+# =========================================
+#  수업 여러 개 한 번에 추가
+# =========================================
+class AddCoursesTests(TimetableAPITestCase):
+    def add_many(self, courses, **body):
+        response = self.send("post", "/api/timetable/add-courses/", {
+            "course_ids": [c if isinstance(c, int) else c.id for c in courses],
+            "year": self.year,
+            "semester": self.semester,
+            **body,
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def statuses(self, data):
+        return [result["status"] for result in data["results"]]
+
+    def test_results_in_request_order(self):
+        existing = self.course("운영체제", "WED", 1)
+        self.add_many([existing])
+
+        first = self.course("데이터구조론", "MON", 2)
+        same_cell = self.course("암호학", "MON", 2)
+        clash = self.course("컴파일러", "WED", 1)
+        free = self.course("네트워크", "FRI", 2)
+
+        data = self.add_many([first, same_cell, clash, free, 99999])
+        self.assertEqual(self.statuses(data), ["created", "conflict", "conflict", "created", "not_found"])
+        self.assertEqual(data["results"][1]["with_course_id"], first.id)
+        self.assertEqual(data["results"][2]["subject"], "운영체제")
+        self.assertEqual(data["version"], 2)
+        self.assertEqual(self.cells(), [("FRI", 2, "네트워크"), ("MON", 2, "데이터구조론"), ("WED", 1, "운영체제")])
+        self.assertEqual(self.header().cell_count, 3)
+
+    def test_replace_overwrites_other_course(self):
+        self.add_many([self.course("운영체제", "WED", 1)])
+
+        data = self.add_many([self.course("컴파일러", "WED", 1)], replace=True)
+        self.assertEqual(self.statuses(data), ["updated"])
+        self.assertEqual(self.cells(), [("WED", 1, "컴파일러")])
+
+    def test_same_course_is_already_added(self):
+        course = self.course("운영체제", "WED", 1, classroom="101호")
+        self.add_many([course])
+
+        for replace in (False, True):
+            data = self.add_many([course], replace=replace)
+            self.assertEqual(self.statuses(data), ["already_added"])
+            # 다시 쓰지 않았으므로 버전도 그대로
+            self.assertEqual(data["version"], 1)
+
+    def test_replace_must_be_boolean(self):
+        self.add_many([self.course("운영체제", "WED", 1)])
+        clash = self.course("컴파일러", "WED", 1)
+
+        for url, body in (
+            ("/api/timetable/add-courses/", {"course_ids": [clash.id]}),
+            ("/api/timetable/add-course/", {"course_id": clash.id}),
+        ):
+            response = self.send("post", url, {
+                "year": self.year, "semester": self.semester, "replace": "false", **body,
+            })
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.cells(), [("WED", 1, "운영체제")])
+
+    def test_limits(self):
+        response = self.send("post", "/api/timetable/add-courses/", {
+            "course_ids": [], "year": self.year, "semester": self.semester,
+        })
+        self.assertEqual(response.status_code, 400)
+
+        response = self.send("post", "/api/timetable/add-courses/", {
+            "course_ids": list(range(1, 52)), "year": self.year, "semester": self.semester,
+        })
+        self.assertEqual(response.status_code, 400)
+
+
+# =========================================
+#  공유된 시간표 복제 (skip / overwrite / fail)
+# =========================================
+class CloneTimetableTests(TimetableAPITestCase):
+    def setUp(self):
+        super().setUp()
+        # 선배의 2024-1 학기: 월1 A, 화2 B, 수3 C
+        self.senior = User.objects.create_user("senior", password="pw")
+        self.client.force_login(self.senior)
+        self.send("patch", "/api/timetable/", {"year": 2024, "semester": 1, "version": 0, "upsert": [
+            {"day": "MON", "period": 1, "subject": "A"},
+            {"day": "TUE", "period": 2, "subject": "B"},
+            {"day": "WED", "period": 3, "subject": "C"},
+        ]})
+        self.client.force_login(self.user)
+
+        # 내 학기: 월1 은 이미 찼음
+        self.patch_cells(version=0, upsert=[{"day": "MON", "period": 1, "subject": "mine"}])
+
+    def share(self):
+        TimetableSemester.objects.filter(user=self.senior, year=2024, semester=1).update(is_shared=True)
+
+    def clone(self, policy=None, year=None, semester=None):
+        body = {
+            "source": {"user_id": self.senior.id, "year": 2024, "semester": 1},
+            "year": year or self.year,
+            "semester": semester or self.semester,
+        }
+        if policy:
+            body["on_conflict"] = policy
+        return self.send("post", "/api/timetable/clone/", body)
+
+    def test_unshared_semester_is_404(self):
+        self.assertEqual(self.clone().status_code, 404)
+
+    def test_skip_keeps_my_cells(self):
+        self.share()
+        data = self.clone("skip").json()
+        self.assertEqual((data["copied"], data["skipped"], data["overwritten"]), (2, 1, 0))
+        self.assertEqual(data["version"], 2)
+        self.assertEqual(self.cells(), [("MON", 1, "mine"), ("TUE", 2, "B"), ("WED", 3, "C")])
+        self.assertEqual(self.header().cell_count, 3)
+
+    def test_overwrite_counts_overwritten_cells_separately(self):
+        self.share()
+        data = self.clone("overwrite").json()
+        self.assertEqual((data["copied"], data["skipped"], data["overwritten"]), (2, 0, 1))
+        self.assertEqual(self.cells(), [("MON", 1, "A"), ("TUE", 2, "B"), ("WED", 3, "C")])
+        self.assertEqual(self.header().cell_count, 3)
+
+    def test_fail_writes_nothing(self):
+        self.share()
+        response = self.clone("fail")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["conflicts"], [{"day": "MON", "period": 1, "subject": "mine"}])
+        self.assertEqual(self.cells(), [("MON", 1, "mine")])
+        self.assertEqual(self.header().version, 1)
+
+    def test_clone_into_empty_semester(self):
+        self.share()
+        data = self.clone("fail", year=2026, semester=2).json()
+        self.assertEqual((data["copied"], data["skipped"], data["overwritten"]), (3, 0, 0))
+        self.assertEqual(self.header(year=2026, semester=2).cell_count, 3)
+        # 복제한 칸은 공유되지 않은 상태로 들어온다
+        self.assertFalse(Timetable.objects.filter(user=self.user, year=2026, is_shared=True).exists())
+
+    def test_invalid_policy(self):
+        self.share()
+        self.assertEqual(self.clone("merge").status_code, 400)
+
+
+# =========================================
+#  수업 검색 (limit / cursor / 초성·자모)
+# =========================================
+class CourseSearchTests(TimetableAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(60):
+            self.course(f"과목{i:02d}", "MON", i % 16 + 1)
+
+    def search(self, **params):
+        response = self.client.get("/api/timetable/courses/", {"year": self.year, "semester": self.semester, **params})
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_without_limit_returns_everything(self):
+        response = self.search()
+        self.assertEqual(len(response.json()), 60)
+        self.assertNotIn("X-Next-Cursor", response)
+
+        response = self.search(q="과목")
+        self.assertEqual(len(response.json()), 60)
+        self.assertNotIn("X-Next-Cursor", response)
+
+    def test_cursor_pages_cover_all_rows(self):
+        seen = []
+        params = {"q": "과목", "limit": 25}
+        while True:
+            response = self.search(**params)
+            seen += [row["id"] for row in response.json()]
+            if "X-Next-Cursor" not in response:
+                break
+            params["cursor"] = response["X-Next-Cursor"]
+        self.assertEqual(len(seen), 60)
+        self.assertEqual(len(set(seen)), 60)
+
+    def test_bad_cursor(self):
+        response = self.client.get("/api/timetable/courses/", {
+            "year": self.year, "semester": self.semester, "cursor": "!!",
+        })
+        self.assertEqual(response.status_code, 400)
+
+
+
+class HangulCourseSearchTests(TimetableAPITestCase):
+    def setUp(self):
+        super().setUp()
+        search._indexes.clear()
+        self.course("데이터구조", "MON", 1, professor="김철수")
+        self.course("자료구조", "TUE", 2, professor="데이터")
+        self.course("고급데이터분석", "WED", 3, professor="이영희")
+        self.course("C언어", "THU", 4, professor="박민수")
+
+    def subjects(self, q):
+        response = self.client.get("/api/timetable/courses/", {"year": self.year, "semester": self.semester, "q": q})
+        self.assertEqual(response.status_code, 200)
+        return [row["subject"] for row in response.json()]
+
+    def test_choseong_matches_subject_and_professor(self):
+        # 교수명 완전 일치 > 과목명 앞부분 > 중간 일치
+        self.assertEqual(self.subjects("ㄷㅇㅌ"), ["자료구조", "데이터구조", "고급데이터분석"])
+        self.assertEqual(self.subjects("ㄱㅊㅅ"), ["데이터구조"])
+
+    def test_partial_last_syllable(self):
+        self.assertEqual(self.subjects("데잍"), ["데이터구조", "자료구조", "고급데이터분석"])
+        self.assertEqual(self.subjects("c어"), ["C언어"])
+
+
+# =========================================
+#  데이터 migration: 예전 방식 학기 → 학기 헤더
+# =========================================
+class SemesterHeaderMigrationTests(TransactionTestCase):
+    before = [("timetable", "0001_initial")]
+    after = [("timetable", "0002_semester_headers")]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        # 다른 테스트를 위해 최신 migration 으로 되돌린다
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def snapshot(self):
+        headers = sorted(
+            TimetableSemester.objects.values_list(
+                "id", "user_id", "year", "semester", "is_shared", "cell_count", "updated_at"
+            )
+        )
+        masks = sorted(
+            (h.user_id, h.year, h.semester, decode(h.occupancy)) for h in TimetableSemester.objects.all()
+        )
+        cells = sorted(Timetable.objects.values_list("user_id", "year", "semester", "day", "period", "is_shared"))
+        return headers, masks, cells
+
+    def test_legacy_rows_get_one_header_each(self):
+        apps = self.migrate(self.before)
+        OldTimetable = apps.get_model("timetable", "Timetable")
+        OldSemester = apps.get_model("timetable", "TimetableSemester")
+        senior = User.objects.create_user("senior", password="pw")
+        junior = User.objects.create_user("junior", password="pw")
+
+        def cell(user, year, semester, day, period, is_shared=False):
+            OldTimetable.objects.create(
+                user_id=user.id, year=year, semester=semester, day=day, period=period,
+                subject=f"{day}{period}", is_shared=is_shared,
+            )
+
+        # 공유된 학기: 더미 row(period=0) + 칸 두 개, 공유 여부는 칸마다
+        cell(senior, 2024, 1, "MON", 0, is_shared=True)
+        cell(senior, 2024, 1, "MON", 1, is_shared=True)
+        cell(senior, 2024, 1, "TUE", 2, is_shared=True)
+        # 더미 row 만 있는 빈 학기
+        cell(senior, 2024, 2, "MON", 0)
+        # 헤더 없이 칸만 있는 학기
+        cell(junior, 2025, 1, "WED", 3)
+        # 이미 헤더가 있는 학기 (대상 아님)
+        OldSemester.objects.create(user_id=junior.id, year=2025, semester=2, cell_count=1)
+        cell(junior, 2025, 2, "FRI", 4)
+
+        self.migrate(self.after)
+        headers = {
+            (h.user_id, h.year, h.semester): h for h in TimetableSemester.objects.all()
+        }
+        self.assertEqual(sorted(headers), [
+            (senior.id, 2024, 1), (senior.id, 2024, 2), (junior.id, 2025, 1), (junior.id, 2025, 2),
+        ])
+
+        shared = headers[(senior.id, 2024, 1)]
+        self.assertTrue(shared.is_shared)
+        self.assertEqual(shared.cell_count, 2)
+        self.assertEqual(decode(shared.occupancy), mask_of([("MON", 1), ("TUE", 2)]))
+
+        empty = headers[(senior.id, 2024, 2)]
+        self.assertEqual((empty.is_shared, empty.cell_count, decode(empty.occupancy)), (False, 0, 0))
+        self.assertEqual(headers[(junior.id, 2025, 1)].cell_count, 1)
+
+        # 더미 row / 칸별 공유 표시는 남지 않는다
+        self.assertFalse(Timetable.objects.filter(period=0).exists())
+        self.assertFalse(Timetable.objects.filter(is_shared=True).exists())
+
+        # 다시 실행해도 바뀌는 것 없음
+        before = self.snapshot()
+        self.migrate(self.before)
+        self.migrate(self.after)
+        self.assertEqual(self.snapshot(), before)
+
+
+class SearchKeyMigrationTests(TransactionTestCase):
+    def tearDown(self):
+        MigrationExecutor(connection).migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_backfill_search_keys(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate([("timetable", "0002_semester_headers")])
+        apps = executor.loader.project_state([("timetable", "0002_semester_headers")]).apps
+        apps.get_model("timetable", "Course").objects.create(
+            year=2025, semester=1, subject="운영체제", professor="김교수", day="MON", period=1,
+        )
+
+        MigrationExecutor(connection).migrate([("timetable", "0003_backfill_search_keys")])
+        course = Course.objects.get()
+        self.assertEqual((course.subject_choseong, course.professor_choseong), ("ㅇㅇㅊㅈ", "ㄱㄱㅅ"))
+        self.assertTrue(course.subject_jamo.startswith("ㅇㅜㄴㅇㅕㅇ"))
@@ -5,6 +5,10 @@ from .views import (
     SemesterListAPI,
     CourseSearchAPI,
     AddCourseAPI,
+    AddCoursesAPI,
+    CloneTimetableAPI,
+    ConflictCheckAPI,
+    GenerateTimetableAPI,
     TimetableShareToggleAPI,
     timetable_share_status,
 )
@@ -14,6 +18,10 @@ urlpatterns = [
     path("semesters/", SemesterListAPI.as_view(), name="timetable-semesters"),
     path("courses/", CourseSearchAPI.as_view(), name="timetable-courses"),
     path("add-course/", AddCourseAPI.as_view(), name="timetable-add-course"),
+    path("add-courses/", AddCoursesAPI.as_view(), name="timetable-add-courses"),
+    path("conflicts/", ConflictCheckAPI.as_view(), name="timetable-conflicts"),
+    path("clone/", CloneTimetableAPI.as_view(), name="timetable-clone"),
+    path("generate/", GenerateTimetableAPI.as_view(), name="timetable-generate"),
     path("share/", TimetableShareToggleAPI.as_view(), name="timetable-share"),
     path("share-status/", timetable_share_status, name="timetable-share-status"),
 ]
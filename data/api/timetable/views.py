@@ -1,10 +1,28 @@
-from django.http import JsonResponse, HttpResponseNotAllowed
+from django.http import HttpResponse, JsonResponse, HttpResponseNotAllowed, StreamingHttpResponse
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from django.db.models import Count
-
-from .models import Timetable, Course
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+
+from .cells import (
+    CELL_FIELDS,
+    CLONE_POLICIES,
+    CellConflict,
+    VersionConflict,
+    add_course_cell,
+    add_course_cells,
+    apply_cell_patch,
+    check_courses,
+    clone_semester,
+    parse_cell_key,
+    replace_semester,
+)
+from . import generator
+from .models import Timetable, TimetableSemester, Course
+from .occupancy import day_mask, mask_of
+from .payloads import invalidate, semester_etag, semester_payload
+from .search import DEFAULT_LIMIT, MAX_LIMIT, decode_cursor, search_courses
 
 import json
 
@@ -20,10 +38,31 @@ def get_login_user(request):
     return None
 
 
+def parse_replace(body, default):
+    """ body["replace"] → bool, JSON true/false 가 아니면 ("false" 같은 문자열 포함) ValueError """
+    replace = body.get("replace", default)
+    if not isinstance(replace, bool):
+        raise ValueError(replace)
+    return replace
+
+
+def cell_conflict_response(conflict):
+    """ CellConflict → 409 (겹친 칸 목록 + 현재 version) """
+    return JsonResponse(
+        {
+            "detail": "이미 수업이 있는 칸입니다.",
+            "conflicts": conflict.conflicts,
+            "version": conflict.version,
+        },
+        status=409,
+    )
+
+
 # =========================================
-#  학기별 시간표 조회 / 생성
-#   GET  /api/timetable/?year=YYYY&semester=S
-#   POST /api/timetable/
+#  학기별 시간표 조회 / 생성 / 칸 단위 수정
+#   GET   /api/timetable/?year=YYYY&semester=S
+#   POST  /api/timetable/
+#   PATCH /api/timetable/
 # =========================================
 @method_decorator(csrf_exempt, name="dispatch")
 class TimetableListCreateAPI(View):
@@ -31,6 +70,7 @@ class TimetableListCreateAPI(View):
     GET:
       /api/timetable/?year=2025&semester=2
       → 해당 유저의 해당 학기 시간표를 내려줌
+        (ETag + 응답 캐시: If-None-Match 가 같으면 304, payloads.py 참고)
 
     POST:
       /api/timetable/
@@ -39,8 +79,19 @@ class TimetableListCreateAPI(View):
       지금 프론트에서는 "새 시간표 만들기" 시
       {year, semester, timetable: []} 만 보내므로,
       여기서는 해당 학기의 기존 row를 지우고
-      "학기 존재 표시용 더미 row" 하나를 만들어 둔다.
-      (day="MON", period=0 → 화면에는 안 보임)
+      학기 헤더(TimetableSemester)만 만들어 둔다. (공유 여부는 그대로 유지)
+
+    PATCH:
+      /api/timetable/
+      body: {
+        "year": 2025, "semester": 2, "version": 3,
+        "upsert": [{"day": "MON", "period": 2, "subject": "...", "classroom": "...", "memo": "..."}],
+        "delete": [{"day": "TUE", "period": 1}],
+        "replace": true
+      }
+      → version 이 현재 버전과 같을 때만 반영하고 새 version 을 돌려줌
+        (다른 탭에서 먼저 고쳤으면 409 + 현재 version)
+      → "replace": false 면 이미 찬 칸에 upsert 할 때 409 + conflicts
     """
 
     def get(self, request):
@@ -59,34 +110,21 @@ class TimetableListCreateAPI(View):
                 {"detail": "year, semester 쿼리 파라미터가 필요합니다."}, status=400
             )
 
-        qs = Timetable.objects.filter(
-            user=user,
-            year=year,
-            semester=semester,
-        ).order_by("day", "period", "id")
-
-        if not qs.exists():
+        header = TimetableSemester.objects.filter(user=user, year=year, semester=semester).first()
+        if header is None:
             return JsonResponse(
                 {"detail": "해당 학기 시간표가 없습니다."},
                 status=404,
             )
 
-        data = []
-        for t in qs:
-            # period=0 은 "더미"라서 화면에 안 쓰이게 건너뜀
-            if t.period == 0:
-                continue
-            data.append(
-                {
-                    "day": t.day,
-                    "period": t.period,
-                    "subject": t.subject,
-                    "classroom": t.classroom,
-                    "memo": t.memo,
-                }
-            )
-
-        return JsonResponse({"timetable": data})
+        etag = semester_etag(header)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(semester_payload(header, etag), content_type="application/json")
+        response["ETag"] = etag
+        # 브라우저가 매번 If-None-Match 로 다시 확인하도록
+        response["Cache-Control"] = "private, no-cache"
+        return response
 
     def post(self, request):
         if request.content_type != "application/json":
@@ -111,43 +149,12 @@ class TimetableListCreateAPI(View):
         except (TypeError, ValueError):
             return JsonResponse({"detail": "year/semester 형식 오류"}, status=400)
 
-        # 해당 학기 기존 row 전부 삭제
-        Timetable.objects.filter(user=user, year=year, semester=semester).delete()
-
-        created = []
-
-        if timetable_entries:
-            # 나중에 직접 모든 칸을 저장하는 방식으로 확장 가능
-            for item in timetable_entries:
-                day = item.get("day")
-                period = item.get("period")
-                if not day or period is None:
-                    continue
-
-                tt = Timetable.objects.create(
-                    user=user,
-                    year=year,
-                    semester=semester,
-                    day=day,
-                    period=int(period),
-                    subject=item.get("subject", ""),
-                    classroom=item.get("classroom", ""),
-                    memo=item.get("memo", ""),
-                )
-                created.append(tt.id)
-        else:
-            # 프론트에서 새 시간표 생성 시 timetable: [] 로 보내므로
-            # "해당 학기가 존재한다"는 표시만 해 주기 위해 더미 row 하나 생성
-            Timetable.objects.create(
-                user=user,
-                year=year,
-                semester=semester,
-                day="MON",
-                period=0,  # 화면엔 없는 교시
-                subject="",
-                classroom="",
-                memo="",
-            )
+        # 해당 학기 기존 row 를 지우고 새로 채움 (한 트랜잭션)
+        # 프론트에서 새 시간표 생성 시 timetable: [] 로 보내도 학기 헤더가 "해당 학기가 존재한다"는 표시
+        try:
+            created, version = replace_semester(user, year, semester, timetable_entries)
+        except ValueError:
+            return JsonResponse({"detail": "day/period 형식 오류"}, status=400)
 
         return JsonResponse(
             {
@@ -155,6 +162,70 @@ class TimetableListCreateAPI(View):
                 "year": year,
                 "semester": semester,
                 "created_ids": created,
+                "version": version,
+            }
+        )
+
+    def patch(self, request):
+        if request.content_type != "application/json":
+            return JsonResponse({"detail": "JSON body 필요"}, status=400)
+
+        user = get_login_user(request)
+        if user is None:
+            return JsonResponse({"detail": "로그인이 필요합니다."}, status=401)
+
+        try:
+            body = json.loads(request.body.decode("utf-8"))
+        except json.JSONDecodeError:
+            return JsonResponse({"detail": "JSON 파싱 오류"}, status=400)
+
+        try:
+            year = int(body.get("year"))
+            semester = int(body.get("semester"))
+        except (TypeError, ValueError):
+            return JsonResponse({"detail": "year/semester 형식 오류"}, status=400)
+
+        try:
+            version = int(body.get("version"))
+            if version < 0:
+                raise ValueError(version)
+        except (TypeError, ValueError):
+            return JsonResponse({"detail": "version 필드가 필요합니다."}, status=400)
+
+        # 같은 칸이 여러 번 오면 뒤의 것이 이김
+        try:
+            upserts = {
+                parse_cell_key(item): {f: item.get(f) or "" for f in CELL_FIELDS}
+                for item in body.get("upsert") or []
+            }
+            deletes = {parse_cell_key(item) for item in body.get("delete") or []}
+        except (TypeError, ValueError):
+            return JsonResponse({"detail": "day/period 형식 오류"}, status=400)
+
+        try:
+            replace = parse_replace(body, True)
+        except ValueError:
+            return JsonResponse({"detail": "replace 는 true/false 여야 합니다."}, status=400)
+
+        try:
+            new_version = apply_cell_patch(user, year, semester, version, upserts, deletes, replace)
+        except VersionConflict as conflict:
+            return JsonResponse(
+                {
+                    "detail": "다른 곳에서 시간표가 먼저 수정되었습니다. 새로 불러온 뒤 다시 시도해 주세요.",
+                    "version": conflict.version,
+                },
+                status=409,
+            )
+        except CellConflict as conflict:
+            return cell_conflict_response(conflict)
+
+        return JsonResponse(
+            {
+                "success": True,
+                "year": year,
+                "semester": semester,
+                "version": new_version,
             }
         )
 
@@ -165,12 +236,12 @@ class TimetableListCreateAPI(View):
 # =========================================
 class SemesterListAPI(View):
     """
-    로그인한 사용자가 가지고 있는 시간표의 학기 목록을 내려줌.
+    로그인한 사용자가 가지고 있는 시간표의 학기 목록을 내려줌. (학기 헤더만 읽음)
 
     응답 예:
       {
         "semesters": [
-          { "year": 2025, "semester": 2, "label": "2025년 2학기" },
+          { "year": 2025, "semester": 2, "label": "2025년 2학기", "cell_count": 12, "is_shared": false },
           ...
         ]
       }
@@ -182,9 +253,8 @@ class SemesterListAPI(View):
             return JsonResponse({"detail": "로그인이 필요합니다."}, status=401)
 
         qs = (
-            Timetable.objects.filter(user=user)
-            .values("year", "semester")
-            .annotate(cnt=Count("id"))
+            TimetableSemester.objects.filter(user=user)
+            .values("year", "semester", "cell_count", "is_shared")
             .order_by("-year", "-semester")
         )
 
@@ -193,6 +263,8 @@ class SemesterListAPI(View):
                 "year": row["year"],
                 "semester": row["semester"],
                 "label": f"{row['year']}년 {row['semester']}학기",
+                "cell_count": row["cell_count"],
+                "is_shared": row["is_shared"],
             }
             for row in qs
         ]
@@ -202,7 +274,9 @@ class SemesterListAPI(View):
 
 # =========================================
 #  수업 검색 API
-#   GET /api/timetable/courses/?year=2025&semester=2&q=데이터
+#   GET /api/timetable/courses/?year=2025&semester=2&q=데이터&limit=50&cursor=...
+#   → 수업 리스트 (관련도순), 다음 페이지가 있으면 X-Next-Cursor 헤더
+#   → limit / cursor 를 둘 다 안 보내면 페이지 없이 전부
 # =========================================
 class CourseSearchAPI(View):
     def get(self, request):
@@ -220,35 +294,28 @@ class CourseSearchAPI(View):
         except (TypeError, ValueError):
             return JsonResponse({"detail": "year/semester 형식 오류"}, status=400)
 
-        qs = Course.objects.filter(year=year, semester=semester)
-
-        if q:
-            qs = qs.filter(subject__icontains=q) | qs.filter(professor__icontains=q)
-
-        qs = qs.order_by("day", "period", "subject")
+        # 검색 모달(timetable.html)은 cursor 를 따라가지 않으므로 limit / cursor 가 없으면 전부
+        paged = "limit" in request.GET or "cursor" in request.GET
+        try:
+            limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+            offset = decode_cursor(request.GET.get("cursor"))
+        except ValueError:
+            return JsonResponse({"detail": "limit/cursor 형식 오류"}, status=400)
+        limit = max(1, min(limit, MAX_LIMIT)) if paged else None
 
-        data = []
-        for c in qs:
-            data.append(
-                {
-                    "id": c.id,
-                    "year": c.year,
-                    "semester": c.semester,
-                    "subject": c.subject,
-                    "professor": c.professor,
-                    "day": c.day,
-                    "period": c.period,
-                    "classroom": c.classroom,
-                }
-            )
+        data, next_cursor = search_courses(year, semester, q, offset, limit)
 
-        return JsonResponse(data, safe=False)
+        response = JsonResponse(data, safe=False)
+        if next_cursor is not None:
+            response["X-Next-Cursor"] = next_cursor
+        return response
 
 
 # =========================================
 #  수업 추가 API
 #   POST /api/timetable/add-course/
-#   body: { "course_id": 1, "year": 2025, "semester": 2 }
+#   body: { "course_id": 1, "year": 2025, "semester": 2, "replace": false }
+#   → 이미 찬 칸이면 409 + conflicts ("replace": true 면 덮어씀)
 # =========================================
 @method_decorator(csrf_exempt, name="dispatch")
 class AddCourseAPI(View):
@@ -276,29 +343,257 @@ class AddCourseAPI(View):
         except (TypeError, ValueError, Course.DoesNotExist):
             return JsonResponse({"detail": "유효하지 않은 course_id/year/semester"}, status=400)
 
-        # 해당 학기의 "더미 row(period=0)" 는 있더라도 상관 없음
-        tt, created = Timetable.objects.update_or_create(
-            user=user,
-            year=year,
-            semester=semester,
-            day=course.day,
-            period=course.period,
-            defaults={
-                "subject": course.subject,
-                "classroom": course.classroom,
-                "memo": course.memo,
-            },
-        )
+        try:
+            replace = parse_replace(body, False)
+        except ValueError:
+            return JsonResponse({"detail": "replace 는 true/false 여야 합니다."}, status=400)
+
+        try:
+            tt, created, version = add_course_cell(user, year, semester, course, replace=replace)
+        except CellConflict as conflict:
+            return cell_conflict_response(conflict)
 
         return JsonResponse(
             {
                 "success": True,
                 "created": created,
                 "id": tt.id,
+                "version": version,
             }
         )
 
 
+# =========================================
+#  수업 여러 개 한 번에 추가
+#   POST /api/timetable/add-courses/
+#   body: { "course_ids": [1, 2, 3], "year": 2025, "semester": 2, "replace": false }
+#   → { "success": true, "version": 4, "results": [
+#         {"course_id": 1, "day": "MON", "period": 2, "status": "created"},
+#         {"course_id": 2, "day": "MON", "period": 2, "status": "conflict", "subject": "...", "with_course_id": 1},
+#         {"course_id": 5, "day": "TUE", "period": 3, "status": "already_added"},
+#         {"course_id": 9, "status": "not_found"}, ...
+#       ] }
+# =========================================
+@method_decorator(csrf_exempt, name="dispatch")
+class AddCoursesAPI(View):
+    MAX_COURSES = 50
+
+    def post(self, request):
+        if request.content_type != "application/json":
+            return JsonResponse({"detail": "JSON body 필요"}, status=400)
+
+        user = get_login_user(request)
+        if user is None:
+            return JsonResponse({"detail": "로그인이 필요합니다."}, status=401)
+
+        try:
+            body = json.loads(request.body.decode("utf-8"))
+        except json.JSONDecodeError:
+            return JsonResponse({"detail": "JSON 파싱 오류"}, status=400)
+
+        try:
+            year = int(body.get("year"))
+            semester = int(body.get("semester"))
+            course_ids = list(dict.fromkeys(int(i) for i in body.get("course_ids") or []))
+        except (TypeError, ValueError):
+            return JsonResponse({"detail": "유효하지 않은 course_ids/year/semester"}, status=400)
+
+        if not course_ids:
+            return JsonResponse({"detail": "course_ids 가 필요합니다."}, status=400)
+        if len(course_ids) > self.MAX_COURSES:
+            return JsonResponse({"detail": f"한 번에 최대 {self.MAX_COURSES}개까지 추가할 수 있습니다."}, status=400)
+
+        try:
+            replace = parse_replace(body, False)
+        except ValueError:
+            return JsonResponse({"detail": "replace 는 true/false 여야 합니다."}, status=400)
+
+        found = Course.objects.in_bulk(course_ids)
+        results, version = add_course_cells(
+            user,
+            year,
+            semester,
+            [found[i] for i in course_ids if i in found],
+            replace=replace,
+        )
+
+        # 요청 순서대로 (없는 수업은 not_found)
+        by_id = {result["course_id"]: result for result in results}
+        return JsonResponse(
+            {
+                "success": True,
+                "version": version,
+                "results": [
+                    by_id.get(i, {"course_id": i, "status": "not_found"}) for i in course_ids
+                ],
+            }
+        )
+
+
+# =========================================
+#  공유된 (선배) 시간표를 내 학기로 복제
+#   POST /api/timetable/clone/
+#   body: {
+#     "source": {"user_id": 3, "year": 2024, "semester": 1},
+#     "year": 2025, "semester": 1,
+#     "on_conflict": "skip" | "overwrite" | "fail"
+#   }
+#   → { "success": true, "copied": 6, "skipped": 1, "overwritten": 0, "version": 5 }
+#     (fail 인데 겹치면 409 + conflicts)
+# =========================================
+@method_decorator(csrf_exempt, name="dispatch")
+class CloneTimetableAPI(View):
+    def post(self, request):
+        if request.content_type != "application/json":
+            return JsonResponse({"detail": "JSON body 필요"}, status=400)
+
+        user = get_login_user(request)
+        if user is None:
+            return JsonResponse({"detail": "로그인이 필요합니다."}, status=401)
+
+        try:
+            body = json.loads(request.body.decode("utf-8"))
+        except json.JSONDecodeError:
+            return JsonResponse({"detail": "JSON 파싱 오류"}, status=400)
+
+        source = body.get("source") or {}
+        try:
+            year = int(body.get("year"))
+            semester = int(body.get("semester"))
+            source_key = (int(source.get("user_id")), int(source.get("year")), int(source.get("semester")))
+        except (AttributeError, TypeError, ValueError):
+            return JsonResponse({"detail": "source/year/semester 형식 오류"}, status=400)
+
+        policy = body.get("on_conflict", "skip")
+        if policy not in CLONE_POLICIES:
+            return JsonResponse({"detail": "on_conflict 는 skip / overwrite / fail 중 하나입니다."}, status=400)
+
+        if source_key == (user.id, year, semester):
+            return JsonResponse({"detail": "같은 학기로는 복제할 수 없습니다."}, status=400)
+
+        # 공유된 시간표 (또는 내 다른 학기) 만 복제 가능
+        source_header = TimetableSemester.objects.filter(
+            user_id=source_key[0], year=source_key[1], semester=source_key[2]
+        ).first()
+        if source_header is None or not (source_header.is_shared or source_header.user_id == user.id):
+            return JsonResponse({"detail": "공유된 시간표가 없습니다."}, status=404)
+
+        try:
+            result = clone_semester(user, year, semester, source_header, policy)
+        except CellConflict as conflict:
+            return cell_conflict_response(conflict)
+
+        return JsonResponse({"success": True, "year": year, "semester": semester, **result})
+
+
+# =========================================
+#  수업 일괄 충돌 검사
+#   GET /api/timetable/conflicts/?year=2025&semester=2&course_ids=1,2,3
+#   → { "version": 3, "conflicts": [...], "free": [1, 3], "unknown": [] }
+# =========================================
+class ConflictCheckAPI(View):
+    def get(self, request):
+        user = get_login_user(request)
+        if user is None:
+            return JsonResponse({"detail": "로그인이 필요합니다."}, status=401)
+
+        try:
+            year = int(request.GET.get("year"))
+            semester = int(request.GET.get("semester"))
+        except (TypeError, ValueError):
+            return JsonResponse({"detail": "year/semester 형식 오류"}, status=400)
+
+        try:
+            course_ids = [int(x) for x in request.GET.get("course_ids", "").split(",") if x.strip()]
+        except ValueError:
+            return JsonResponse({"detail": "course_ids 형식 오류"}, status=400)
+
+        found = Course.objects.in_bulk(course_ids)
+        courses = [found[i] for i in dict.fromkeys(course_ids) if i in found]
+
+        result = check_courses(user, year, semester, courses)
+        result["unknown"] = [i for i in dict.fromkeys(course_ids) if i not in found]
+        return JsonResponse(result)
+
+
+# =========================================
+#  충돌 없는 시간표 자동 생성
+#   POST /api/timetable/generate/
+#   body: {
+#     "year": 2025, "semester": 2,
+#     "required": ["데이터구조론", "운영체제"],   꼭 들을 과목
+#     "optional": ["암호학"],                    들으면 좋은 과목
+#     "blocked": [{"day": "FRI"}, {"day": "MON", "period": 1}],
+#     "sort": "days" | "gaps", "limit": 20, "budget_ms": 300
+#   }
+#   → NDJSON: 순위순 후보 한 줄씩, 마지막 줄 {"summary": {...}}
+# =========================================
+@method_decorator(csrf_exempt, name="dispatch")
+class GenerateTimetableAPI(View):
+    def post(self, request):
+        if request.content_type != "application/json":
+            return JsonResponse({"detail": "JSON body 필요"}, status=400)
+
+        user = get_login_user(request)
+        if user is None:
+            return JsonResponse({"detail": "로그인이 필요합니다."}, status=401)
+
+        try:
+            body = json.loads(request.body.decode("utf-8"))
+        except json.JSONDecodeError:
+            return JsonResponse({"detail": "JSON 파싱 오류"}, status=400)
+
+        try:
+            year = int(body.get("year"))
+            semester = int(body.get("semester"))
+        except (TypeError, ValueError):
+            return JsonResponse({"detail": "year/semester 형식 오류"}, status=400)
+
+        required = [str(s).strip() for s in body.get("required") or [] if str(s).strip()]
+        optional = [str(s).strip() for s in body.get("optional") or [] if str(s).strip()]
+        if not required and not optional:
+            return JsonResponse({"detail": "required 또는 optional 과목이 필요합니다."}, status=400)
+        if len(set(required) | set(optional)) > generator.MAX_SUBJECTS:
+            return JsonResponse({"detail": f"과목은 최대 {generator.MAX_SUBJECTS}개까지입니다."}, status=400)
+
+        # 요일만 적으면 그날 전체, 교시까지 적으면 그 칸만
+        blocked_mask = 0
+        try:
+            for item in body.get("blocked") or []:
+                if item.get("period") is None:
+                    cell = day_mask(item.get("day"))
+                else:
+                    cell = mask_of([parse_cell_key(item)])
+                if not cell:
+                    raise ValueError(item)
+                blocked_mask |= cell
+        except (AttributeError, TypeError, ValueError):
+            return JsonResponse({"detail": "blocked 형식 오류"}, status=400)
+
+        sort = body.get("sort", "days")
+        if sort not in generator.SORTS:
+            return JsonResponse({"detail": "sort 는 days 또는 gaps 입니다."}, status=400)
+
+        try:
+            limit = int(body.get("limit", generator.DEFAULT_LIMIT))
+            budget_ms = int(body.get("budget_ms", generator.DEFAULT_BUDGET_MS))
+        except (TypeError, ValueError):
+            return JsonResponse({"detail": "limit/budget_ms 형식 오류"}, status=400)
+        limit = max(1, min(limit, generator.MAX_LIMIT))
+        budget_ms = max(1, min(budget_ms, generator.MAX_BUDGET_MS))
+
+        candidates, summary = generator.generate(
+            year, semester, required, optional, blocked_mask, limit, sort, budget_ms
+        )
+
+        def lines():
+            for candidate in candidates:
+                yield json.dumps(candidate, ensure_ascii=False) + "\n"
+            yield json.dumps({"summary": summary}, ensure_ascii=False) + "\n"
+
+        return StreamingHttpResponse(lines(), content_type="application/x-ndjson")
+
+
 # =========================================
 #  공유 여부 토글 + 조회
 #   POST /api/timetable/share/
@@ -310,7 +605,7 @@ class TimetableShareToggleAPI(View):
     POST /api/timetable/share/
     body: { "year": 2025, "semester": 1, "is_shared": true }
 
-    → 해당 학기의 시간표 전체에 대해 공유 여부 토글
+    → 해당 학기 헤더(TimetableSemester)의 공유 여부 토글 (row 하나 UPDATE)
     """
 
     def _parse_bool(self, value):
@@ -348,21 +643,18 @@ class TimetableShareToggleAPI(View):
 
         is_shared = self._parse_bool(data.get("is_shared"))
 
-        # 해당 학기의 Timetable row들 전부 가져오기
-        qs = Timetable.objects.filter(
+        updated = TimetableSemester.objects.filter(
             user=user,
             year=year,
             semester=semester,
-        )
+        ).update(is_shared=is_shared, updated_at=timezone.now())
 
-        if not qs.exists():
+        if not updated:
             return JsonResponse(
                 {"detail": "해당 학기 시간표가 존재하지 않습니다."},
                 status=404,
             )
-
-        # is_shared 일괄 업데이트
-        qs.update(is_shared=is_shared)
+        invalidate(user.id, year, semester)
 
         return JsonResponse(
             {
@@ -397,7 +689,7 @@ def timetable_share_status(request):
     except (TypeError, ValueError):
         return JsonResponse({"detail": "year/semester 형식 오류"}, status=400)
 
-    exists = Timetable.objects.filter(
+    exists = TimetableSemester.objects.filter(
         user=user,
         year=year,
         semester=semester,